@@ -0,0 +1,76 @@
+"""Rounds/sec of bots that play every decision over the websocket against bots on a server-side autopilot.
+
+The in-process part plays basic strategy on a HeadlessRunner, once through the runner's policy loop and once
+through GameManager.set_autopilot(). With --live, websocket bots play against a server on this machine,
+deciding themselves, uploading basic strategy with their first bet, or uploading a standing bet with it
+too, so that once seated they only receive the results of the rounds the server plays for them.
+
+Run with: python -m benchmarks.bench_autopilot [--live]
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+
+from benchmarks.ws_bots import run_tables, wait_for_server
+from game.betting import BetRule
+from game.headless import HeadlessRunner
+from game.strategy import StrategyTable
+from network.sharding import run_worker
+
+
+def headless_rounds_per_second(seats, rounds, autopilot):
+    strategy = StrategyTable.basic_strategy()
+    runner = HeadlessRunner(policy=strategy.action, num_seats=seats, seed=1, balance=10 ** 9)
+    if autopilot:
+        for player in runner.players:
+            runner.game_manager.set_autopilot(player.id, strategy)
+    result = runner.play(rounds)
+    runner.close()
+    return result['rounds_per_second']
+
+
+def live_rounds_per_second(autopilot, standing_bet, tables, seconds, port):
+    process = multiprocessing.get_context('spawn').Process(target=run_worker, args=('127.0.0.1', port, 'warning'))
+    process.start()
+    try:
+        wait_for_server(f"http://127.0.0.1:{port}/tables")
+        strategy = StrategyTable.basic_strategy().to_dict() if autopilot else None
+        rule = BetRule(10).to_dict() if standing_bet else None
+        return asyncio.run(run_tables(f"ws://127.0.0.1:{port}", tables, seats=1, seconds=seconds, autopilot=strategy,
+                                      standing_bet=rule))
+    finally:
+        # Handlers of players still seated keep uvicorn from shutting down gracefully.
+        process.terminate()
+        process.join(5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=20000)
+    parser.add_argument('--live', action='store_true')
+    parser.add_argument('--tables', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--port', type=int, default=57000)
+    args = parser.parse_args()
+
+    for seats in (1, 7):
+        policy = headless_rounds_per_second(seats, args.rounds, autopilot=False)
+        autopilot = headless_rounds_per_second(seats, args.rounds, autopilot=True)
+        print(f"in-process {seats} seats: policy loop {policy:8.0f} rounds/s   autopilot {autopilot:8.0f} rounds/s")
+
+    if args.live:
+        for run, (autopilot, standing_bet) in enumerate(((False, False), (True, False), (True, True))):
+            # A fresh server each time, tables keep waiting for the bots of the previous run.
+            rounds_per_second = live_rounds_per_second(autopilot, standing_bet, args.tables, args.seconds,
+                                                       args.port + run)
+            print(f"websocket autopilot={autopilot!s:<5} standing bet={standing_bet!s:<5} {args.tables} tables "
+                  f"{rounds_per_second:8.0f} rounds/s")
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,32 @@
+"""Rounds/sec and EV of basic strategy in the batch simulator, next to the headless scalar engine.
+
+Run with: python -m benchmarks.bench_batch
+"""
+import logging
+import time
+
+from game.batch import cross_check, simulate
+from game.headless import HeadlessRunner
+from game.strategy import StrategyTable
+
+
+def main(rounds=2000000, scalar_rounds=20000, check_rounds=2000):
+    strategy = StrategyTable.basic_strategy()
+
+    start = time.perf_counter()
+    result = simulate(strategy, rounds, seed=1)
+    batch_rate = rounds / (time.perf_counter() - start)
+    low, high = result['ci']
+    print(f"batch    {batch_rate:10.0f} rounds/s   EV {result['ev']:+.4f} (95% CI {low:+.4f} .. {high:+.4f}), "
+          f"variance {result['variance']:.3f}, {result['overflow']} overflowed rounds")
+
+    scalar = HeadlessRunner(policy=strategy.action, seed=1).play(scalar_rounds)
+    print(f"headless {scalar['rounds_per_second']:10.0f} rounds/s")
+
+    mismatches = cross_check(strategy, rounds=check_rounds, seed=2)
+    print(f"cross-check against the scalar engine: {len(mismatches)} of {check_rounds} rounds differ")
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,89 @@
+"""Messages/sec of the JSON and binary encodings of the player websocket.
+
+The codec part times one request and its action through both ends in this process: the server encodes the
+request, the client decodes it and encodes its action, the server parses the action. With --live the same
+bots play against a server on this machine in each encoding.
+
+Run with: python -m benchmarks.bench_codec [--live]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import time
+
+from benchmarks.ws_bots import run_tables, wait_for_server
+from network.codec import BinaryWire, JsonWire, decode_request, dump_request, encode_action, encode_request
+from network.models import RequestPlayerAction, ShoeComposition
+from network.sharding import run_worker
+
+TABLE = [900, 110, 888, 901, 108, 209, 902, 301, 412, 903, 113, 213, 207]
+
+
+def sample_request(composition):
+    shoe = ShoeComposition(remaining=[32] * 13, running_count=-3, cards_left=409) if composition else None
+    return RequestPlayerAction(player_name='bot0', seat=0, state='player_turn', table=TABLE, balance=990.0,
+                               score=19, available_actions=['h', 's', 'd'], need_shuffle=False, shoe=shoe)
+
+
+def json_round_trip(wire, request, table_json):
+    message = json.loads(dump_request(request, table_json))
+    data = json.dumps({'player_name': message['player_name'], 'action': message['available_actions'][0]})
+    return wire.parse_action(data)
+
+
+def binary_round_trip(wire, request, table_json):
+    message = decode_request(encode_request(request))
+    return wire.parse_action(encode_action(message['player_name'], message['available_actions'][0]))
+
+
+def codec_messages_per_second(round_trip, wire, request, count):
+    table_json = json.dumps(request.table)
+    start = time.perf_counter()
+    for _ in range(count):
+        round_trip(wire, request, table_json)
+    return count / (time.perf_counter() - start)
+
+
+def live_rounds_per_second(encoding, tables, seconds, port):
+    process = multiprocessing.get_context('spawn').Process(target=run_worker, args=('127.0.0.1', port, 'warning'))
+    process.start()
+    try:
+        wait_for_server(f"http://127.0.0.1:{port}/tables")
+        return asyncio.run(run_tables(f"ws://127.0.0.1:{port}", tables, seats=1, seconds=seconds, encoding=encoding))
+    finally:
+        # Handlers of players still seated keep uvicorn from shutting down gracefully.
+        process.terminate()
+        process.join(5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=50000)
+    parser.add_argument('--live', action='store_true')
+    parser.add_argument('--tables', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--port', type=int, default=56900)
+    args = parser.parse_args()
+
+    for composition in (False, True):
+        request = sample_request(composition)
+        for name, round_trip, wire in (('json', json_round_trip, JsonWire(None)),
+                                       ('binary', binary_round_trip, BinaryWire(None))):
+            rate = codec_messages_per_second(round_trip, wire, request, args.messages)
+            size = len(encode_request(request)) if name == 'binary' else len(request.model_dump_json(exclude_none=True))
+            print(f"{name:<7} composition={composition!s:<5} {rate:9.0f} messages/s  {size:4d} bytes/request")
+
+    if args.live:
+        for encoding in ('json', 'binary'):
+            rounds_per_second = live_rounds_per_second(encoding, args.tables, args.seconds, args.port)
+            print(f"{encoding:<7} {args.tables} tables {rounds_per_second:8.0f} rounds/s over websockets")
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,76 @@
+# Micro-benchmark for game.deck.Deck.
+#
+# Run from the repository root:
+#     python -m benchmarks.bench_deck
+import logging
+import random
+import timeit
+
+from game.deck import Deck, ContinuousShuffleDeck
+
+
+class ListDeck:
+    """The previous list based shoe, kept here as the baseline to compare against."""
+
+    def __init__(self, num_decks=8):
+        self.num_decks = num_decks
+        self.cards = self._create_deck()
+
+    def _create_deck(self):
+        return [suit * 100 + value for suit in range(1, 5) for value in range(1, 14)] * self.num_decks
+
+    def shuffle(self):
+        self.cards = self._create_deck()
+        random.shuffle(self.cards)
+
+    def deal_card(self):
+        return self.cards.pop()
+
+
+def deal_shoe(deck, cards):
+    deck.shuffle()
+    for _ in range(cards):
+        deck.deal_card()
+
+
+def report(name, baseline, candidate):
+    print(f"{name:<24} list: {baseline * 1e6:8.2f} us   array: {candidate * 1e6:8.2f} us   "
+          f"speedup: {baseline / candidate:5.2f}x")
+
+
+def play_rounds(deck, rounds, cards_per_round=10):
+    # Deal a fixed number of cards per round and let the deck reshuffle or refill at round end.
+    for _ in range(rounds):
+        for _ in range(cards_per_round):
+            deck.deal_card()
+        deck.shuffle_if_needed()
+
+
+def shoe_modes(rounds=20000, num_decks=8):
+    cut_card_deck = Deck(num_decks)
+    csm_deck = ContinuousShuffleDeck(num_decks)
+    for deck in (cut_card_deck, csm_deck):
+        deck.shuffle()
+    cards = rounds * 10
+    cut_card = min(timeit.repeat(lambda: play_rounds(cut_card_deck, rounds), number=1, repeat=5))
+    csm = min(timeit.repeat(lambda: play_rounds(csm_deck, rounds), number=1, repeat=5))
+    print(f"{'cut card vs csm':<24} cut card: {cards / cut_card:10.0f} cards/s   csm: {cards / csm:10.0f} cards/s")
+
+
+def main(number=2000, num_decks=8):
+    list_deck = ListDeck(num_decks)
+    array_deck = Deck(num_decks)
+    cards = num_decks * 52 // 2
+
+    report("shuffle",
+           min(timeit.repeat(list_deck.shuffle, number=number, repeat=5)) / number,
+           min(timeit.repeat(array_deck.shuffle, number=number, repeat=5)) / number)
+    report(f"shuffle + deal {cards}",
+           min(timeit.repeat(lambda: deal_shoe(list_deck, cards), number=number // 10, repeat=5)) / (number // 10),
+           min(timeit.repeat(lambda: deal_shoe(array_deck, cards), number=number // 10, repeat=5)) / (number // 10))
+    shoe_modes(num_decks=num_decks)
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,80 @@
+"""Bytes and encoding time of the table messages of a round, full tables against delta mode.
+
+Plays rounds on an in-process table and encodes, for every seat, the player-turn and result messages the
+server would send it, with the client acknowledging every table it gets.
+
+Run with: python -m benchmarks.bench_delta
+"""
+import logging
+import time
+
+from game.player import Player
+from game.table import Table
+from network.codec import dump_request
+from network.delta import DeltaTracker, apply_delta
+from network.models import RequestPlayerAction
+from network.routes import get_table_fields
+
+
+def encode(player, state, game_manager, hidden_card, tracker):
+    table_fields, table_json = get_table_fields(game_manager, tracker, hidden_card=hidden_card)
+    request = RequestPlayerAction(player_name=player.name, state=state, **table_fields,
+                                  available_actions=player.available_actions, balance=player.balance,
+                                  score=player.score, need_shuffle=False,
+                                  seat=game_manager.player_manager.get_seat_number(player.id))
+    if table_json is None:
+        return request.model_dump_json(exclude_none=True), table_fields
+    return dump_request(request, table_json), table_fields
+
+
+def run(seats, rounds, delta):
+    table = Table('bench', logger=logging.getLogger(__name__), num_seats=seats, seed=7, bus_mode='sync')
+    game_manager = table.game_manager
+    players = [Player(name=f'bot{seat}', id=f'bot{seat}', balance=10 ** 6) for seat in range(seats)]
+    for player in players:
+        game_manager.add_player(player)
+    trackers = {player.id: DeltaTracker() if delta else None for player in players}
+    client_tables = {player.id: {} for player in players}
+
+    size = 0
+    seconds = 0.0
+    for _ in range(rounds):
+        for player in players:
+            game_manager.place_bet(player.id, 10)
+        while (hand := table.event_handler.current_player) is not None:
+            tracker = trackers[hand.id]
+            start = time.perf_counter()
+            message, table_fields = encode(hand, 'player_turn', game_manager, True, tracker)
+            seconds += time.perf_counter() - start
+            size += len(message)
+            if tracker is not None:
+                # The client rebuilds the table and acknowledges it with its action.
+                tables = client_tables[hand.id]
+                if 'base' in table_fields:
+                    tables[table_fields['seq']] = apply_delta(tables[table_fields['base']], table_fields['delta'])
+                else:
+                    tables[table_fields['seq']] = table_fields['table']
+                tracker.acknowledge(table_fields['seq'])
+            game_manager.handle_action('h' if hand.score < 17 and 'h' in hand.available_actions else 's', hand)
+        for player in players:
+            start = time.perf_counter()
+            message, _ = encode(player, 'publish_result', game_manager, False, trackers[player.id])
+            seconds += time.perf_counter() - start
+            size += len(message)
+        for player in players:
+            table.player_manager.publish_result(player)
+    table.close()
+    return size / rounds, seconds / rounds
+
+
+def main(rounds=3000):
+    for seats in (1, 4, 7):
+        full_bytes, full_seconds = run(seats, rounds, delta=False)
+        delta_bytes, delta_seconds = run(seats, rounds, delta=True)
+        print(f"{seats} seats: full {full_bytes:6.0f} bytes {full_seconds * 1e6:6.1f} us/round   "
+              f"delta {delta_bytes:6.0f} bytes {delta_seconds * 1e6:6.1f} us/round")
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,42 @@
+"""Steps/sec of the in-process environments with a random agent that only picks allowed actions.
+
+Run with: python -m benchmarks.bench_env
+"""
+import logging
+import time
+
+import numpy as np
+
+from game.env import BlackjackEnv, BlackjackVectorEnv
+
+
+def single(steps, rng):
+    env = BlackjackEnv(seed=1)
+    _, info = env.reset()
+    start = time.perf_counter()
+    for _ in range(steps):
+        _, _, terminated, _, info = env.step(rng.choice(np.flatnonzero(info['action_mask'])))
+        if terminated:
+            _, info = env.reset()
+    return steps / (time.perf_counter() - start)
+
+
+def vector(num_envs, calls, rng):
+    envs = BlackjackVectorEnv(num_envs, seed=1)
+    _, info = envs.reset()
+    start = time.perf_counter()
+    for _ in range(calls):
+        actions = [rng.choice(np.flatnonzero(mask)) for mask in info['action_mask']]
+        _, _, _, _, info = envs.step(actions)
+    return num_envs * calls / (time.perf_counter() - start)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"BlackjackEnv          {single(50000, rng):8.0f} steps/s")
+    print(f"BlackjackVectorEnv(64) {vector(64, 800, rng):7.0f} steps/s")
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,36 @@
+"""Cost of EventBus instrumentation, and the round stages it reports as slowest.
+
+Run with: python -m benchmarks.bench_event_metrics
+"""
+import logging
+import time
+
+from benchmarks.bench_scoring import play_rounds
+from game.player import Player
+from utils.event_bus import EventBus
+
+
+def rounds_per_second(event_bus, rounds):
+    start = time.perf_counter()
+    play_rounds(Player, rounds, event_bus=event_bus)
+    return rounds / (time.perf_counter() - start)
+
+
+def main(rounds=3000):
+    for mode in ('sync', 'queued'):
+        disabled = rounds_per_second(EventBus(mode=mode), rounds)
+        event_bus = EventBus(mode=mode)
+        metrics = event_bus.enable_metrics()
+        enabled = rounds_per_second(event_bus, rounds)
+        print(f"{mode:<7} metrics off {disabled:8.0f} rounds/s   metrics on {enabled:8.0f} rounds/s")
+
+    print("\nslowest handlers (queued dispatch):")
+    for event_type, name, stats in metrics.slowest_handlers(5):
+        summary = stats.as_dict()
+        print(f"  {event_type:<24} {name:<42} {summary['total_ms']:8.1f} ms total "
+              f"{summary['mean_us']:7.1f} us mean  p99 <= {summary['p99_us']} us")
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,24 @@
+"""Rounds/sec of the headless runner, which plays through the same GameManager and EventBus flow as the server.
+
+Run with: python -m benchmarks.bench_headless
+"""
+import logging
+
+from game.headless import HeadlessRunner
+
+
+def hit_below_17(hand, dealer_up_card, available_actions):
+    return 'h' if hand.score < 17 and 'h' in available_actions else 's'
+
+
+def main(rounds=50000):
+    for num_seats in (1, 3):
+        for bus_mode in ('sync', 'queued'):
+            runner = HeadlessRunner(policy=hit_below_17, num_seats=num_seats, seed=1, bus_mode=bus_mode)
+            stats = runner.play(rounds)
+            print(f"{num_seats} seat(s) {bus_mode:<7} {stats['rounds_per_second']:8.0f} rounds/s")
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,96 @@
+# Counts card evaluations per round with incremental hand scoring, compared with the previous
+# calculate_score() that walked the whole hand on every call.
+#
+# Run from the repository root:
+#     python -m benchmarks.bench_scoring
+import logging
+import time
+
+import game.utils
+from game.event_handler import EventHandler
+from game.game_manager import GameManager
+from game.player import Player
+from game.player_manager import PlayerManager
+from utils.event_bus import EventBus
+
+
+class RecountingPlayer(Player):
+    """Scores the hand the way Player did before the running totals were added."""
+    score = 0
+
+    def add_card(self, card):
+        self.cards.append(card)
+
+    def remove_last_card(self):
+        return self.cards.pop()
+
+    def has_blackjack(self):
+        self.calculate_score()
+        return self.score == 21 and len(self.cards) == 2
+
+    def is_busted(self):
+        self.calculate_score()
+        return self.score > 21
+
+    def calculate_score(self):
+        self.score = 0
+        ace_count = 0
+        for card in self.cards:
+            self.score += game.utils.card_value(card)
+            if card % 100 == 1:
+                ace_count += 1
+                self.score += 10
+        while self.score > 21 and ace_count > 0:
+            self.score -= 10
+            ace_count -= 1
+
+
+def play_rounds(player_class, rounds, num_seats=3, event_bus=None):
+    logger = logging.getLogger(__name__)
+    event_bus = event_bus if event_bus is not None else EventBus()
+    player_manager = PlayerManager(num_seats=num_seats, event_bus=event_bus, logger=logger)
+    game_manager = GameManager(num_decks=8, player_manager=player_manager, event_bus=event_bus, logger=logger, seed=1)
+    game_manager.dealer = player_class(name='dealer')
+    event_handler = EventHandler(event_bus=event_bus, logger=logger, game_manager=game_manager)
+    players = [player_class(name=f'bot{seat}', id=seat, balance=1000) for seat in range(num_seats)]
+    for player in players:
+        game_manager.add_player(player)
+
+    for _ in range(rounds):
+        for player in players:
+            game_manager.place_bet(player.id, 10)
+        while event_handler.current_player is not None:
+            hand = event_handler.current_player
+            game_manager.handle_action('h' if hand.score < 17 and 'h' in hand.available_actions else 's', hand)
+        for player in players:
+            player_manager.publish_result(player)
+
+
+def count_card_evaluations(player_class, rounds):
+    calls = 0
+    card_value = game.utils.card_value
+
+    def counting_card_value(card):
+        nonlocal calls
+        calls += 1
+        return card_value(card)
+
+    game.utils.card_value = counting_card_value
+    try:
+        start = time.perf_counter()
+        play_rounds(player_class, rounds)
+        elapsed = time.perf_counter() - start
+    finally:
+        game.utils.card_value = card_value
+    return calls / rounds, rounds / elapsed
+
+
+def main(rounds=5000):
+    for name, player_class in (('full recount', RecountingPlayer), ('incremental', Player)):
+        evaluations, rounds_per_second = count_card_evaluations(player_class, rounds)
+        print(f"{name:<14} {evaluations:6.1f} card evaluations/round   {rounds_per_second:8.0f} rounds/s")
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,67 @@
+"""Rounds/sec of bot tables played through the sharding dispatcher, for 1 and N worker processes.
+
+The tables are played twice: relayed, with every frame passing through the dispatcher process in both
+directions, and direct, with the bots looking up their table's worker at the dispatcher and connecting to it.
+
+Run with: python -m benchmarks.bench_sharding --workers 4 --tables 16
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import urllib.request
+
+from benchmarks.ws_bots import run_tables, wait_for_server
+from network.sharding import serve
+
+
+def find_worker_url(dispatcher_url, table_id):
+    with urllib.request.urlopen(f"{dispatcher_url}/shards/{table_id}") as response:
+        return json.load(response)['url']
+
+
+def measure(workers, tables, seconds, port, direct=False):
+    process = multiprocessing.get_context('spawn').Process(target=serve, args=(workers,),
+                                                           kwargs={'port': port, 'worker_port': port + 1})
+    process.start()
+    try:
+        wait_for_server(f"http://127.0.0.1:{port}/shards")
+        for worker in range(workers):
+            wait_for_server(f"http://127.0.0.1:{port + 1 + worker}/tables")
+        if direct:
+            # Table i plays on base_url[i], see run_tables().
+            base_url = [find_worker_url(f"http://127.0.0.1:{port}", f"bench{table}") for table in range(tables)]
+        else:
+            base_url = f"ws://127.0.0.1:{port}"
+        return asyncio.run(run_tables(base_url, tables, seats=1, seconds=seconds))
+    finally:
+        # Handlers of players still seated keep uvicorn from shutting down gracefully.
+        process.terminate()
+        process.join(5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=max(2, multiprocessing.cpu_count()))
+    parser.add_argument('--tables', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--port', type=int, default=56800)
+    args = parser.parse_args()
+
+    run = 0
+    for workers in sorted({1, args.workers}):
+        for direct in (False, True):
+            # A fresh set of ports each time, tables keep waiting for the bots of the previous run.
+            rounds_per_second = measure(workers, args.tables, args.seconds, args.port + run * 100, direct)
+            run += 1
+            route = 'direct ' if direct else 'relayed'
+            print(f"{workers} worker(s) {route} {args.tables} tables {rounds_per_second:8.0f} rounds/s")
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,39 @@
+# Compares the cost of a split hand against cloning a whole Player, as split() used to do.
+#
+# Run from the repository root:
+#     python -m benchmarks.bench_split
+import timeit
+import tracemalloc
+
+from game.player import Player, SplitHand
+from game.state import PlayerState
+
+
+def clone_player(player):
+    return Player(name=f"{player.name} (Split)", balance=0, id=player.id, origin_player_id=player.id,
+                  bet=player.initial_bet, initial_bet=player.initial_bet, state=PlayerState.AWAITING_MY_TURN,
+                  websocket=player.websocket)
+
+
+def split_hand(player):
+    return SplitHand(owner=player, bet=player.initial_bet, initial_bet=player.initial_bet)
+
+
+def allocated_bytes(make_hand, player, count=10000):
+    tracemalloc.start()
+    hands = [make_hand(player) for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del hands
+    return size / count
+
+
+def main(number=20000):
+    player = Player(name='bot', id='bot', balance=1000, initial_bet=10)
+    for name, make_hand in (('Player clone', clone_player), ('SplitHand', split_hand)):
+        seconds = min(timeit.repeat(lambda: make_hand(player), number=number, repeat=5)) / number
+        print(f"{name:<14} {seconds * 1e6:6.2f} us/hand   {allocated_bytes(make_hand, player):7.0f} bytes/hand")
+
+
+if __name__ == '__main__':
+    main()
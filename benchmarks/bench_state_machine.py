@@ -0,0 +1,60 @@
+"""GameStateMachine on the precompiled transition table against the transitions.Machine it replaced.
+
+Run with: python -m benchmarks.bench_state_machine
+"""
+import time
+
+from transitions import Machine
+
+from game.game_state_machine import GameStateMachine
+
+ROUND = ['start_betting', 'all_betting_done', 'cards_dealing_done', 'player_action_need', 'player_action_need',
+         'all_players_acted', 'dealer_turn_done', 'determine_winners_done', 'publish_results_done', 'cleanup_done',
+         'all_players_skipped', 'cleanup_done']
+
+
+class NullEventBus:
+    def subscribe(self, event_type, handler):
+        pass
+
+
+class TransitionsStateMachine:
+    """The previous GameStateMachine, one transitions.Machine per table."""
+
+    def __init__(self, event_bus, logger):
+        self.machine = Machine(model=self, states=GameStateMachine.states, initial='waiting_for_players')
+        self.event_bus = event_bus
+        self.logger = logger
+        for trigger, source, dest in GameStateMachine.transitions:
+            self.machine.add_transition(trigger, source, dest)
+
+
+def construct(machine_class, count):
+    event_bus, logger = NullEventBus(), None
+    start = time.perf_counter()
+    for _ in range(count):
+        machine_class(event_bus, logger)
+    return (time.perf_counter() - start) / count
+
+
+def fire(machine_class, rounds):
+    machine = machine_class(NullEventBus(), None)
+    # The first round starts from waiting_for_players, every later one from betting.
+    triggers = [getattr(machine, trigger) for trigger in ROUND[1:]]
+    machine.start_betting()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for trigger in triggers:
+            trigger()
+    return (time.perf_counter() - start) / (rounds * len(triggers))
+
+
+def main(tables=2000, rounds=20000):
+    for name, machine_class in (('transitions', TransitionsStateMachine), ('table', GameStateMachine)):
+        construct_us = construct(machine_class, tables) * 1e6
+        fire_ns = fire(machine_class, rounds) * 1e9
+        print(f"{name:<12} {construct_us:8.1f} us/table   {fire_ns:8.0f} ns/transition")
+
+
+if __name__ == '__main__':
+    main()
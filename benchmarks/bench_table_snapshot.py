@@ -0,0 +1,66 @@
+"""Cost of the player-turn messages of one table change: one full encode per player against the shared snapshot.
+
+Run with: python -m benchmarks.bench_table_snapshot
+"""
+import logging
+import time
+
+from game.player import Player
+from game.table import Table
+from network.models import RequestPlayerAction
+from network.codec import dump_request
+
+
+def build_table(seats):
+    table = Table('bench', logger=logging.getLogger(__name__), num_seats=seats, seed=1, bus_mode='sync')
+    players = [Player(name=f'bot{seat}', id=f'bot{seat}', balance=1000) for seat in range(seats)]
+    for player in players:
+        table.game_manager.add_player(player)
+    for player in players:
+        table.game_manager.place_bet(player.id, 10)
+    return table, players
+
+
+def request(player, game_manager, table_state):
+    return RequestPlayerAction(player_name=player.name, state='player_turn', table=table_state,
+                               available_actions=player.available_actions, balance=player.balance,
+                               score=player.score, need_shuffle=game_manager.deck.need_shuffle(),
+                               seat=game_manager.player_manager.get_seat_number(player.id))
+
+
+def per_player(game_manager, players):
+    messages = []
+    for player in players:
+        table_state = game_manager.get_table_state_array(hidden_card=True)
+        messages.append(request(player, game_manager, table_state).model_dump_json(exclude_none=True))
+    return messages
+
+
+def shared(game_manager, players):
+    messages = []
+    for player in players:
+        table_state, table_json = game_manager.get_table_snapshot(hidden_card=True)
+        messages.append(dump_request(request(player, game_manager, table_state), table_json))
+    return messages
+
+
+def run(encode, game_manager, players, changes):
+    start = time.perf_counter()
+    for _ in range(changes):
+        game_manager.table_version += 1  # One change of the table, as a dealt card would make
+        encode(game_manager, players)
+    return (time.perf_counter() - start) / changes
+
+
+def main(changes=5000):
+    for seats in (1, 3, 7):
+        table, players = build_table(seats)
+        per_player_us = run(per_player, table.game_manager, players, changes) * 1e6
+        shared_us = run(shared, table.game_manager, players, changes) * 1e6
+        print(f"{seats} seats: per player {per_player_us:7.1f} us/change   shared {shared_us:7.1f} us/change")
+        table.close()
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,113 @@
+"""Websocket bots that play rounds against a running server, used by the load benchmarks."""
+import asyncio
+import json
+import time
+import urllib.request
+
+import websockets
+
+from network.codec import decode_request, encode_action
+from network.delta import apply_delta
+
+
+def choose_action(message):
+    actions = message['available_actions']
+    if 'h' in actions and message['score'] < 17:
+        return 'h'
+    return 's'
+
+
+async def play_bot(url, name, deadline, bet='10', encoding='json', delta=False, autopilot=None, standing_bet=None):
+    """Play until deadline (time.monotonic()), returns the number of results received.
+
+    autopilot, a StrategyTable.to_dict(), is uploaded with the first bet so the server plays the bot's hands,
+    standing_bet, a BetRule.to_dict(), so the server bets for the bot in the following rounds.
+    """
+    rounds = 0
+    first_bet = {field: value for field, value in (('autopilot', autopilot), ('standing_bet', standing_bet))
+                 if value is not None}
+    if encoding == 'binary':
+        url += ('&' if '?' in url else '?') + 'encoding=binary'
+    if delta:
+        url += ('&' if '?' in url else '?') + 'delta=true'
+    tables = {}  # Tables received in delta mode by sequence number
+    async with websockets.connect(url, max_size=None) as websocket:
+        while time.monotonic() < deadline:
+            # A table waits for all of its players, so once one bot has left the others stop at the deadline too.
+            try:
+                frame = await asyncio.wait_for(websocket.recv(), deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                break
+            if encoding == 'binary' and isinstance(frame, bytes):
+                message = decode_request(frame)
+            else:
+                message = json.loads(frame)
+            if message['state'] == 'betting':
+                if first_bet and encoding == 'json':
+                    await websocket.send(json.dumps({'player_name': name, 'action': bet, **first_bet}))
+                    first_bet = None
+                else:
+                    await websocket.send(encode(encoding, name, bet))
+            elif message['state'] == 'player_turn':
+                ack = track_table(message, tables) if delta else None
+                await websocket.send(encode(encoding, message['player_name'], choose_action(message), ack))
+            elif message['state'] == 'publish_result':
+                if delta:
+                    track_table(message, tables)
+                rounds += 1
+    return rounds
+
+
+def track_table(message, tables):
+    """Rebuild the full table of a delta mode message, returns the seq to acknowledge."""
+    if 'base' in message:
+        if message['base'] not in tables:
+            return 0  # Out of step, ask for a full table
+        message['table'] = apply_delta(tables[message['base']], message['delta'])
+    tables[message['seq']] = message['table']
+    if len(tables) > 8:
+        del tables[min(tables)]
+    return message['seq']
+
+
+def encode(encoding, player_name, action, ack=None):
+    if encoding == 'binary':
+        return encode_action(player_name, action)
+    if ack is None:
+        return json.dumps({'player_name': player_name, 'action': action})
+    return json.dumps({'player_name': player_name, 'action': action, 'ack': ack})
+
+
+async def run_tables(base_url, tables, seats, seconds, encoding='json', delta=False, autopilot=None,
+                     standing_bet=None):
+    """One bot per seat on each of tables tables, returns the total rounds played per second.
+
+    base_url can be a list of servers, table number i then plays on server i modulo their number.
+    """
+    deadline = time.monotonic() + seconds
+    base_urls = [base_url] if isinstance(base_url, str) else base_url
+    bots = []
+    for table in range(tables):
+        for seat in range(seats):
+            name = f"bot{table}-{seat}"
+            url = f"{base_urls[table % len(base_urls)]}/ws/bench{table}/{name}?seats={seats}"
+            bots.append(play_bot(url, name, deadline,
+                                 encoding=encoding, delta=delta, autopilot=autopilot,
+                                 standing_bet=standing_bet))
+    results = await asyncio.gather(*bots, return_exceptions=True)
+    rounds = sum(result for result in results if isinstance(result, int))
+    # Every seat receives the result of its table's round.
+    return rounds / seats / seconds
+
+
+def wait_for_server(url, timeout=30):
+    """Poll an HTTP url until the server answers."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(url):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
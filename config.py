@@ -1,27 +1,36 @@
 # config.py
 import logging
+import os
 
 from game.game_state_machine import GameStateMachine
-from game.player_manager import PlayerManager
 from game.event_handler import EventHandler
 from game.game_manager import GameManager
+from game.table import TableRegistry
 from utils.event_bus import EventBus
 import utils.log_setup
 
-event_bus = EventBus()
-
 logger = utils.log_setup.setup_logger(log_level=logging.WARN, name=__name__)
 
-player_manager = PlayerManager(num_seats=1, event_bus=event_bus, logger=logger)
+# Every table owns its bus, state machine, game manager and event handler. Tables created on demand by
+# /ws/{table_id}/{client_name} share these defaults. Per event and per handler timings are recorded when
+# BLACKJACK_EVENT_METRICS is set and served as JSON on /metrics/events.
+table_registry = TableRegistry(logger=logger, max_tables=1000, num_decks=8,
+                               event_metrics=bool(os.environ.get('BLACKJACK_EVENT_METRICS')))
+
+DEFAULT_TABLE_ID = 'default'
+
+# The table served by /ws/{client_name}
+default_table = table_registry.create_table(DEFAULT_TABLE_ID, num_seats=1, shoe_pool_depth=2)
+
+event_bus = default_table.event_bus
 
-game_state_machine = GameStateMachine(event_bus=event_bus, logger=logger)
+player_manager = default_table.player_manager
 
-# Setup GameManager with all dependencies
-game_manager = GameManager(num_decks=8,
-                           player_manager=player_manager, event_bus=event_bus,
-                           logger=logger)
+game_state_machine = default_table.game_state_machine
 
-event_handler = EventHandler(event_bus=event_bus, logger=logger, game_manager=game_manager)
+game_manager = default_table.game_manager
+
+event_handler = default_table.event_handler
 
 
 async def get_game_manager() -> GameManager:
@@ -38,3 +47,7 @@ async def get_state_machine() -> GameStateMachine:
 
 async def get_event_handler() -> EventHandler:
     return event_handler
+
+
+async def get_table_registry() -> TableRegistry:
+    return table_registry
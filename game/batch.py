@@ -0,0 +1,245 @@
+"""Vectorized simulation of many single-seat rounds of a fixed StrategyTable.
+
+Every round is dealt from its own window of cards cut from a shuffled shoe, so a batch of rounds is a
+(rounds x window) array and each step of play is a handful of NumPy operations over all rounds still
+playing. The rules follow the scalar engine:
+  * the deal order of deal_initial_cards: player, dealer up card, player, dealer hole card,
+  * the dealer draws while below 17, standing on soft 17 as GameManager.dealer_turn does,
+  * a split hand takes the origin hand's second card, then the origin and the split hand draw one card each
+    and the origin hand is played first,
+  * settlement as in GameManager.determine_winners, including its quirks: a two-card 21 and a dealer's
+    three-card 21 push (and the other way round), an insured hand loses the main bet to a dealer blackjack
+    even when it pushes, and a winning hand gets the blackjack bonus when the seat's own hand is a two-card
+    21, split hands included.
+A seat splits at most once. Results are in units of the initial bet.
+"""
+import math
+
+import numpy as np
+
+from game.strategy import HIT, DOUBLE, DOUBLE_OR_STAND
+
+WINDOW = 48  # Cards reserved per round, rounds that need more are counted as overflow and left out.
+
+
+class RunningStats:
+    """Count, mean and sum of squared deviations of a stream of results, mergeable across batches."""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size:
+            batch_mean = float(values.mean())
+            self.merge(RunningStats(values.size, batch_mean, float(((values - batch_mean) ** 2).sum())))
+        return self
+
+    def merge(self, other):
+        # Chan et al. pairwise update, stable for any batch sizes.
+        count = self.count + other.count
+        if not count:
+            return self
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        return self
+
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def std_error(self):
+        return math.sqrt(self.variance() / self.count) if self.count else 0.0
+
+    def summary(self, z=1.96):
+        half_width = z * self.std_error()
+        return {'rounds': self.count, 'ev': self.mean, 'variance': self.variance(), 'std_error': self.std_error(),
+                'ci': (self.mean - half_width, self.mean + half_width)}
+
+
+def deal_windows(rounds, rng, num_decks=8, window=WINDOW):
+    """A (rounds x window) array of card codes, consecutive windows of freshly shuffled shoes."""
+    num_decks = max(6, min(num_decks, 8))  # Same limits as Deck
+    shoe = np.array([suit * 100 + value for suit in range(1, 5) for value in range(1, 14)] * num_decks,
+                    dtype=np.int16)
+    per_shoe = len(shoe) // window
+    shoes = rng.permuted(np.tile(shoe, (-(-rounds // per_shoe), 1)), axis=1)
+    return shoes[:, :per_shoe * window].reshape(-1, window)[:rounds]
+
+
+class _Hands:
+    """One hand per round, as arrays."""
+
+    def __init__(self, rounds):
+        self.hard = np.zeros(rounds, dtype=np.int16)
+        self.aces = np.zeros(rounds, dtype=np.int16)
+        self.cards = np.zeros(rounds, dtype=np.int16)
+        self.doubled = np.zeros(rounds, dtype=bool)
+
+    def add(self, lanes, values):
+        self.hard[lanes] += values
+        self.aces[lanes] += values == 1
+        self.cards[lanes] += 1
+
+    def remove(self, lanes, values):
+        self.hard[lanes] -= values
+        self.aces[lanes] -= values == 1
+        self.cards[lanes] -= 1
+
+    def score(self, lanes=slice(None)):
+        hard = self.hard[lanes]
+        return hard + 10 * ((self.aces[lanes] > 0) & (hard <= 11))
+
+
+class _Shoe:
+    """The card windows of a batch with one read position per round."""
+
+    def __init__(self, windows):
+        self.values = np.minimum(windows % 100, 10)
+        self.cursor = np.full(len(windows), 4, dtype=np.int64)
+        self.overflow = np.zeros(len(windows), dtype=bool)
+
+    def draw(self, lanes):
+        position = self.cursor[lanes]
+        past_end = position >= self.values.shape[1]
+        self.overflow[lanes[past_end]] = True
+        self.cursor[lanes] += 1
+        return self.values[lanes, np.minimum(position, self.values.shape[1] - 1)]
+
+
+def _play_hand(strategy, hands, lanes, up, shoe):
+    active = lanes
+    while active.size:
+        hard = hands.hard[active]
+        soft = (hands.aces[active] > 0) & (hard <= 11)
+        total = hard + 10 * soft
+        two_cards = hands.cards[active] == 2
+        # A two-card 21 and a doubled hand may only stand.
+        playing = ~((two_cards & (total == 21)) | hands.doubled[active])
+        code = np.where(soft, strategy.soft[total, up[active]], strategy.hard[total, up[active]])
+
+        double = playing & two_cards & ((code == DOUBLE) | (code == DOUBLE_OR_STAND))
+        hit = playing & ((code == HIT) | ((code == DOUBLE) & ~two_cards))
+        hands.doubled[active[double]] = True
+        drawing = active[double | hit]
+        hands.add(drawing, shoe.draw(drawing))
+
+        hitting = active[hit]
+        active = hitting[hands.hard[hitting] <= 21]
+
+
+def _settle(hands, lanes, dealer_score, dealer_blackjack, dealer_busted, insured, bonus):
+    bet = 1 + hands.doubled[lanes]
+    score = hands.score(lanes)
+    alive = hands.hard[lanes] <= 21
+    insurance_paid = alive & dealer_blackjack[lanes] & insured
+    won = alive & ~insurance_paid & (dealer_busted[lanes] | ((score > dealer_score[lanes]) & ~dealer_blackjack[lanes]))
+    pushed = alive & ~insurance_paid & ~won & (score == dealer_score[lanes])
+    returned = 1.5 * insurance_paid + won * (2.0 * bet + 0.5 * bonus[lanes]) + pushed * bet
+    return returned - bet
+
+
+def play_windows(strategy, windows):
+    """Play one round per card window, returns the net result of every round and a mask of the overflowed ones."""
+    if strategy.max_splits > 1:
+        raise ValueError("The batch simulator splits at most once per seat")
+    rounds = len(windows)
+    lanes = np.arange(rounds)
+    shoe = _Shoe(windows)
+    values = shoe.values
+    up = values[:, 1].astype(np.intp)
+
+    player = _Hands(rounds)
+    player.add(lanes, values[:, 0])
+    player.add(lanes, values[:, 2])
+    dealer = _Hands(rounds)
+    dealer.add(lanes, values[:, 1])
+    dealer.add(lanes, values[:, 3])
+    player_blackjack = player.score() == 21
+
+    insured = np.zeros(rounds, dtype=bool)
+    if strategy.take_insurance:
+        insured = (up == 1) & ~player_blackjack
+
+    split = np.zeros(rounds, dtype=bool)
+    split_hand = _Hands(rounds)
+    if strategy.max_splits >= 1:
+        ranks = windows % 100
+        split = (ranks[:, 0] == ranks[:, 2]) & strategy.pairs[values[:, 0], up]
+        split_lanes = lanes[split]
+        second_card = values[split_lanes, 2]
+        player.remove(split_lanes, second_card)
+        split_hand.add(split_lanes, second_card)
+        player.add(split_lanes, shoe.draw(split_lanes))
+        split_hand.add(split_lanes, shoe.draw(split_lanes))
+
+    _play_hand(strategy, player, lanes, up, shoe)
+    if split.any():
+        _play_hand(strategy, split_hand, lanes[split], up, shoe)
+
+    dealer_blackjack = dealer.score() == 21
+    drawing = lanes
+    while drawing.size:
+        drawing = drawing[dealer.score(drawing) < 17]
+        dealer.add(drawing, shoe.draw(drawing))
+    dealer_score = dealer.score()
+    dealer_busted = dealer_score > 21
+
+    # The blackjack bonus looks at the seat's own hand, also when a split hand wins.
+    bonus = (player.cards == 2) & (player.score() == 21)
+    net = _settle(player, lanes, dealer_score, dealer_blackjack, dealer_busted, insured, bonus) - 0.5 * insured
+    if split.any():
+        split_lanes = lanes[split]
+        net[split_lanes] += _settle(split_hand, split_lanes, dealer_score, dealer_blackjack, dealer_busted,
+                                    np.zeros(len(split_lanes), dtype=bool), bonus)
+    return net, shoe.overflow
+
+
+def simulate(strategy, rounds, num_decks=8, seed=None, batch_size=200000, window=WINDOW):
+    """EV per initial bet of strategy over rounds rounds, with its variance and a 95% confidence interval."""
+    rng = np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed)))
+    stats, overflow = simulate_stats(strategy, rounds, rng, num_decks=num_decks, batch_size=batch_size, window=window)
+    return {**stats.summary(), 'overflow': overflow}
+
+
+def simulate_stats(strategy, rounds, rng, num_decks=8, batch_size=200000, window=WINDOW):
+    """Play rounds rounds dealt from rng, returns their RunningStats and the number of overflowed rounds."""
+    stats = RunningStats()
+    overflow = 0
+    remaining = rounds
+    while remaining > 0:
+        windows = deal_windows(min(batch_size, remaining), rng, num_decks=num_decks, window=window)
+        net, overflowed = play_windows(strategy, windows)
+        stats.update(net[~overflowed])
+        overflow += int(overflowed.sum())
+        remaining -= len(windows)
+    return stats, overflow
+
+
+def cross_check(strategy, rounds=1000, num_decks=8, seed=None):
+    """Replay rounds card windows through the scalar engine and compare every round's result.
+
+    Returns the indexes of the rounds whose results differ, which should be none.
+    """
+    from game.headless import HeadlessRunner
+
+    rng = np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed)))
+    windows = deal_windows(rounds, rng, num_decks=num_decks)
+    net, overflowed = play_windows(strategy, windows)
+
+    bet = 10
+    runner = HeadlessRunner(policy=strategy.action, bet=bet, balance=0)
+    mismatches = []
+    try:
+        for index, window in enumerate(windows):
+            # Deck deals from the end of its cards, so the window goes in reversed.
+            runner.game_manager.deck.cards = window[::-1].tolist()
+            change = runner.play_round()[0] / bet
+            if not overflowed[index] and change != net[index]:
+                mismatches.append(index)
+    finally:
+        runner.close()
+    return mismatches
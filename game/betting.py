@@ -0,0 +1,38 @@
+"""Standing bets: a rule a seat registers once and the server bets by at the opening of every betting round."""
+
+
+def check_bet(amount, minimum=1):
+    """amount as an int, raises ValueError when it is not a whole number of at least minimum."""
+    amount = int(amount)
+    if amount < minimum:
+        raise ValueError(f"Bets must be at least {minimum}, got {amount}")
+    return amount
+
+
+class BetRule:
+    """A fixed bet, or a ramp of bets keyed on the Hi-Lo true count.
+
+    ramp maps true counts to amounts: the seat bets the amount of the highest count at or below the true
+    count, and amount when the true count is below all of them. Every amount is at least 1, sitting a round
+    out stays a decision of the client.
+    """
+
+    def __init__(self, amount, ramp=None):
+        self.amount = check_bet(amount)
+        self.ramp = sorted((float(count), check_bet(bet)) for count, bet in (ramp or {}).items())
+
+    def bet(self, true_count):
+        amount = self.amount
+        for count, ramp_amount in self.ramp:
+            if true_count < count:
+                break
+            amount = ramp_amount
+        return amount
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of to_dict()."""
+        return cls(data['amount'], data.get('ramp'))
+
+    def to_dict(self):
+        return {'amount': self.amount, 'ramp': {count: amount for count, amount in self.ramp}}
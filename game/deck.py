@@ -1,14 +1,46 @@
-import random
+import numpy as np
+
 import utils.log_setup
+from game.shoe_pool import ShoePool
+
+# Hi-Lo tag of each card value, indexed by card % 100: 2-6 count +1, 7-9 count 0, tens and aces -1.
+HI_LO = (0, -1, 1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1)
+
+
+def spawn_seeds(seed, count):
+    """Split one table or simulation seed into `count` independent, non-overlapping streams.
+
+    Each returned SeedSequence can be passed as the seed of a Deck (or GameManager), so K tables
+    or worker processes can share one master seed without their shoes colliding.
+    """
+    return np.random.SeedSequence(seed).spawn(count)
 
 
 class Deck:
-    def __init__(self, num_decks=6):
+    def __init__(self, num_decks=6, shoe_pool_depth=0, seed=None):
         # Ensure num_decks is between 6 and 8.
         self.num_decks = max(6, min(num_decks, 8))
-        self.cards = self._create_deck()
+        self.maximum_deck_size = self.num_decks * 52
+        # The shoe is a preallocated array of card codes. Cards are dealt from the end of the
+        # array, so self._cursor is both the read position and the number of cards left.
+        self._fresh_shoe = np.array(self._create_deck(), dtype=np.int16)
+        self._shoe = self._fresh_shoe.copy()
+        self._cursor = len(self._shoe)
+        # Remaining cards per value (index 0 is aces, 12 is kings) and the Hi-Lo running count of
+        # the cards dealt since the last shuffle. Both are updated on every deal_card.
+        self.rank_counts = [4 * self.num_decks] * 13
+        self.running_count = 0
+        # Shoe order and cut card position come from separate PCG64 streams of the same seed, so
+        # a given seed reproduces the same shoes whether or not they are shuffled by a ShoePool.
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        shuffle_seed, cut_seed = (np.random.SeedSequence(self.seed_sequence.entropy,
+                                                         spawn_key=self.seed_sequence.spawn_key + (stream,))
+                                  for stream in range(2))
+        self.rng = np.random.Generator(np.random.PCG64(shuffle_seed))
+        self.cut_rng = np.random.Generator(np.random.PCG64(cut_seed))
         self.plastic_card_pos = 0
-        self.maximum_deck_size = num_decks * 52
+        # Optionally keep pre-shuffled shoes ready in the background, see ShoePool.
+        self.shoe_pool = ShoePool(self._fresh_shoe, depth=shoe_pool_depth, rng=self.rng) if shoe_pool_depth else None
         self.logger = utils.log_setup.setup_logger(name=__name__)
 
     def _create_deck(self):
@@ -17,30 +49,127 @@ class Deck:
 
         return cards
 
+    @property
+    def cards(self):
+        """The cards left in the shoe, the next card to be dealt is the last one."""
+        return self._shoe[:self._cursor].tolist()
+
+    @cards.setter
+    def cards(self, cards):
+        # Load an explicit card order into the shoe, mostly used to stack the deck in tests.
+        if len(cards) > len(self._shoe):
+            self._shoe = np.empty(len(cards), dtype=np.int16)
+        self._shoe[:len(cards)] = cards
+        self._cursor = len(cards)
+        self.rank_counts = [0] * 13
+        for card in cards:
+            self.rank_counts[card % 100 - 1] += 1
+        self.running_count = 0
+
+    def cards_left(self):
+        return self._cursor
+
+    def true_count(self):
+        """Running count per deck left in the shoe."""
+        return self.running_count * 52 / self._cursor if self._cursor else 0.0
+
     def shuffle(self):
-        self.cards = self._create_deck()
-        random.shuffle(self.cards)
+        if self.shoe_pool is not None:
+            self.shoe_pool.recycle(self._shoe)
+            self._shoe = self.shoe_pool.take()
+        else:
+            if len(self._shoe) != len(self._fresh_shoe):
+                self._shoe = np.empty_like(self._fresh_shoe)
+            np.copyto(self._shoe, self._fresh_shoe)
+            self.rng.shuffle(self._shoe)
+        self._cursor = len(self._shoe)
+        self.rank_counts = [4 * self.num_decks] * 13
+        self.running_count = 0
         self.plastic_card_pos = self.random_plastic_card_index()
 
     def deal_card(self):
-        if not self.cards:
+        if not self._cursor:
             # This should not happen but adding a check for safety.
-            self.cards = self._create_deck()
             self.shuffle()
-        return self.cards.pop()
+        self._cursor -= 1
+        card = self._shoe.item(self._cursor)
+        value = card % 100
+        self.rank_counts[value - 1] -= 1
+        self.running_count += HI_LO[value]
+        return card
 
     def random_plastic_card_index(self):
         half_length = self.maximum_deck_size // 2  # Integer division to get half-length of cards
-        full_length = self.maximum_deck_size * 52
 
-        return random.randint(half_length - half_length // 4, half_length + half_length // 4)
+        return int(self.cut_rng.integers(half_length - half_length // 4, half_length + half_length // 4,
+                                         endpoint=True))
 
     def shuffle_if_needed(self):
-        if len(self.cards) < (self.maximum_deck_size - self.plastic_card_pos):
+        if self.need_shuffle():
             self.shuffle()
             self.logger.info("Shuffled")
 
+    def close(self):
+        if self.shoe_pool is not None:
+            self.shoe_pool.close()
+
     def need_shuffle(self):
-        if len(self.cards) < (self.maximum_deck_size - self.plastic_card_pos):
+        if self._cursor < (self.maximum_deck_size - self.plastic_card_pos):
             return True
         return False
+
+
+class ContinuousShuffleDeck(Deck):
+    """A shoe fed by a continuous shuffling machine (CSM).
+
+    Every card is picked at random from the cards left in the machine, so the shoe is never shuffled
+    as a whole. Dealt cards collect at the back of the array and are fed back into the machine by
+    shuffle_if_needed() at the end of a round, once at least `return_threshold` of them are out.
+    """
+
+    def __init__(self, num_decks=6, seed=None, return_threshold=0):
+        super().__init__(num_decks=num_decks, seed=seed)
+        self.return_threshold = return_threshold
+        self._uniforms = []  # Pre-drawn random numbers in [0, 1), consumed one per card.
+
+    def shuffle(self):
+        # Loading the machine only means returning the dealt cards, the order does not matter.
+        self.return_dealt_cards()
+
+    def return_dealt_cards(self):
+        if len(self._shoe) != len(self._fresh_shoe):
+            self._shoe = self._fresh_shoe.copy()
+            self.rank_counts = [4 * self.num_decks] * 13
+        else:
+            for card in self._shoe[self._cursor:].tolist():
+                self.rank_counts[card % 100 - 1] += 1
+        self._cursor = len(self._shoe)
+        self.running_count = 0
+
+    def cards_out(self):
+        return len(self._shoe) - self._cursor
+
+    def deal_card(self):
+        if not self._cursor:
+            # The machine ran dry in the middle of a round.
+            self.return_dealt_cards()
+        if not self._uniforms:
+            self._uniforms = self.rng.random(1024).tolist()
+        # Pick a random remaining card and swap it to the back of the remaining cards.
+        pick = int(self._uniforms.pop() * self._cursor)
+        self._cursor -= 1
+        shoe = self._shoe
+        card = shoe.item(pick)
+        shoe[pick] = shoe.item(self._cursor)
+        shoe[self._cursor] = card
+        value = card % 100
+        self.rank_counts[value - 1] -= 1
+        self.running_count += HI_LO[value]
+        return card
+
+    def shuffle_if_needed(self):
+        if self.cards_out() >= self.return_threshold:
+            self.return_dealt_cards()
+
+    def need_shuffle(self):
+        return False
@@ -0,0 +1,137 @@
+"""Gymnasium-style environments over an in-process table, for training agents without the server.
+
+One episode is one round of a single seat. reset() places the bet and returns the first decision,
+step(action) plays one of the action codes of game.utils.convert_actions, given as 'h', 's', 'd', 'p' or
+'i' or as its index in ACTIONS. The reward, in units of the bet, is paid on the step that ends the round.
+After a split the agent keeps acting for whichever hand has the turn.
+
+Observations are copies of the table's TableObservation buffer (see game.observation for the layout): the
+seat's hand in play, the dealer, the remaining shoe, the turn and the action mask, which is also returned as
+info['action_mask'].
+
+The API follows gymnasium (reset() -> (observation, info), step() -> (observation, reward, terminated,
+truncated, info)) without depending on it.
+"""
+import logging
+
+import numpy as np
+
+import utils.log_setup
+from game.deck import spawn_seeds
+from game.observation import ACTIONS, TableObservation
+from game.player import Player
+from game.table import Table
+
+logger = utils.log_setup.setup_logger(name=__name__, log_level=logging.WARN)
+
+_LAYOUT = TableObservation(num_seats=1)
+OBSERVATION_SIZE = _LAYOUT.size
+ACTION_MASK = _LAYOUT.offsets['action_mask']  # Slice of the action mask in an observation
+
+
+class BlackjackEnv:
+    def __init__(self, bet=10, num_decks=8, seed=None, shuffle_mode='cut_card'):
+        self.bet = bet
+        self.num_decks = num_decks
+        self.shuffle_mode = shuffle_mode
+        self._build(seed)
+
+    def _build(self, seed):
+        self.table = Table('env', logger=logger, num_seats=1, num_decks=self.num_decks, seed=seed,
+                           shuffle_mode=self.shuffle_mode, bus_mode='sync', observation=True)
+        self.game_manager = self.table.game_manager
+        self.observation = self.game_manager.observation
+        self.event_handler = self.table.event_handler
+        self.player = Player(logger=logger, name='agent', id='agent', balance=0)
+        self.game_manager.add_player(self.player)
+        self.round_start_balance = 0
+
+    def reset(self, seed=None):
+        """Start a new round, returns the observation and info of its first decision."""
+        if seed is not None:
+            self.table.close()
+            self._build(seed)
+        elif self.event_handler.current_player is not None:
+            # Abandon the round in play by standing on every hand that is left.
+            while (hand := self.event_handler.current_player) is not None:
+                self.game_manager.handle_action('s', hand)
+            self._finish_round()
+
+        self.round_start_balance = self.player.balance
+        self.game_manager.place_bet(self.player.id, self.bet)
+        return self._decision()
+
+    def step(self, action):
+        if not isinstance(action, str):
+            action = ACTIONS[int(action)]
+        hand = self.event_handler.current_player
+        if hand is None:
+            raise RuntimeError("The round is over, call reset()")
+        if action not in hand.available_actions:
+            raise ValueError(f"Action {action} is not allowed for {hand.name}, allowed: {hand.available_actions}")
+        self.game_manager.handle_action(action, hand)
+
+        if self.event_handler.current_player is not None:
+            observation, info = self._decision()
+            return observation, 0.0, False, False, info
+
+        # Every hand has acted, the dealer has played and the round has been settled.
+        observation = self.observation.view.copy()
+        info = {'action_mask': observation[ACTION_MASK].astype(bool), 'dealer_score': self.game_manager.dealer.score}
+        reward = (self.player.balance - self.round_start_balance) / self.bet
+        self._finish_round()
+        return observation, reward, True, False, info
+
+    def _decision(self):
+        observation = self.observation.view.copy()
+        return observation, {'action_mask': observation[ACTION_MASK].astype(bool),
+                             'hand': self.event_handler.current_player.name}
+
+    def _finish_round(self):
+        # Publishing the result cleans the table up and opens the next betting round.
+        if self.table.game_state_machine.get_state() == 'publish_result':
+            self.table.player_manager.publish_result(self.player)
+
+    def close(self):
+        self.table.close()
+
+
+class BlackjackVectorEnv:
+    """num_envs independent tables stepped together, with stacked NumPy observations, rewards and flags.
+
+    A table whose round ends is reset in the same step. Its final observation is then in
+    info['final_observation'] and the returned observation is the first decision of the next round.
+    """
+
+    def __init__(self, num_envs, bet=10, num_decks=8, seed=None, shuffle_mode='cut_card'):
+        self.num_envs = num_envs
+        self.envs = [BlackjackEnv(bet=bet, num_decks=num_decks, seed=env_seed, shuffle_mode=shuffle_mode)
+                     for env_seed in spawn_seeds(seed, num_envs)]
+        self.observations = np.zeros((num_envs, OBSERVATION_SIZE), dtype=np.float32)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+
+    def reset(self, seed=None):
+        seeds = spawn_seeds(seed, self.num_envs) if seed is not None else [None] * self.num_envs
+        for index, (env, env_seed) in enumerate(zip(self.envs, seeds)):
+            self.observations[index], _ = env.reset(seed=env_seed)
+        return self.observations.copy(), {'action_mask': self.observations[:, ACTION_MASK].astype(bool)}
+
+    def step(self, actions):
+        final_observation = np.zeros_like(self.observations)
+        for index, (env, action) in enumerate(zip(self.envs, actions)):
+            observation, reward, terminated, truncated, _ = env.step(action)
+            self.rewards[index] = reward
+            self.terminated[index] = terminated
+            self.truncated[index] = truncated
+            if terminated:
+                final_observation[index] = observation
+                observation, _ = env.reset()
+            self.observations[index] = observation
+        info = {'action_mask': self.observations[:, ACTION_MASK].astype(bool), 'final_observation': final_observation}
+        return (self.observations.copy(), self.rewards.copy(), self.terminated.copy(), self.truncated.copy(), info)
+
+    def close(self):
+        for env in self.envs:
+            env.close()
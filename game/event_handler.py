@@ -22,7 +22,9 @@ class EventHandler:
         self.event_bus.subscribe('dealer_turn_done', self.determine_winners)
         self.event_bus.subscribe('determine_winners_done', self.publish_results)
         self.event_bus.subscribe('publish_results_done', self.cleanup_after_round)
+        self.event_bus.subscribe('cleanup_done', self.place_standing_bets)
         self.event_bus.subscribe("all_players_skipped", self.handle_all_players_skipped)
+        self.event_bus.subscribe('all_players_left', self.handle_all_players_left)
 
         self.bet_finished = Event()
         self.ready_to_start = Event()
@@ -33,9 +35,13 @@ class EventHandler:
 
     def start_betting(self):
         self.ready_to_start.set()
-        if self.game_manager.deck.need_shuffle:
-            self.game_manager.deck.shuffle()
+        self.game_manager.deck.shuffle_if_needed()
         self.logger.info("Starting betting")
+        self.game_manager.place_standing_bets()
+
+    def place_standing_bets(self):
+        # Seats with a standing bet are in the new round without a round trip to their clients.
+        self.game_manager.place_standing_bets()
 
     def start_dealing_cards(self):
         self.logger.debug("bet_finished.set()")
@@ -44,14 +50,22 @@ class EventHandler:
         self.event_bus.publish('cards_dealing_done')
 
     def start_player_turn(self):
-        self.current_player = self.game_manager.player_manager.get_current_turn_player()
-        if self.current_player is not None:
+        # Hands on autopilot are played in this loop rather than through player_acted, so that with a 'sync'
+        # bus the stack does not grow with every action of the round.
+        while True:
+            self.current_player = self.game_manager.player_manager.get_current_turn_player()
+            if self.current_player is None:
+                self.logger.info("All players acted")
+                self.event_bus.publish('all_players_acted')
+                return
             self.logger.info("game_manager.player_manager.player_events[current_player.id].set()")
             self.game_manager.player_manager.player_events[self.current_player.id].set()
             self.game_manager.player_turn(self.current_player)
-        else:
-            self.logger.info("All players acted")
-            self.event_bus.publish('all_players_acted')
+            action = self.game_manager.autopilot_action(self.current_player)
+            if action is None:
+                return
+            self.game_manager.apply_action(action, self.current_player)
+            self.game_manager.player_manager.player_events[self.current_player.id].clear()
 
     def update_player_event(self):
         if self.current_player is not None:
@@ -97,3 +111,12 @@ class EventHandler:
         self.ready_to_start.set()
         self.logger.debug("bet_finished.set()")
         self.bet_finished.set()
+
+    def handle_all_players_left(self):
+        # The players joining next wait for their table to fill up again, as at the first round.
+        self.current_player = None
+        self.ready_to_start.clear()
+        self.bet_finished.clear()
+        self.wait_for_dealer.clear()
+        self.wait_for_result.clear()
+        self.wait_for_new_round.clear()
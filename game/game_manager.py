@@ -1,5 +1,8 @@
-from game.deck import Deck
+from game.betting import check_bet
+from game.deck import Deck, ContinuousShuffleDeck, HI_LO
+from game.observation import TableObservation
 from game.player import Player
+from pydantic_core import to_json
 
 import game.utils
 
@@ -7,13 +10,18 @@ from game.state import GameState, PlayerState
 
 
 class GameManager:
-    def __init__(self, num_decks, player_manager, event_bus, logger):
+    def __init__(self, num_decks, player_manager, event_bus, logger, shoe_pool_depth=0, seed=None,
+                 shuffle_mode='cut_card', csm_return_threshold=0):
         self.logger = logger
 
         self.player_manager = player_manager
         self.event_bus = event_bus
 
-        self.deck = Deck(num_decks=num_decks)
+        # 'cut_card' reshuffles the whole shoe at the plastic card, 'csm' uses a continuous shuffler.
+        if shuffle_mode == 'csm':
+            self.deck = ContinuousShuffleDeck(num_decks=num_decks, seed=seed, return_threshold=csm_return_threshold)
+        else:
+            self.deck = Deck(num_decks=num_decks, shoe_pool_depth=shoe_pool_depth, seed=seed)
         self.deck.shuffle()
         self.dealer = Player(name='dealer')
         self.available_bets = [str(bet) for bet in [1, 2, 5, 25, 100, 500]]
@@ -21,6 +29,61 @@ class GameManager:
         self.betting_event = None
         self.waiting_players_to_join = None  # Initialized later
         self.round_counter = 0
+        self.hole_card_hidden = False  # True from the deal until the dealer plays
+        self.observation = None  # TableObservation while enabled, see enable_observation().
+        # Bumped whenever a card is dealt or the hands at the table change, see get_table_snapshot().
+        self.table_version = 0
+        self._table_snapshots = {}  # Maps hidden_card to (version, table state array, its JSON)
+        # Deltas between the tables of this round, shared by the clients in delta mode, see network/delta.py.
+        self.table_deltas = {}
+        self.autopilots = {}  # Maps player ids to the StrategyTable playing their hands, see set_autopilot()
+        self.standing_bets = {}  # Maps player ids to the BetRule the server bets by, see place_standing_bets()
+        self.bet_overrides = {}  # Maps player ids to the amount replacing their standing bet for one round
+
+    def enable_observation(self):
+        """Keep a fixed-size TableObservation of this table up to date from now on and return it."""
+        if self.observation is None:
+            self.observation = TableObservation(self.player_manager.num_seats)
+            self._observe_table(hidden_card=self.hole_card_hidden)
+        return self.observation
+
+    def _observe_table(self, hidden_card):
+        for seat, player in self.player_manager.players_by_seat.items():
+            self.observation.update_hand(seat, player)
+        self.observation.update_dealer(self.dealer, hidden=hidden_card)
+        self.observation.update_shoe(self.deck, hole_card=self.dealer.cards[1] if hidden_card else None)
+
+    def set_autopilot(self, player_id, strategy):
+        """Let strategy (a StrategyTable, or anything with its action() method) play every hand of a seat,
+        split hands included, as soon as the hand's turn comes. None hands the seat back to its client."""
+        if strategy is None:
+            self.autopilots.pop(player_id, None)
+        else:
+            self.autopilots[player_id] = strategy
+
+    def set_standing_bet(self, player_id, rule):
+        """Bet by rule (a BetRule) for a seat at the opening of every betting round. None stops it."""
+        if rule is None:
+            self.standing_bets.pop(player_id, None)
+            self.bet_overrides.pop(player_id, None)
+        else:
+            self.standing_bets[player_id] = rule
+
+    def override_bet(self, player_id, amount):
+        """Bet amount instead of the standing bet in the next round only, 0 sits the round out."""
+        self.bet_overrides[player_id] = check_bet(amount, minimum=0)
+
+    def place_standing_bets(self):
+        """Bet for every seat with a standing bet that has not bet yet in this betting round."""
+        if not self.standing_bets:
+            return
+        true_count = self.deck.true_count()
+        for player_id, rule in list(self.standing_bets.items()):
+            player = self.player_manager.get_player_via_id(player_id)
+            if player is None or player.state != PlayerState.WAIT_FOR_BET:
+                continue
+            amount = self.bet_overrides.pop(player_id, None)
+            self.place_bet(player_id, rule.bet(true_count) if amount is None else amount)
 
     def get_available_bets(self):
         return self.available_bets
@@ -31,22 +94,81 @@ class GameManager:
                 if player.state == PlayerState.SKIPPED_ROUND:
                     continue  # If so, don't deal cards to this player
                 player.hit(self.deck)
+        self.player_manager.build_turn_queue()
+        self.hole_card_hidden = True
+        self.table_version += 1
+        if self.observation is not None:
+            self._observe_table(hidden_card=True)
 
     def add_player(self, player):
-        self.player_manager.add_player(player)
+        added = self.player_manager.add_player(player)
+        self.table_version += 1
+        return added
+
+    def remove_player(self, player_id):
+        """Take a seat out of the game, finishing its part of the round so the other seats are not kept waiting."""
+        player = self.player_manager.get_player_via_id(player_id)
+        if player is None:
+            return False
+        self.autopilots.pop(player_id, None)
+        self.standing_bets.pop(player_id, None)
+        self.bet_overrides.pop(player_id, None)
+        # The seat's hands stand when it is their turn, the split hands act right after the seat.
+        turn_queue = self.player_manager.turn_queue
+        while turn_queue and turn_queue[0].owner is player and turn_queue[0].state == PlayerState.MY_TURN:
+            self.handle_action('s', turn_queue[0])
+            turn_queue = self.player_manager.turn_queue
+
+        previous_state = player.state
+        in_round = not self.player_manager.waits_for_next_round(player_id)
+        seat = self.player_manager.get_seat_number(player_id)
+        self.player_manager.remove_player(player_id)
+        self.player_manager.players = [hand for hand in self.player_manager.players if hand.owner is not player]
+        self.table_version += 1
+        if self.observation is not None:
+            self.observation.seats[seat] = 0
+        self.logger.info(f"Removed {player.name} from seat {seat}")
+
+        if not self.player_manager.players_by_id:
+            self.reset_table()
+            return True
+        if not in_round:
+            return True
+        # Release the round barrier that was only waiting for this seat.
+        if previous_state == PlayerState.WAIT_FOR_BET and self.player_manager.pending_bets == 0:
+            if self.all_player_skipping_the_round():
+                self.event_bus.publish('all_players_skipped')
+            else:
+                self.event_bus.publish('all_betting_done')
+        elif previous_state != PlayerState.RESULT_NOTIFIED:
+            self.player_manager.check_all_results_are_published()
+        return True
+
+    def reset_table(self):
+        """Drop the round of a table nobody sits at any more, the next players to join start a new game."""
+        self.player_manager.reset_table()
+        self.dealer.reset()
+        self.hole_card_hidden = False
+        self.table_version += 1
+        self.table_deltas.clear()
+        if self.observation is not None:
+            self.observation.clear_round()
+            self.observation.update_shoe(self.deck)
+        self.event_bus.publish('all_players_left')
 
     def place_bet(self, player_id, bet_amount):
         player = self.player_manager.get_player_via_id(player_id)
         if player:
             self.logger.info(f"Player {player.name}, bet amount: {bet_amount}")
+            previous_state = player.state
             player.place_initial_bet(bet_amount)
             self.dealer.balance += int(bet_amount)
-            # Check all players have placed a bet
-            if self.all_player_skipping_the_round():
-                self.logger.info("All players skipping their round.")
-                self.event_bus.publish('all_players_skipped')
-                return True
-            if all(p.state is not PlayerState.WAIT_FOR_BET for p in self.player_manager.players):
+            # The player manager counts the bets, so only the last bet of the round triggers an event.
+            if self.player_manager.bet_placed(player, previous_state):
+                if self.all_player_skipping_the_round():
+                    self.logger.info("All players skipping their round.")
+                    self.event_bus.publish('all_players_skipped')
+                    return True
                 self.logger.info("All players have placed their bets.")
                 self.event_bus.publish('all_betting_done')
             return True
@@ -69,8 +191,24 @@ class GameManager:
             actions = ["Stand (s)"]
 
         player.available_actions = game.utils.convert_actions(actions)
+        if self.observation is not None:
+            seat = self.player_manager.get_seat_number(player.id)
+            self.observation.update_hand(seat, player)
+            self.observation.update_turn(seat, player.available_actions)
+
+    def autopilot_action(self, player):
+        """The action the seat's autopilot takes for player's hand, None when its client decides."""
+        autopilot = self.autopilots.get(player.id)
+        if autopilot is None:
+            return None
+        return autopilot.action(player, self.dealer.cards[0], player.available_actions)
 
     def handle_action(self, player_action, player):
+        self.apply_action(player_action, player)
+        self.event_bus.publish('player_acted')
+
+    def apply_action(self, player_action, player):
+        """handle_action() without publishing player_acted, for callers that move on to the next turn themselves."""
         if player_action == 'h':
             player.hit(self.deck)
 
@@ -90,17 +228,26 @@ class GameManager:
         elif player_action == 'i' and player.insurance_allowed(self.dealer):
             player.take_insurance(self.dealer)
 
-        player.calculate_score()  # Recalculate score after each action
-
-        self.event_bus.publish('player_acted')
+        self.table_version += 1
+        if self.observation is not None:
+            self.observation.update_hand(self.player_manager.get_seat_number(player.id), player)
+            self.observation.update_shoe(self.deck, hole_card=self.dealer.cards[1])
+            self.observation.update_turn(None, [])
 
     def dealer_turn(self):
+        self.hole_card_hidden = False
         self.dealer.calculate_score()
 
         # Dealer hits until score is 17 or higher
         while self.dealer.score < 17:
             self.dealer.hit(self.deck)
             self.dealer.calculate_score()
+        self.table_version += 1
+
+        if self.observation is not None:
+            self.observation.update_dealer(self.dealer, hidden=False)
+            self.observation.update_shoe(self.deck)
+            self.observation.update_turn(None, [])
 
     def determine_winners(self):
         for player in self.player_manager.players:
@@ -131,25 +278,28 @@ class GameManager:
             self.logger.info(f"Round: {self.round_counter} Player {player.name} balance: {player.balance}")
 
         self.player_manager.remove_split_player()
+        self.table_version += 1
 
         self.logger.info(f"Round: {self.round_counter} Dealer {self.dealer.name} balance: {self.dealer.balance}")
 
     def find_original_player(self, split_player):
-        # This method would search for the original player based on the origin_player_number.
-        # Assuming player_number is unique and correctly managed.
-        for player in self.player_manager.players:
-            if player.id == split_player.origin_player_id:
-                return player
-        return None
+        # Split hands carry the id of the seat they were split from.
+        return self.player_manager.get_player_via_id(split_player.origin_player_id)
 
     def cleanup_after_round(self):
         self.logger.info("Cleaning up")
         # Filter out split hands from the list of active players.
         self.player_manager.reset_players()
         self.dealer.reset()
+        self.hole_card_hidden = False
+        self.table_version += 1
         self.round_counter = self.round_counter + 1
+        self.table_deltas.clear()
         self.logger.info("Cleaning up done")
         self.deck.shuffle_if_needed()
+        if self.observation is not None:
+            self.observation.clear_round()
+            self.observation.update_shoe(self.deck)
 
     def get_table_state_array(self, hidden_card=False):
         # Initialize the table state with the dealer's hand
@@ -163,6 +313,34 @@ class GameManager:
             table_state.extend(player_state)
         return table_state
 
+    def get_table_snapshot(self, hidden_card=False):
+        """The table state array and its JSON encoding, built once per table version and shared by all readers.
+
+        The returned list is cached, callers must not modify it.
+        """
+        cached = self._table_snapshots.get(hidden_card)
+        if cached is None or cached[0] != self.table_version:
+            table_state = self.get_table_state_array(hidden_card=hidden_card)
+            cached = (self.table_version, table_state, to_json(table_state).decode())
+            self._table_snapshots[hidden_card] = cached
+        return cached[1], cached[2]
+
+    def get_table_key(self, hidden_card=False):
+        """Identifies the table get_table_snapshot(hidden_card) returns until the table version changes."""
+        return self.table_version, hidden_card
+
+    def get_shoe_composition(self, hidden_card=False):
+        remaining = list(self.deck.rank_counts)
+        running_count = self.deck.running_count
+        cards_left = self.deck.cards_left()
+        if hidden_card and len(self.dealer.cards) >= 2:
+            # The dealer's hole card has left the shoe but must not be given away to the players.
+            value = self.dealer.cards[1] % 100
+            remaining[value - 1] += 1
+            running_count -= HI_LO[value]
+            cards_left += 1
+        return {'remaining': remaining, 'running_count': running_count, 'cards_left': cards_left}
+
     def print_table_state(self, hidden_card=False):
         table_state_array = self.get_table_state_array(hidden_card=hidden_card)
         # Convert card codes back to human-readable format or use directly if they're already in that format
@@ -183,10 +361,4 @@ class GameManager:
         print('\n'.join(readable_state))
 
     def all_player_skipping_the_round(self):
-        # Iterate through all players
-        for player in self.player_manager.players:
-            # If any player is not skipping the round, return False
-            if not player.skip_round():
-                return False
-        # If all players are skipping the round, return True
-        return True
+        return self.player_manager.all_players_skipping()
@@ -0,0 +1,80 @@
+"""Play full rounds in-process against a Python policy, without the server.
+
+The runner drives a Table exactly like the websocket routes do: bets go through GameManager.place_bet,
+actions through GameManager.handle_action and results through PlayerManager.publish_result, and the
+EventBus and GameStateMachine move the round along in between. Nothing waits on the asyncio Events the
+routes use, so rounds run back to back.
+
+    runner = HeadlessRunner(policy=lambda hand, up_card, actions: 'h' if hand.score < 17 else 's', seed=1)
+    stats = runner.play(100000)
+"""
+import logging
+import time
+
+import utils.log_setup
+from game.player import Player
+from game.table import Table
+
+logger = utils.log_setup.setup_logger(name=__name__, log_level=logging.WARN)
+
+
+class HeadlessRunner:
+    """Plays rounds on one table of num_seats bots.
+
+    policy(hand, dealer_up_card, available_actions) returns one of available_actions for the hand whose
+    turn it is, hands created by a split included. bet_policy(player, game_manager), if given, returns the
+    amount each seat bets at the start of a round, 0 skips the round; otherwise every seat bets `bet`.
+    """
+
+    def __init__(self, policy, num_seats=1, bet=10, bet_policy=None, balance=1000, num_decks=8, seed=None,
+                 shuffle_mode='cut_card', bus_mode='sync'):
+        self.policy = policy
+        self.bet = bet
+        self.bet_policy = bet_policy
+        self.table = Table('headless', logger=logger, num_seats=num_seats, num_decks=num_decks, seed=seed,
+                           shuffle_mode=shuffle_mode, bus_mode=bus_mode)
+        self.game_manager = self.table.game_manager
+        self.player_manager = self.table.player_manager
+        self.event_handler = self.table.event_handler
+        self.players = [Player(logger=logger, name=f'bot{seat}', id=f'bot{seat}', balance=balance)
+                        for seat in range(num_seats)]
+        for player in self.players:
+            self.game_manager.add_player(player)
+
+    def play_round(self):
+        """Play one round, returns the balance change of every seat."""
+        game_manager = self.game_manager
+        balances = [player.balance for player in self.players]
+
+        for player in self.players:
+            bet = self.bet if self.bet_policy is None else self.bet_policy(player, game_manager)
+            game_manager.place_bet(player.id, bet)
+
+        # The event handler points at the hand to act until every hand has acted.
+        while (hand := self.event_handler.current_player) is not None:
+            action = self.policy(hand, game_manager.dealer.cards[0], hand.available_actions)
+            if action not in hand.available_actions:
+                raise ValueError(f"Policy chose {action} for {hand.name}, allowed: {hand.available_actions}")
+            game_manager.handle_action(action, hand)
+
+        # Publishing the last result ends the round and starts the next betting round. A round that every
+        # seat skipped has already been cleaned up.
+        if self.table.game_state_machine.get_state() == 'publish_result':
+            for player in self.players:
+                self.player_manager.publish_result(player)
+
+        return [player.balance - balance for player, balance in zip(self.players, balances)]
+
+    def play(self, rounds):
+        """Play rounds rounds, returns the number of rounds, the net result per seat and the rounds per second."""
+        net = [0] * len(self.players)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for seat, change in enumerate(self.play_round()):
+                net[seat] += change
+        elapsed = time.perf_counter() - start
+        return {'rounds': rounds, 'net': net, 'seconds': elapsed,
+                'rounds_per_second': rounds / elapsed if elapsed else 0.0}
+
+    def close(self):
+        self.table.close()
@@ -0,0 +1,126 @@
+"""Batch simulations spread over a process pool.
+
+The rounds are cut into fixed-size chunks and every chunk gets its own seed spawned from the master seed,
+so the chunks, and the statistics merged from them in chunk order, do not depend on how many workers
+played them. Early stopping is decided on that same in-order prefix, which keeps it deterministic too.
+
+Run with: python -m game.monte_carlo --rounds 20000000 --workers 4 --seed 1
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from game.batch import RunningStats, simulate_stats
+from game.strategy import StrategyTable
+
+CHUNK_ROUNDS = 250000
+
+
+def run_chunk(strategy, rounds, seed_sequence, num_decks):
+    """Play one chunk, returns its statistics plus the pid and time of the process that played it."""
+    start = time.perf_counter()
+    rng = np.random.Generator(np.random.PCG64(seed_sequence))
+    stats, overflow = simulate_stats(strategy, rounds, rng, num_decks=num_decks)
+    return stats.count, stats.mean, stats.m2, overflow, os.getpid(), time.perf_counter() - start
+
+
+def chunk_results(strategy, chunk_sizes, seeds, num_decks, workers):
+    """Play the chunks and yield (index, run_chunk() result) in chunk order.
+
+    With workers=1 the chunks are played in this process. Closing the generator cancels the chunks not
+    started yet, which is how an early stop ends the run.
+    """
+    if workers == 1:
+        for index, size in enumerate(chunk_sizes):
+            yield index, run_chunk(strategy, size, seeds[index], num_decks)
+        return
+
+    done = {}
+    pending = {}
+    next_chunk = 0
+    next_result = 0
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        try:
+            while next_result < len(chunk_sizes):
+                # Two chunks per worker in flight keeps every worker busy without running far past an early stop.
+                while next_chunk < len(chunk_sizes) and len(pending) < 2 * workers:
+                    future = pool.submit(run_chunk, strategy, chunk_sizes[next_chunk], seeds[next_chunk], num_decks)
+                    pending[future] = next_chunk
+                    next_chunk += 1
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done[pending.pop(future)] = future.result()
+                # Yielded in chunk order only, so the result is the same for any number of workers.
+                while next_result in done:
+                    yield next_result, done.pop(next_result)
+                    next_result += 1
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def run_monte_carlo(strategy, rounds, workers=None, seed=None, num_decks=8, chunk_rounds=CHUNK_ROUNDS,
+                    target_ci_width=None, z=1.96):
+    """Simulate up to rounds rounds of strategy on workers processes.
+
+    Stops early once the confidence interval (z standard errors each side) is narrower than target_ci_width.
+    With workers=1 the chunks are played in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_sizes = [min(chunk_rounds, rounds - start) for start in range(0, rounds, chunk_rounds)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+
+    stats = RunningStats()
+    overflow = 0
+    per_worker = {}
+    merged = 0
+    stopped_early = False
+    start = time.perf_counter()
+
+    results = chunk_results(strategy, chunk_sizes, seeds, num_decks, workers)
+    for index, (count, mean, m2, chunk_overflow, pid, seconds) in results:
+        worker = per_worker.setdefault(pid, {'chunks': 0, 'rounds': 0, 'seconds': 0.0})
+        worker['chunks'] += 1
+        worker['rounds'] += chunk_sizes[index]
+        worker['seconds'] += seconds
+        stats.merge(RunningStats(count, mean, m2))
+        overflow += chunk_overflow
+        merged += 1
+        if target_ci_width is not None and stats.count > 1 and 2 * z * stats.std_error() <= target_ci_width:
+            stopped_early = merged < len(chunk_sizes)
+            break
+    results.close()
+
+    seconds = time.perf_counter() - start
+    for worker in per_worker.values():
+        worker['rounds_per_second'] = worker['rounds'] / worker['seconds'] if worker['seconds'] else 0.0
+    return {**stats.summary(z=z), 'overflow': overflow, 'chunks': merged, 'stopped_early': stopped_early,
+            'seconds': seconds, 'rounds_per_second': (stats.count + overflow) / seconds if seconds else 0.0,
+            'workers': per_worker}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate the EV of basic strategy on several processes.")
+    parser.add_argument('--rounds', type=int, default=10000000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--decks', type=int, default=8)
+    parser.add_argument('--target-ci-width', type=float, default=None)
+    args = parser.parse_args()
+
+    result = run_monte_carlo(StrategyTable.basic_strategy(), args.rounds, workers=args.workers, seed=args.seed,
+                             num_decks=args.decks, target_ci_width=args.target_ci_width)
+    low, high = result['ci']
+    print(f"{result['rounds']} rounds in {result['chunks']} chunks, EV {result['ev']:+.5f} "
+          f"(95% CI {low:+.5f} .. {high:+.5f}){', stopped early' if result['stopped_early'] else ''}")
+    print(f"{result['rounds_per_second']:.0f} rounds/s in total")
+    for pid, worker in sorted(result['workers'].items()):
+        print(f"  worker {pid}: {worker['chunks']} chunks, {worker['rounds_per_second']:.0f} rounds/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import numpy as np
+
+from game.deck import HI_LO
+from game.utils import card_value
+
+ACTIONS = ('h', 's', 'd', 'p', 'i')
+
+# Per seat: best total, soft flag, pair flag, number of cards and number of hands of the seat's hand in play.
+SEAT_FIELDS = ('total', 'soft', 'pair', 'cards', 'hands')
+# Dealer: up card value (aces are 1), visible total, 1 once the hole card is turned over.
+DEALER_FIELDS = ('up_card', 'total', 'revealed')
+# Shoe: cards left and Hi-Lo running count, both as the players see them (hole card not counted).
+SHOE_FIELDS = ('cards_left', 'running_count')
+
+
+class TableObservation:
+    """Fixed-size float32 encoding of a table, updated in place by GameManager as the round is played.
+
+    Layout of the buffer, also available as named views:
+        seats        num_seats x SEAT_FIELDS
+        dealer       DEALER_FIELDS
+        rank_counts  13 remaining cards per rank, aces first
+        shoe         SHOE_FIELDS
+        turn         seat of the hand to act, -1 when no hand is acting
+        action_mask  one flag per ACTIONS entry for the hand to act
+
+    `view` is a read-only array over the same memory, so readers never copy and always see the current state.
+    """
+
+    def __init__(self, num_seats):
+        self.num_seats = num_seats
+        sizes = [('seats', num_seats * len(SEAT_FIELDS)), ('dealer', len(DEALER_FIELDS)), ('rank_counts', 13),
+                 ('shoe', len(SHOE_FIELDS)), ('turn', 1), ('action_mask', len(ACTIONS))]
+        self.offsets = {}
+        offset = 0
+        for name, size in sizes:
+            self.offsets[name] = slice(offset, offset + size)
+            offset += size
+        self.size = offset
+
+        self._buffer = np.zeros(self.size, dtype=np.float32)
+        self.seats = self._buffer[self.offsets['seats']].reshape(num_seats, len(SEAT_FIELDS))
+        self.dealer = self._buffer[self.offsets['dealer']]
+        self.rank_counts = self._buffer[self.offsets['rank_counts']]
+        self.shoe = self._buffer[self.offsets['shoe']]
+        self.turn = self._buffer[self.offsets['turn']]
+        self.action_mask = self._buffer[self.offsets['action_mask']]
+        self.view = self._buffer.view()
+        self.view.flags.writeable = False
+        self.turn[0] = -1
+
+    def update_hand(self, seat, hand):
+        cards = hand.cards
+        row = self.seats[seat]
+        row[0] = hand.score
+        row[1] = hand.is_soft()
+        row[2] = len(cards) == 2 and cards[0] % 100 == cards[1] % 100
+        row[3] = len(cards)
+        row[4] = 1 + len(hand.owner.split_hands)
+
+    def update_dealer(self, dealer, hidden):
+        cards = dealer.cards
+        if not cards:
+            self.dealer[:] = 0
+            return
+        self.dealer[0] = card_value(cards[0])
+        if hidden:
+            # Only the up card counts, an ace as 11 like a one-card hand would.
+            self.dealer[1] = 11 if cards[0] % 100 == 1 else card_value(cards[0])
+            self.dealer[2] = 0
+        else:
+            self.dealer[1] = dealer.score
+            self.dealer[2] = 1
+
+    def update_shoe(self, deck, hole_card=None):
+        self.rank_counts[:] = deck.rank_counts
+        self.shoe[0] = deck.cards_left()
+        self.shoe[1] = deck.running_count
+        if hole_card is not None:
+            # The hole card has left the shoe, but the players must not learn it from the counts.
+            value = hole_card % 100
+            self.rank_counts[value - 1] += 1
+            self.shoe[0] += 1
+            self.shoe[1] -= HI_LO[value]
+
+    def update_turn(self, seat, available_actions):
+        self.turn[0] = -1 if seat is None else seat
+        self.action_mask[:] = 0
+        for action in available_actions:
+            self.action_mask[ACTIONS.index(action)] = 1
+
+    def clear_round(self):
+        self.seats[:] = 0
+        self.dealer[:] = 0
+        self.update_turn(None, [])
@@ -6,82 +6,102 @@ from fastapi import WebSocket
 import game.utils
 from game.state import PlayerState
 
+logger = utils.log_setup.setup_logger(name=__name__, log_level=logging.WARN)
 
-class Player:
-    id_counter = 0
 
-    def __init__(self, logger=logging.Logger, name='Dealer', balance=0, id=None, origin_player_id=None, bet=0,
-                 initial_bet=0,
-                 state=PlayerState.WAIT_FOR_BET,
-                 websocket: WebSocket = None):
-        self.logger = logger
+class Hand:
+    """The cards, bet and per-hand flags of one blackjack hand.
+
+    Player is the hand a seat is dealt, SplitHand is every extra hand that seat gets by splitting.
+    """
+    __slots__ = ('_cards', '_totals_stale', 'hard_total', 'ace_count', 'state', 'balance', 'bet', 'initial_bet',
+                 'insurance_taken', 'has_double_down', 'available_actions')
+
+    def __init__(self, balance=0, bet=0, initial_bet=0, state=PlayerState.WAIT_FOR_BET):
         self.state = state
-        self.name = name
         self.balance = balance
         self.cards = []  # List to store the cards in the player's hand.
-        self.score = 0
-        self.id = id
-        self.origin_player_id = origin_player_id  # None for original hands, set for split hands.
-
         self.insurance_taken = False
         self.available_actions = []
         self.bet = bet
-        self.websocket = websocket
         self.has_double_down = False
         self.initial_bet = initial_bet
-        self.result_history = deque([0] * 10, maxlen=10)
-        
-        self.logger = utils.log_setup.setup_logger(name=__name__, log_level=logging.WARN)
 
     def transition_state(self, new_state):
         """Transition to a new state and call the corresponding method."""
         self.state = new_state
-        self.logger.info(f"Player {self.name} transitioned to {self.state}")
-
-    def reset(self):
-        self.insurance_taken = False
-        self.available_actions = []
-        self.bet = 0
-
-        self.cards = []
-        self.score = 0
-        self.transition_state(PlayerState.WAIT_FOR_BET)
-
-        self.has_double_down = False
-        self.initial_bet = 0
+        if logger.isEnabledFor(logging.INFO):  # Called several times per hand, skip formatting when not logged.
+            logger.info(f"Player {self.name} transitioned to {self.state}")
+
+    @property
+    def cards(self):
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards):
+        # The running totals are rebuilt lazily, assigned hands may hold cards that are never scored.
+        self._cards = cards
+        self._totals_stale = True
+
+    @property
+    def score(self):
+        """Best total of the hand, counting one ace as 11 when that does not bust it."""
+        if self._totals_stale:
+            self._rebuild_totals()
+        if self.ace_count and self.hard_total <= 11:
+            return self.hard_total + 10
+        return self.hard_total
+
+    def is_soft(self):
+        """True when an ace is currently counted as 11."""
+        if self._totals_stale:
+            self._rebuild_totals()
+        return self.ace_count > 0 and self.hard_total <= 11
 
     def has_blackjack(self):
-        self.calculate_score()
-        return self.score == 21 and len(self.cards) == 2
+        return len(self._cards) == 2 and self.score == 21
+
+    def add_card(self, card):
+        """Appends a card and updates the running hard total and ace count in O(1)."""
+        if self._totals_stale:
+            self._rebuild_totals()
+        self._cards.append(card)
+        self.hard_total += game.utils.card_value(card)
+        if card % 100 == 1:
+            self.ace_count += 1
+
+    def remove_last_card(self):
+        if self._totals_stale:
+            self._rebuild_totals()
+        card = self._cards.pop()
+        self.hard_total -= game.utils.card_value(card)
+        if card % 100 == 1:
+            self.ace_count -= 1
+        return card
 
     def hit(self, deck):
         """Adds a card to the player's hand from the deck."""
-        self.cards.append(deck.deal_card())
-        self.logger.debug(f"player {self.name} hit")
+        self.add_card(deck.deal_card())
+        logger.debug(f"player {self.name} hit")
         if self.is_busted():
             self.busted()
-            self.logger.debug(f"player {self.name} busted")
+            logger.debug(f"player {self.name} busted")
 
     def calculate_score(self):
-        """Calculates the current score of the player's hand."""
-        self.score = 0
-        ace_count = 0
-
-        # Calculate score and count aces.
-        for card in self.cards:
-            value = card % 100  # Extract card value
-            if value >= 11:  # Jack, Queen, King
-                self.score += 10
-            elif value == 1:  # Ace
-                ace_count += 1
-                self.score += 11  # Assume Ace is 11 initially
-            else:  # Number cards
-                self.score += value
-
-        # Adjust for aces if score is over 21
-        while self.score > 21 and ace_count > 0:
-            self.score -= 10  # Convert an Ace from 11 to 1
-            ace_count -= 1
+        """Returns the current score. The totals are kept up to date as cards are added, so this is
+        only a full recount after self.cards has been reassigned."""
+        if self._totals_stale:
+            self._rebuild_totals()
+        return self.score
+
+    def _rebuild_totals(self):
+        self.hard_total = 0  # Aces counted as 1.
+        self.ace_count = 0
+        for card in self._cards:
+            self.hard_total += game.utils.card_value(card)
+            if card % 100 == 1:
+                self.ace_count += 1
+        self._totals_stale = False
 
     def display_hand(self):
         """Displays the player's hand with J, Q, K, and A represented correctly."""
@@ -92,23 +112,8 @@ class Player:
 
     def is_busted(self):
         """Checks if the player has busted (score over 21)."""
-        self.calculate_score()
         return self.score > 21
 
-    def place_bet(self, amount):
-        amount = int(amount)
-        self.bet = amount
-        self.balance -= amount
-
-    def place_initial_bet(self, amount):
-        self.place_bet(int(amount))
-        self.initial_bet += int(amount)
-
-        if self.skip_round():
-            self.transition_state(PlayerState.SKIPPED_ROUND)
-        else:
-            self.transition_state(PlayerState.AWAITING_MY_TURN)
-
     def double_down_allowed(self):
         return len(self.cards) == 2
 
@@ -131,19 +136,15 @@ class Player:
             return False
 
     def split(self, deck):
-        self.logger.info(f'player {self.name} split')
-        split_hand = Player(name=f"{self.name} (Split)",
-                            balance=0,
-                            id=self.id,
-                            origin_player_id=self.id or self.origin_player_id,
-                            bet=self.initial_bet,
-                            initial_bet=self.initial_bet,
-                            state=PlayerState.AWAITING_MY_TURN,
-                            websocket=self.websocket)
-        # Keep original player number if this is already a split hand
+        logger.info(f'player {self.name} split')
+        # Split hands always belong to the seat, also when a split hand is split again.
+        split_hand = SplitHand(owner=self.owner,
+                               bet=self.initial_bet,
+                               initial_bet=self.initial_bet,
+                               state=PlayerState.AWAITING_MY_TURN)
         # Place a bet equal to the original hand.
         self.balance -= self.initial_bet
-        split_hand.cards.append(self.cards.pop())  # Move one card to the split hand.
+        split_hand.add_card(self.remove_last_card())  # Move one card to the split hand.
         self.hit(deck)  # Draw new cards for both hands.
         split_hand.hit(deck)
         return split_hand
@@ -155,12 +156,93 @@ class Player:
         self.insurance_taken = True
 
     def stand(self):
-        self.logger.debug(f"player {self.name} stand")
+        logger.debug(f"player {self.name} stand")
         self.transition_state(PlayerState.HAS_ACTED)
 
     def busted(self):
         self.transition_state(PlayerState.HAS_ACTED)
 
+    def double_down(self, deck, dealer):
+        self.balance -= self.initial_bet
+        dealer.balance = dealer.balance + self.initial_bet
+        self.bet += self.initial_bet
+        self.has_double_down = True
+        self.hit(deck)
+
+
+class SplitHand(Hand):
+    """A hand created by splitting. Identity and connection are borrowed from the seat's Player, and
+    the hand's own balance holds its winnings until the round ends and it is folded into the seat."""
+    __slots__ = ('owner',)
+
+    def __init__(self, owner, bet=0, initial_bet=0, state=PlayerState.AWAITING_MY_TURN):
+        super().__init__(balance=0, bet=bet, initial_bet=initial_bet, state=state)
+        self.owner = owner
+
+    @property
+    def name(self):
+        return f"{self.owner.name} (Split)"
+
+    @property
+    def id(self):
+        return self.owner.id
+
+    @property
+    def origin_player_id(self):
+        return self.owner.id
+
+    @property
+    def websocket(self):
+        return self.owner.websocket
+
+
+class Player(Hand):
+    id_counter = 0
+
+    def __init__(self, logger=logging.Logger, name='Dealer', balance=0, id=None, origin_player_id=None, bet=0,
+                 initial_bet=0,
+                 state=PlayerState.WAIT_FOR_BET,
+                 websocket: WebSocket = None):
+        super().__init__(balance=balance, bet=bet, initial_bet=initial_bet, state=state)
+        self.name = name
+        self.id = id
+        self.origin_player_id = origin_player_id  # None for seats, SplitHand reports its seat's id.
+        self.websocket = websocket
+        self.split_hands = []  # Extra hands of this seat, in the order they were split off.
+        self.result_history = deque([0] * 10, maxlen=10)
+
+        self.logger = utils.log_setup.setup_logger(name=__name__, log_level=logging.WARN)
+
+    @property
+    def owner(self):
+        return self
+
+    def reset(self):
+        self.insurance_taken = False
+        self.available_actions = []
+        self.bet = 0
+
+        self.cards = []
+        self.split_hands.clear()
+        self.transition_state(PlayerState.WAIT_FOR_BET)
+
+        self.has_double_down = False
+        self.initial_bet = 0
+
+    def place_bet(self, amount):
+        amount = int(amount)
+        self.bet = amount
+        self.balance -= amount
+
+    def place_initial_bet(self, amount):
+        self.place_bet(int(amount))
+        self.initial_bet += int(amount)
+
+        if self.skip_round():
+            self.transition_state(PlayerState.SKIPPED_ROUND)
+        else:
+            self.transition_state(PlayerState.AWAITING_MY_TURN)
+
     def skip_round(self):
         if self.initial_bet == 0:
             return True
@@ -168,10 +250,3 @@ class Player:
 
     def publish_result(self):
         self.transition_state(PlayerState.RESULT_NOTIFIED)
-
-    def double_down(self, deck, dealer):
-        self.balance -= self.initial_bet
-        dealer.balance = dealer.balance + self.initial_bet
-        self.bet += self.initial_bet
-        self.has_double_down = True
-        self.hit(deck)
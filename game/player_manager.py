@@ -1,4 +1,6 @@
 import asyncio
+import bisect
+from collections import deque
 import utils.log_setup
 import utils.event_bus
 from game.state import PlayerState
@@ -9,6 +11,22 @@ class PlayerManager:
         self.players = []  # Stores player instances
         self.player_events = {}  # Maps player IDs to asyncio Events
         self.seats = {}  # Maps seat numbers to player IDs
+        # Indexes kept next to self.players so lookups done on every action and message are O(1).
+        # Split hands are indexed on their seat's Player.split_hands.
+        self.players_by_id = {}  # Maps player IDs to seated players
+        self.players_by_seat = {}  # Maps seat numbers to seated players
+        self.seat_by_player_id = {}  # Maps player IDs to seat numbers
+        # Hands still to act this round, in acting order. Built when the cards are dealt and
+        # reset at the end of the round, see build_turn_queue().
+        self.turn_queue = None
+        # Round barriers, kept as counters so each phase-completion check is O(1).
+        self.pending_bets = 0  # Seats that still have to bet this round
+        self.skipped_seats = 0  # Seats that bet nothing this round
+        self.unpublished_results = 0  # Seats that have not been sent this round's result
+        # Seats that joined after the bets closed. They sit the round out, not counted by the barriers above,
+        # and bet from the next round on.
+        self.next_round_players = set()
+        self.started = False  # True from the first ready_to_bet until the table is empty again
         self.num_seats = num_seats
         self.available_seats = list(range(0, num_seats))  # create a list of available seats
         self.logger = logger
@@ -22,12 +40,22 @@ class PlayerManager:
         elif not self.player_exists(player.id):
             seat = self.available_seats.pop(0)
             self.seats[seat] = player.id  # assign seat to player
+            self.players_by_id[player.id] = player
+            self.players_by_seat[seat] = player
+            self.seat_by_player_id[player.id] = seat
+            if self.started and self.pending_bets == 0:
+                self.next_round_players.add(player.id)
+            else:
+                self.pending_bets += 1
+                self.unpublished_results += 1
             self.logger.info(f"Adding {player.name} to seat {seat}, there are {len(self.available_seats)} seats left.")
             self.player_events[player.id] = asyncio.Event()
             self.players.append(player)
-            if not self.available_seats:
+            # A seat freed and taken again while the table plays does not start the game a second time.
+            if not self.available_seats and not self.started:
                 self.logger.info(f"No more seats left to join the game. Table is full.")
                 self.logger.info(f"Game will start soon.")
+                self.started = True
                 self.event_bus.publish('ready_to_bet')
             return True
         return False
@@ -38,13 +66,29 @@ class PlayerManager:
         if not player:
             return False
         self.players.remove(player)
+        if self.turn_queue is not None and player in self.turn_queue:
+            self.turn_queue.remove(player)
         del self.player_events[player.id]
-        # Logic to free up the player's seat
+        if player.id in self.next_round_players:
+            self.next_round_players.discard(player.id)
+        else:
+            if player.state == PlayerState.WAIT_FOR_BET:
+                self.pending_bets -= 1
+            elif player.state == PlayerState.SKIPPED_ROUND:
+                self.skipped_seats -= 1
+            if player.state != PlayerState.RESULT_NOTIFIED:
+                self.unpublished_results -= 1
+        # Free up the player's seat
+        seat = self.seat_by_player_id.pop(player.id)
+        del self.players_by_id[player.id]
+        del self.players_by_seat[seat]
+        del self.seats[seat]
+        bisect.insort(self.available_seats, seat)
         return True
 
     def get_player_by_id(self, player_id):
         """Retrieve a player instance by their ID."""
-        return next((player for player in self.players if player.id == player_id), None)
+        return self.players_by_id.get(player_id)
 
     def set_player_event(self, player_id):
         """Set the event for a specific player."""
@@ -56,51 +100,85 @@ class PlayerManager:
         if player_id in self.player_events:
             self.player_events[player_id].clear()
 
+    def waits_for_next_round(self, player_id):
+        return player_id in self.next_round_players
+
     def player_exists(self, player_id: str):
-        for player in self.players:
-            if player.id == player_id:
-                return True
-        return False
+        return player_id in self.players_by_id
 
     def get_available_seats(self) -> int:
-        available_seats = self.num_seats - len(self.players)
-        return available_seats
+        return len(self.available_seats)
 
     def get_player_via_id(self, player_id):
-        for player in self.players:
-            if player.id == player_id:
-                return player
-        return None
+        return self.players_by_id.get(player_id)
 
     def get_player_via_seat(self, seat_number):
-        for seat, player_id in self.seats.items():
-            if seat == seat_number:
-                return self.get_player_via_id(player_id)
-        return None
+        return self.players_by_seat.get(seat_number)
+
+    def build_turn_queue(self):
+        """Queue the hands that take part in this round, in seat order."""
+        self.turn_queue = deque(player for player in self.players
+                                if player.state == PlayerState.AWAITING_MY_TURN or player.state == PlayerState.MY_TURN)
+
+    def get_turn_order(self):
+        """Names of the hands still to act, the current hand first. Meant for debugging."""
+        if self.turn_queue is None:
+            return []
+        return [player.name for player in self.turn_queue]
 
     def get_current_turn_player(self):
         self.logger.debug(f"getting the player for this turn")
-        for player in self.players:
+        if self.turn_queue is None:
+            self.build_turn_queue()
+        # Hands that have finished are dropped from the front, so advancing is O(1).
+        while self.turn_queue:
+            player = self.turn_queue[0]
             if player.state == PlayerState.AWAITING_MY_TURN or player.state == PlayerState.MY_TURN:
                 self.logger.debug(f"Now it is {player.name}'s turn")
                 player.transition_state(PlayerState.MY_TURN)
                 return player
+            self.turn_queue.popleft()
         return None
 
     def get_seat_number(self, player_id):
-        for seat, id in self.seats.items():
-            if id == player_id:
-                return seat
-        return None
+        return self.seat_by_player_id.get(player_id)
+
+    def bet_placed(self, player, previous_state) -> bool:
+        """Count a bet placed by player. Returns True for the bet that completes the betting round."""
+        if previous_state == PlayerState.SKIPPED_ROUND:
+            self.skipped_seats -= 1
+        if player.state == PlayerState.SKIPPED_ROUND:
+            self.skipped_seats += 1
+        if previous_state == PlayerState.WAIT_FOR_BET:
+            self.pending_bets -= 1
+            return self.pending_bets == 0
+        return False
+
+    def all_players_skipping(self):
+        return self.pending_bets == 0 and self.skipped_seats == len(self.players_by_id)
+
+    def publish_result(self, player):
+        """Mark player's result as sent, the last one of the round publishes publish_results_done."""
+        if player.state == PlayerState.RESULT_NOTIFIED or player.id in self.next_round_players:
+            return
+        player.publish_result()
+        self.unpublished_results -= 1
+        if self.unpublished_results == 0:
+            self.check_all_results_are_published()
 
     def check_all_results_are_published(self):
-        for player in self.players:
-            if player.state != PlayerState.RESULT_NOTIFIED:
-                return
+        if self.unpublished_results:
+            return
 
         self.logger.info(f"All results are published")
         self.event_bus.publish('publish_results_done')
 
+    def _reset_round_counters(self):
+        self.pending_bets = len(self.players_by_id)
+        self.skipped_seats = 0
+        self.unpublished_results = len(self.players_by_id)
+        self.next_round_players.clear()
+
     def set_all_player_events(self):
         for id in self.player_events:
             self.player_events[id].set()
@@ -110,9 +188,17 @@ class PlayerManager:
             self.player_events[id].clear()
 
     def reset_all_players(self):
+        self.turn_queue = None
+        self._reset_round_counters()
         for player in self.players:
             player.reset()
 
+    def reset_table(self):
+        """Back to waiting for players, once the last one has left."""
+        self.turn_queue = None
+        self._reset_round_counters()
+        self.started = False
+
     def insert_split_player(self, original_player, split_player):
         try:
             original_player_position = self.players.index(original_player)
@@ -120,42 +206,39 @@ class PlayerManager:
             self.logger.debug("Player not in list")
             return
         self.players.insert(original_player_position + 1, split_player)
+        split_player.owner.split_hands.append(split_player)
+        # The split hand acts right after the hand it was split from, which is normally the current one.
+        if self.turn_queue is not None:
+            if self.turn_queue and self.turn_queue[0] is original_player:
+                self.turn_queue.insert(1, split_player)
+            elif original_player in self.turn_queue:
+                self.turn_queue.insert(self.turn_queue.index(original_player) + 1, split_player)
 
     def reset_players(self):
         # reset each remaining player's state as needed for the next round.
+        self.turn_queue = None
+        self._reset_round_counters()
         for player in self.players:
             player.reset()
 
     def remove_split_player(self):
-        # Initialize a temporary list for players to keep
-        players_to_keep = []
-
-        # Go through each player in our current list
+        # Keep the seats and fold each split hand's balance back into its seat.
+        players_to_keep = [player for player in self.players if player.origin_player_id is None]
         for player in self.players:
-            # If this player is an original player, keep them
-            if player.origin_player_id is None:
-                players_to_keep.append(player)
-            # Otherwise, this player is a split player
-            else:
-                # Find their origin player and add this player's balance to them
-                for origin_player in self.players:
-                    if origin_player.id == player.origin_player_id:
-                        origin_player.balance += player.balance
-                        break  # No need to check other players once we've found ours
+            if player.origin_player_id is not None:
+                origin_player = self.players_by_id.get(player.origin_player_id)
+                if origin_player is not None:
+                    origin_player.balance += player.balance
+                    origin_player.split_hands.clear()
 
-        # Set our player list to be the list of players we're keeping
         self.players = players_to_keep
 
     def count_split_players(self, player):
-        split_counter = 0
-        for player in self.players:
-            if player.origin_player_id == player.id:
-                split_counter += 1
-        return split_counter
+        return len(player.owner.split_hands)
 
     def get_waiting_split_player(self, origin_player):
-        for player in self.players:
-            if player.origin_player_id == origin_player.id and player.state == PlayerState.MY_TURN:
-                return player
+        # Only the seat's own split hands need to be checked, not every hand at the table.
+        for split_hand in origin_player.split_hands:
+            if split_hand.state == PlayerState.MY_TURN:
+                return split_hand
         return None
-
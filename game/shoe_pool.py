@@ -0,0 +1,81 @@
+import queue
+import threading
+
+import numpy as np
+
+import utils.log_setup
+
+
+class ShoePool:
+    """Keeps up to `depth` shuffled shoes ready so that a reshuffle is a pointer swap.
+
+    A daemon thread refills the pool in the background. When the pool is empty the shoe is
+    shuffled inline instead (a miss), using the same generator, so the order in which shoes
+    are produced does not depend on how fast the worker keeps up.
+    """
+
+    def __init__(self, fresh_shoe, depth=2, rng=None):
+        self.fresh_shoe = fresh_shoe
+        self.depth = depth
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.hits = 0
+        self.misses = 0
+        self.logger = utils.log_setup.setup_logger(name=__name__)
+
+        self._ready = queue.SimpleQueue()  # Shuffled shoes, oldest first.
+        self._spare = queue.SimpleQueue()  # Used shoe arrays that can be refilled.
+        self._free_slots = threading.Semaphore(depth)
+        self._lock = threading.Lock()  # Serializes use of self.rng.
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._fill, name='ShoePool', daemon=True)
+        self._worker.start()
+
+    def _make_shoe(self):
+        try:
+            shoe = self._spare.get_nowait()
+        except queue.Empty:
+            shoe = np.empty_like(self.fresh_shoe)
+        np.copyto(shoe, self.fresh_shoe)
+        self.rng.shuffle(shoe)
+        return shoe
+
+    def _fill(self):
+        while True:
+            self._free_slots.acquire()
+            if self._stopped.is_set():
+                return
+            # Hold the lock until the shoe is queued so an inline shuffle cannot overtake it.
+            with self._lock:
+                self._ready.put(self._make_shoe())
+
+    def take(self):
+        """Return a shuffled shoe, from the pool if one is ready."""
+        try:
+            shoe = self._ready.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                try:
+                    shoe = self._ready.get_nowait()
+                except queue.Empty:
+                    self.misses += 1
+                    self.logger.debug("Shoe pool empty, shuffling inline")
+                    return self._make_shoe()
+        self.hits += 1
+        self._free_slots.release()
+        return shoe
+
+    def recycle(self, shoe):
+        """Hand a used shoe array back so the worker can refill it without allocating."""
+        if shoe.shape == self.fresh_shoe.shape:
+            self._spare.put(shoe)
+
+    def ready(self):
+        return self._ready.qsize()
+
+    def stats(self):
+        return {'depth': self.depth, 'ready': self.ready(), 'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        self._stopped.set()
+        self._free_slots.release()
+        self._worker.join()
@@ -0,0 +1,133 @@
+"""Fixed playing strategies as lookup tables: player total x soft/pair x dealer up card -> action.
+
+Rows are written as one character per dealer up card, in the order 2, 3, 4, 5, 6, 7, 8, 9, 10, A:
+    'H' hit, 'S' stand, 'D' double if allowed else hit, 'd' double if allowed else stand,
+    and in the pairs table 'P' split, '-' play the pair as a hard or soft total.
+"""
+import numpy as np
+
+STAND, HIT, DOUBLE, DOUBLE_OR_STAND = 0, 1, 2, 3
+ACTION_CODES = {'S': STAND, 'H': HIT, 'D': DOUBLE, 'd': DOUBLE_OR_STAND}
+ACTION_CHARS = {code: char for char, code in ACTION_CODES.items()}
+
+# Columns of the tables are indexed by the up card's value, aces are 1 and every ten-valued card is 10.
+UP_CARDS = (2, 3, 4, 5, 6, 7, 8, 9, 10, 1)
+
+HARD_TOTALS = range(4, 22)
+SOFT_TOTALS = range(12, 22)
+PAIR_VALUES = range(1, 11)
+
+# Multi-deck basic strategy for this table's rules: the dealer stands on soft 17, doubling after a split is
+# allowed and there is no surrender.
+BASIC_HARD = {total: 'HHHHHHHHHH' for total in range(4, 9)}
+BASIC_HARD.update({
+    9: 'HDDDDHHHHH',
+    10: 'DDDDDDDDHH',
+    11: 'DDDDDDDDDH',
+    12: 'HHSSSHHHHH',
+    **{total: 'SSSSSHHHHH' for total in range(13, 17)},
+    **{total: 'SSSSSSSSSS' for total in range(17, 22)},
+})
+BASIC_SOFT = {
+    12: 'HHHHHHHHHH',
+    13: 'HHHDDHHHHH',
+    14: 'HHHDDHHHHH',
+    15: 'HHDDDHHHHH',
+    16: 'HHDDDHHHHH',
+    17: 'HDDDDHHHHH',
+    18: 'SddddSSHHH',
+    19: 'SSSSSSSSSS',
+    20: 'SSSSSSSSSS',
+    21: 'SSSSSSSSSS',
+}
+BASIC_PAIRS = {
+    1: 'PPPPPPPPPP',
+    2: 'PPPPPP----',
+    3: 'PPPPPP----',
+    4: '---PP-----',
+    5: '----------',
+    6: 'PPPPP-----',
+    7: 'PPPPPP----',
+    8: 'PPPPPPPPPP',
+    9: 'PPPPP-PP--',
+    10: '----------',
+}
+
+
+def card_value(card):
+    """Value used to index the tables: aces are 1, tens and faces 10."""
+    return min(card % 100, 10)
+
+
+class StrategyTable:
+    """Actions for hard totals, soft totals and pairs against every dealer up card.
+
+    hard and soft are int8 arrays indexed [total, up card value] holding action codes, pairs is a bool
+    array indexed [pair card value, up card value]. Splits are limited to max_splits per seat, and the
+    seat's own hand takes insurance when take_insurance is set.
+    """
+
+    def __init__(self, hard, soft, pairs, take_insurance=False, max_splits=1):
+        self.hard = np.full((22, 11), HIT, dtype=np.int8)
+        self.soft = np.full((22, 11), HIT, dtype=np.int8)
+        self.pairs = np.zeros((11, 11), dtype=bool)
+        self._load_rows(self.hard, hard, HARD_TOTALS, ACTION_CODES)
+        self._load_rows(self.soft, soft, SOFT_TOTALS, ACTION_CODES)
+        self._load_rows(self.pairs, pairs, PAIR_VALUES, {'P': True, '-': False})
+        self.take_insurance = bool(take_insurance)
+        self.max_splits = int(max_splits)
+
+    @staticmethod
+    def _load_rows(table, rows, allowed, symbols):
+        for key, row in rows.items():
+            index = int(key)
+            if index not in allowed:
+                raise ValueError(f"No strategy row {index}, rows go from {allowed.start} to {allowed.stop - 1}")
+            if len(row) != len(UP_CARDS) or any(symbol not in symbols for symbol in row):
+                raise ValueError(f"Row {index} must have {len(UP_CARDS)} of {''.join(symbols)}, got {row!r}")
+            for up_card, symbol in zip(UP_CARDS, row):
+                table[index, up_card] = symbols[symbol]
+
+    @classmethod
+    def basic_strategy(cls, take_insurance=False, max_splits=1):
+        return cls(BASIC_HARD, BASIC_SOFT, BASIC_PAIRS, take_insurance=take_insurance, max_splits=max_splits)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of to_dict(). Rows left out keep their default, hit or no split."""
+        return cls(data.get('hard', {}), data.get('soft', {}), data.get('pairs', {}),
+                   take_insurance=data.get('take_insurance', False), max_splits=data.get('max_splits', 1))
+
+    def to_dict(self):
+        return {
+            'hard': {str(total): ''.join(ACTION_CHARS[int(self.hard[total, up])] for up in UP_CARDS)
+                     for total in HARD_TOTALS},
+            'soft': {str(total): ''.join(ACTION_CHARS[int(self.soft[total, up])] for up in UP_CARDS)
+                     for total in SOFT_TOTALS},
+            'pairs': {str(value): ''.join('P' if self.pairs[value, up] else '-' for up in UP_CARDS)
+                      for value in PAIR_VALUES},
+            'take_insurance': self.take_insurance,
+            'max_splits': self.max_splits,
+        }
+
+    def action(self, hand, dealer_up_card, available_actions):
+        """The action for a Hand, as one of available_actions. Can be used as a HeadlessRunner policy."""
+        up = card_value(dealer_up_card)
+        if self.take_insurance and 'i' in available_actions and hand is hand.owner:
+            return 'i'
+        cards = hand.cards
+        if ('p' in available_actions and len(hand.owner.split_hands) < self.max_splits
+                and self.pairs[card_value(cards[0]), up]):
+            return 'p'
+
+        score = hand.score
+        code = self.soft[score, up] if hand.is_soft() else self.hard[min(score, 21), up]
+        if code == HIT:
+            action = 'h'
+        elif code == STAND:
+            action = 's'
+        elif 'd' in available_actions:
+            action = 'd'
+        else:
+            action = 'h' if code == DOUBLE else 's'
+        return action if action in available_actions else 's'
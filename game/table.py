@@ -0,0 +1,89 @@
+import uuid
+
+from game.event_handler import EventHandler
+from game.game_manager import GameManager
+from game.game_state_machine import GameStateMachine
+from game.player_manager import PlayerManager
+from utils.event_bus import EventBus
+
+
+class Table:
+    """One independent blackjack table with its own event bus, state machine, game manager and event handler."""
+
+    def __init__(self, table_id, logger, num_seats=1, num_decks=8, shoe_pool_depth=0, seed=None,
+                 shuffle_mode='cut_card', bus_mode='queued', event_metrics=False, observation=False):
+        self.table_id = table_id
+        self.logger = logger
+
+        self.event_bus = EventBus(mode=bus_mode)
+        if event_metrics:
+            self.event_bus.enable_metrics()
+        self.player_manager = PlayerManager(num_seats=num_seats, event_bus=self.event_bus, logger=logger)
+        self.game_state_machine = GameStateMachine(event_bus=self.event_bus, logger=logger)
+        self.game_manager = GameManager(num_decks=num_decks, player_manager=self.player_manager,
+                                        event_bus=self.event_bus, logger=logger, shoe_pool_depth=shoe_pool_depth,
+                                        seed=seed, shuffle_mode=shuffle_mode)
+        self.event_handler = EventHandler(game_manager=self.game_manager, event_bus=self.event_bus, logger=logger)
+        if observation:
+            self.game_manager.enable_observation()
+
+    def close(self):
+        self.game_manager.deck.close()
+
+
+class TableRegistry:
+    """Creates and owns the tables served by one process, addressed by table id.
+
+    Keyword arguments given to the registry are the defaults of every table it creates and can be
+    overridden per table in create_table().
+    """
+
+    def __init__(self, logger, max_tables=None, **table_defaults):
+        self.logger = logger
+        self.max_tables = max_tables
+        self.table_defaults = table_defaults
+        self.tables = {}  # Maps table ids to tables
+
+    def create_table(self, table_id=None, **options) -> Table:
+        if table_id is None:
+            table_id = uuid.uuid4().hex
+        if table_id in self.tables:
+            raise ValueError(f"Table {table_id} already exists")
+        if self.max_tables is not None and len(self.tables) >= self.max_tables:
+            raise ValueError(f"Cannot create table {table_id}, {self.max_tables} tables are already open")
+
+        table = Table(table_id, logger=self.logger, **{**self.table_defaults, **options})
+        self.tables[table_id] = table
+        self.logger.info(f"Created table {table_id}, {len(self.tables)} tables open")
+        return table
+
+    def get_table(self, table_id):
+        return self.tables.get(table_id)
+
+    def get_or_create_table(self, table_id, **options) -> Table:
+        """Return the table with this id, creating it with options if it does not exist yet."""
+        table = self.tables.get(table_id)
+        if table is None:
+            table = self.create_table(table_id, **options)
+        return table
+
+    def remove_table(self, table_id) -> bool:
+        table = self.tables.pop(table_id, None)
+        if table is None:
+            return False
+        table.close()
+        self.logger.info(f"Removed table {table_id}, {len(self.tables)} tables open")
+        return True
+
+    def table_ids(self):
+        return list(self.tables)
+
+    def close(self):
+        for table_id in self.table_ids():
+            self.remove_table(table_id)
+
+    def __len__(self):
+        return len(self.tables)
+
+    def __contains__(self, table_id):
+        return table_id in self.tables
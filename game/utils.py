@@ -21,6 +21,12 @@ def convert_card_code(card):
     return f"{suit}{face_value}"
 
 
+def card_value(card):
+    """Blackjack value of a card code, counting an ace as 1."""
+    value = card % 100
+    return 10 if value > 10 else value
+
+
 def convert_actions(actions):
     # Define a dictionary to map full actions to their codes
     action_codes = {
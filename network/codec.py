@@ -0,0 +1,240 @@
+"""Wire encodings of the player websocket.
+
+Clients choose one with the ?encoding= query parameter: 'json' (the default) sends RequestPlayerAction and
+PlayerAction as JSON text frames, 'binary' as the struct-packed binary frames below. Error notices are text
+frames in both encodings.
+
+Request frame (server to client), little endian:
+    header   REQUEST_HEADER: frame type, seat, state, score, need_shuffle, has_shoe, balance, name length,
+             number of actions, number of table bytes
+    name     utf-8 player name, its length is a uint16 since client names come from the URL path
+    actions  one ASCII byte per action, or one uint16 per bet amount in the betting state
+    table    one byte per table entry, see encode_card()
+    shoe     if has_shoe: SHOE_FORMAT, 13 remaining counts, running count and cards left
+
+Action frame (client to server):
+    header   ACTION_HEADER: frame type, name length
+    name     utf-8 player name
+    action   ASCII action code, a single byte for h, s, d, p and i, or the bet amount as digits
+"""
+import asyncio
+import struct
+from typing import NamedTuple, Optional
+
+from game.game_state_machine import GameStateMachine
+from network.models import PlayerAction
+
+ENCODINGS = ('json', 'binary')
+
+REQUEST_FRAME = 1
+ACTION_FRAME = 2
+
+REQUEST_HEADER = struct.Struct('<BBBB??dHBH')
+ACTION_HEADER = struct.Struct('<BH')
+SHOE_FORMAT = struct.Struct('<13HhH')
+BET_FORMAT = struct.Struct('<H')
+
+STATES = GameStateMachine.states
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+
+# Table markers of GameManager.get_table_state_array() and their bytes.
+HIDDEN_CARD = 888
+DEALER_MARKER = 900
+SEAT_MARKER = 901
+HIDDEN_CARD_BYTE = 0xFF
+DEALER_MARKER_BYTE = 0xFE
+SEAT_MARKER_BYTE = 0x80
+MAX_SEATS = 0x7E  # Seat markers stay below the two bytes above
+
+
+class CodecError(ValueError):
+    pass
+
+
+class Action(NamedTuple):
+    """A decoded action frame, with the fields of PlayerAction but none of its validation cost."""
+    player_name: str
+    action: str
+    ack: Optional[int] = None  # Not carried by binary frames
+    autopilot: Optional[dict] = None
+    standing_bet: Optional[dict] = None
+
+
+def encode_card(code):
+    """One table entry as a byte: (suit << 4) | value for cards, markers above 0x80."""
+    if code == HIDDEN_CARD:
+        return HIDDEN_CARD_BYTE
+    if code == DEALER_MARKER:
+        return DEALER_MARKER_BYTE
+    if code > DEALER_MARKER:
+        return SEAT_MARKER_BYTE | (code - SEAT_MARKER)
+    return (code // 100) << 4 | code % 100
+
+
+def decode_card(byte):
+    if byte == HIDDEN_CARD_BYTE:
+        return HIDDEN_CARD
+    if byte == DEALER_MARKER_BYTE:
+        return DEALER_MARKER
+    if byte & SEAT_MARKER_BYTE:
+        return SEAT_MARKER + (byte & 0x7F)
+    return (byte >> 4) * 100 + (byte & 0x0F)
+
+
+# Every table entry and its byte, so frames are encoded and decoded with one lookup per entry.
+CARD_BYTES = {code: encode_card(code) for code in
+              [suit * 100 + value for suit in range(1, 5) for value in range(1, 14)]
+              + [HIDDEN_CARD, DEALER_MARKER] + [SEAT_MARKER + seat for seat in range(MAX_SEATS)]}
+CARD_CODES = [None] * 256
+for _code, _byte in CARD_BYTES.items():
+    CARD_CODES[_byte] = _code
+
+
+def encode_request(request):
+    name = request.player_name.encode()
+    if request.state == 'betting':
+        actions = b''.join(BET_FORMAT.pack(int(bet)) for bet in request.available_actions)
+    else:
+        actions = ''.join(request.available_actions).encode('ascii')
+    table = bytes(map(CARD_BYTES.__getitem__, request.table))
+    header = REQUEST_HEADER.pack(REQUEST_FRAME, request.seat, STATE_CODES[request.state], request.score,
+                                 request.need_shuffle, request.shoe is not None, request.balance, len(name),
+                                 len(request.available_actions), len(table))
+    frame = header + name + actions + table
+    if request.shoe is not None:
+        frame += SHOE_FORMAT.pack(*request.shoe.remaining, request.shoe.running_count, request.shoe.cards_left)
+    return frame
+
+
+def decode_request(frame):
+    """The request in a frame as the dict a JSON client gets from the same message."""
+    try:
+        (frame_type, seat, state, score, need_shuffle, has_shoe, balance, name_length, num_actions,
+         table_length) = REQUEST_HEADER.unpack_from(frame)
+        if frame_type != REQUEST_FRAME:
+            raise CodecError(f"Expected a request frame, got frame type {frame_type}")
+        offset = REQUEST_HEADER.size
+        name = frame[offset:offset + name_length].decode()
+        offset += name_length
+        state = STATES[state]
+        if state == 'betting':
+            actions = [str(bet) for (bet,) in BET_FORMAT.iter_unpack(frame[offset:offset + num_actions * 2])]
+            offset += num_actions * 2
+        else:
+            actions = list(frame[offset:offset + num_actions].decode('ascii'))
+            offset += num_actions
+        table = list(map(CARD_CODES.__getitem__, frame[offset:offset + table_length]))
+        offset += table_length
+        request = {'player_name': name, 'seat': seat, 'state': state, 'table': table, 'balance': balance,
+                   'score': score, 'available_actions': actions, 'need_shuffle': need_shuffle}
+        if has_shoe:
+            *remaining, running_count, cards_left = SHOE_FORMAT.unpack_from(frame, offset)
+            request['shoe'] = {'remaining': remaining, 'running_count': running_count, 'cards_left': cards_left}
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise CodecError(f"Malformed request frame: {e}") from e
+    return request
+
+
+def encode_action(player_name, action):
+    name = player_name.encode()
+    return ACTION_HEADER.pack(ACTION_FRAME, len(name)) + name + str(action).encode('ascii')
+
+
+def decode_action(frame):
+    try:
+        frame_type, name_length = ACTION_HEADER.unpack_from(frame)
+        if frame_type != ACTION_FRAME:
+            raise CodecError(f"Expected an action frame, got frame type {frame_type}")
+        offset = ACTION_HEADER.size
+        name = frame[offset:offset + name_length].decode()
+        action = frame[offset + name_length:].decode('ascii')
+    except (struct.error, UnicodeDecodeError) as e:
+        raise CodecError(f"Malformed action frame: {e}") from e
+    if not action:
+        raise CodecError("Action frame without an action")
+    return Action(name, action)
+
+
+def dump_request(request, table_json):
+    # The table is the same for every player, so its JSON comes from the game manager's snapshot cache
+    # and only the per-player fields are serialized here.
+    fields = request.model_dump_json(exclude_none=True, exclude={'table'})
+    return f'{{"table":{table_json},{fields[1:]}'
+
+
+class JsonWire:
+    """Sends and receives the player messages of one websocket as JSON text frames."""
+
+    encoding = 'json'
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.inbox = None  # Queue of received messages once start_inbox() was called
+
+    def start_inbox(self):
+        """Read every incoming message into a queue from now on, so the client can send without being asked."""
+        if self.inbox is None:
+            self.inbox = asyncio.Queue()
+            self._reader = asyncio.create_task(self._read_inbox())
+
+    async def _read_inbox(self):
+        try:
+            while True:
+                self.inbox.put_nowait(await self._receive())
+        except Exception as e:
+            # Raised again to whoever reads the message after the last one, a disconnect most of the time.
+            self.inbox.put_nowait(e)
+
+    async def receive(self):
+        if self.inbox is None:
+            return await self._receive()
+        message = await self.inbox.get()
+        if isinstance(message, Exception):
+            raise message
+        return message
+
+    def pending(self):
+        """The messages already received and not read yet, without waiting for more."""
+        messages = []
+        while self.inbox is not None and not self.inbox.empty():
+            message = self.inbox.get_nowait()
+            if isinstance(message, Exception):
+                raise message
+            messages.append(message)
+        return messages
+
+    async def send_request(self, request, table_json=None):
+        if table_json is None:
+            message = request.model_dump_json(exclude_none=True)
+        else:
+            message = dump_request(request, table_json)
+        await self.websocket.send_text(message)
+
+    async def _receive(self):
+        return await self.websocket.receive_text()
+
+    def parse_action(self, data):
+        """The PlayerAction in a received message, raises ValueError (pydantic's ValidationError) on invalid data."""
+        return PlayerAction.model_validate_json(data)
+
+
+class BinaryWire(JsonWire):
+    """Sends and receives the player messages of one websocket as binary frames."""
+
+    encoding = 'binary'
+
+    async def send_request(self, request, table_json=None):
+        await self.websocket.send_bytes(encode_request(request))
+
+    async def _receive(self):
+        return await self.websocket.receive_bytes()
+
+    def parse_action(self, data):
+        """The PlayerAction in a received frame, raises CodecError on a malformed frame."""
+        return decode_action(data)
+
+
+def create_wire(websocket, encoding='json'):
+    if encoding == 'binary':
+        return BinaryWire(websocket)
+    return JsonWire(websocket)
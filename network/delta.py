@@ -0,0 +1,138 @@
+"""Delta encoding of the table for clients that opt in with ?delta=true.
+
+The table of GameManager.get_table_state_array() is a list of hands, each starting with its marker (900 for
+the dealer, 901 + seat for the players). A delta is a list of [hand, keep, cards] operations: keep the
+first keep entries of hand number hand, then append cards. Hands are only ever extended or, when the hole
+card is turned over or a hand is split, cut back and extended again, so the delta of a turn is a card or
+two. A change to the list of hands itself (a player joins or leaves, a hand is split off) is sent as a
+full table.
+
+Every table message carries a sequence number seq. The client acknowledges the last table it applied by
+sending that seq as ack with its next action, and the server encodes the next delta against that table.
+Messages with base carry a delta against the table of seq base, the others a full table. An ack the
+server does not know, or no ack at all, gets a full table. A client that gets a delta against a table it
+does not have acks 0 to be sent a full table again.
+
+A delta is only sent when its message is shorter than the full table's. The clients of a table ack and are
+sent the same few tables, so the delta between two tables is worked out once and shared through a cache,
+see DeltaTracker.encode().
+"""
+from pydantic_core import to_json
+
+MARKER = 900
+# The fields a delta message adds to a full table message, on top of the base and delta values:
+# "table":[],"seq":N,"base":B,"delta":D against "table":T,"seq":N.
+DELTA_OVERHEAD = len('[],"base":,"delta":')
+
+
+def split_hands(table):
+    starts = hand_starts(table) + [len(table)]
+    return [table[start:end] for start, end in zip(starts, starts[1:])]
+
+
+def hand_starts(table):
+    return [index for index, entry in enumerate(table) if entry >= MARKER]
+
+
+def diff_tables(old, new, old_starts=None, new_starts=None, max_size=None):
+    """The operations turning table old into table new, None when their hands differ.
+
+    old_starts and new_starts are the hand_starts() of the tables when already known. With max_size the
+    diff also gives up, returning None, once the operations add up to max_size entries.
+    """
+    if old == new:
+        return []
+    old_starts = hand_starts(old) if old_starts is None else old_starts
+    new_starts = hand_starts(new) if new_starts is None else new_starts
+    if len(old_starts) != len(new_starts):
+        return None
+    old_starts = old_starts + [len(old)]
+    new_starts = new_starts + [len(new)]
+    operations = []
+    size = 0
+    for index in range(len(old_starts) - 1):
+        old_start, old_end = old_starts[index], old_starts[index + 1]
+        new_start, new_end = new_starts[index], new_starts[index + 1]
+        if old[old_start] != new[new_start]:
+            return None
+        if old[old_start:old_end] == new[new_start:new_end]:
+            continue
+        keep = 1
+        limit = min(old_end - old_start, new_end - new_start)
+        while keep < limit and old[old_start + keep] == new[new_start + keep]:
+            keep += 1
+        cards = new[new_start + keep:new_end]
+        size += 3 + len(cards)
+        if max_size is not None and size >= max_size:
+            return None
+        operations.append([index, keep, cards])
+    return operations
+
+
+def apply_delta(table, operations):
+    """The table after applying operations, as a client would."""
+    hands = split_hands(table)
+    for index, keep, cards in operations:
+        hands[index] = hands[index][:keep] + cards
+    return [entry for hand in hands for entry in hand]
+
+
+def encode_delta(old, new, old_starts=None, new_starts=None):
+    """The operations turning table old into table new and their JSON, None when their hands differ or the
+    operations are as long as the table."""
+    operations = diff_tables(old, new, old_starts, new_starts, max_size=len(new))
+    if operations is None:
+        return None
+    return operations, to_json(operations).decode()
+
+
+class DeltaTracker:
+    """The tables sent to one client and the one it last acknowledged."""
+
+    def __init__(self, history=8):
+        self.history = history  # Unacknowledged tables kept, older ones are forgotten
+        self.seq = 0
+        self.sent = {}  # Maps sequence numbers to the tables sent with them, their keys and hand starts
+        self.acked = None  # (seq, table, key, hand starts) last acknowledged by the client
+
+    def encode(self, table, table_json=None, key=None, cache=None):
+        """The table fields of the next message: table and seq, plus base and delta when a delta applies.
+
+        table_json is the JSON of table when already known. key identifies table among the tables of its
+        game, as GameManager.get_table_key() does, and cache is a dict shared by the trackers of the game
+        in which the delta between two keyed tables is kept once worked out.
+        """
+        self.seq += 1
+        starts = hand_starts(table)
+        self.sent[self.seq] = (table, key, starts)
+        if len(self.sent) > self.history:
+            del self.sent[next(iter(self.sent))]  # The oldest, sequence numbers are inserted in order
+        if self.acked is None:
+            return {'table': table, 'seq': self.seq}
+        base, base_table, base_key, base_starts = self.acked
+        if base_table is table:
+            delta = [], '[]'
+        elif cache is None or key is None or base_key is None:
+            delta = encode_delta(base_table, table, base_starts, starts)
+        elif (base_key, key) in cache:
+            delta = cache[base_key, key]
+        else:
+            delta = cache[base_key, key] = encode_delta(base_table, table, base_starts, starts)
+        # Most hands change at the first turn of a round, and a short table is not much longer than its delta.
+        if delta is not None:
+            table_size = len(to_json(table)) if table_json is None else len(table_json)
+            if len(delta[1]) + len(str(base)) + DELTA_OVERHEAD < table_size:
+                return {'table': [], 'seq': self.seq, 'base': base, 'delta': delta[0]}
+        return {'table': table, 'seq': self.seq}
+
+    def acknowledge(self, ack):
+        if ack is None:
+            return
+        sent = self.sent.get(ack)
+        if sent is None:
+            # The client is out of step with us, the next message resynchronizes it with a full table.
+            self.acked = None
+            return
+        self.acked = (ack, *sent)
+        for seq in [seq for seq in self.sent if seq < ack]:
+            del self.sent[seq]
@@ -1,11 +1,36 @@
-from typing import Dict
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
 
+class AutopilotStrategy(BaseModel):
+    # Rows as in game.strategy: one action per dealer up card 2..10, A. Rows left out hit, or do not split.
+    hard: Dict[int, str] = {}
+    soft: Dict[int, str] = {}
+    pairs: Dict[int, str] = {}
+    take_insurance: bool = False
+    max_splits: int = 1
+    enabled: bool = True  # False hands the seat's decisions back to the client.
+
+
+class StandingBet(BaseModel):
+    amount: int  # Bet every round, at least 1
+    ramp: Dict[float, int] = {}  # True count -> bet, the highest count at or below the true count applies.
+    enabled: bool = True  # False goes back to answering every betting request.
+
+
 class PlayerAction(BaseModel):
     player_name: str
     action: str
+    ack: Optional[int] = None  # seq of the last table applied, only in delta mode.
+    autopilot: Optional[AutopilotStrategy] = None  # Sent with a bet to let the server play the seat's hands.
+    standing_bet: Optional[StandingBet] = None  # Sent with a bet to let the server bet for the seat.
+
+
+class ShoeComposition(BaseModel):
+    remaining: List[int]  # Cards left per value, aces first and kings last.
+    running_count: int  # Hi-Lo running count since the last shuffle.
+    cards_left: int
 
 
 class RequestPlayerAction(BaseModel):
@@ -17,6 +42,11 @@ class RequestPlayerAction(BaseModel):
     score: int
     available_actions: list
     need_shuffle: bool
+    shoe: Optional[ShoeComposition] = None  # Only sent to clients that opt in.
+    # Delta mode only, see network/delta.py: table is empty when base and delta are set.
+    seq: Optional[int] = None
+    base: Optional[int] = None
+    delta: Optional[list] = None
 
     # Add more fields as needed
 
@@ -2,30 +2,109 @@ import asyncio
 import logging
 import time
 import uuid
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from pydantic import ValidationError
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query, status
 
 from game.game_state_machine import GameStateMachine
 from game.event_handler import EventHandler
+from network.codec import ENCODINGS, create_wire
 from network.connection_manager import ConnectionManager
+from network.delta import DeltaTracker
 from game.player import Player
 from game.game_manager import GameManager
-from network.models import RequestPlayerAction, PlayerAction, GameResult
+from game.betting import BetRule
+from game.strategy import StrategyTable
+from network.models import RequestPlayerAction, GameResult, ShoeComposition
 from game.state import GameState, PlayerState
 import utils.log_setup
-from config import get_game_manager, get_event_bus, get_state_machine, \
-    get_event_handler
+from config import DEFAULT_TABLE_ID, get_game_manager, get_event_bus, get_state_machine, \
+    get_event_handler, get_table_registry
+from game.table import TableRegistry
 from utils.event_bus import EventBus
 
 router = APIRouter()
 logger = utils.log_setup.setup_logger(name=__name__, log_level=logging.WARN)
 
+# Clients pick the wire encoding of their messages with ?encoding=, see network/codec.py.
+ENCODING_PATTERN = '^(' + '|'.join(ENCODINGS) + ')$'
+
+
+@router.get("/metrics/events")
+async def event_metrics(event_bus: EventBus = Depends(get_event_bus)):
+    # Empty unless the bus records metrics, see BLACKJACK_EVENT_METRICS in config.py.
+    if event_bus.metrics is None:
+        return {}
+    return event_bus.metrics.snapshot()
+
+
+@router.get("/metrics/events/{table_id}")
+async def table_event_metrics(table_id: str, table_registry: TableRegistry = Depends(get_table_registry)):
+    table = table_registry.get_table(table_id)
+    if table is None or table.event_bus.metrics is None:
+        return {}
+    return table.event_bus.metrics.snapshot()
+
+
+@router.get("/tables")
+async def list_tables(table_registry: TableRegistry = Depends(get_table_registry)):
+    tables = {}
+    for table_id, table in table_registry.tables.items():
+        tables[table_id] = {'state': table.game_state_machine.get_state(),
+                            'seats': table.player_manager.num_seats,
+                            'players': len(table.player_manager.players_by_id),
+                            'round': table.game_manager.round_counter}
+    return tables
+
 
 @router.websocket("/ws/result/publish_results")
 async def websocket_broadcast_results(websocket: WebSocket,
                                       game_manager: GameManager = Depends(get_game_manager),
                                       game_state_machine: GameStateMachine = Depends(get_state_machine),
                                       event_handler: EventHandler = Depends(get_event_handler)):
+    await broadcast_results(websocket, game_manager, event_handler)
+
+
+@router.websocket("/ws/{client_name}")
+async def websocket_endpoint(websocket: WebSocket, client_name: str, composition: bool = False,
+                             encoding: str = Query('json', pattern=ENCODING_PATTERN), delta: bool = False,
+                             game_manager: GameManager = Depends(get_game_manager),
+                             game_state_machine: GameStateMachine = Depends(get_state_machine),
+                             event_handler: EventHandler = Depends(get_event_handler)):
+    await play(websocket, client_name, composition, game_manager, game_state_machine, event_handler, encoding,
+               delta)
+
+
+@router.websocket("/ws/{table_id}/result/publish_results")
+async def table_broadcast_results(websocket: WebSocket, table_id: str,
+                                  table_registry: TableRegistry = Depends(get_table_registry)):
+    table = table_registry.get_table(table_id)
+    if table is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await broadcast_results(websocket, table.game_manager, table.event_handler)
+
+
+@router.websocket("/ws/{table_id}/{client_name}")
+async def table_websocket_endpoint(websocket: WebSocket, table_id: str, client_name: str, composition: bool = False,
+                                   seats: int = Query(1, ge=1, le=7),
+                                   encoding: str = Query('json', pattern=ENCODING_PATTERN), delta: bool = False,
+                                   table_registry: TableRegistry = Depends(get_table_registry)):
+    # The first client of a table id opens the table, ?seats= sets how many players it waits for.
+    try:
+        table = table_registry.get_or_create_table(table_id, num_seats=seats)
+    except ValueError as e:
+        logger.error(f"Cannot open table {table_id}: {e}")
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    try:
+        await play(websocket, client_name, composition, table.game_manager, table.game_state_machine,
+                   table.event_handler, encoding, delta)
+    finally:
+        # The last player to leave closes the table, so its id and registry slot can be used again.
+        if table_id != DEFAULT_TABLE_ID and not table.player_manager.players_by_id:
+            table_registry.remove_table(table_id)
+
+
+async def broadcast_results(websocket, game_manager, event_handler):
     connection_manager = ConnectionManager()
     await connection_manager.connect(websocket)
 
@@ -41,39 +120,71 @@ async def websocket_broadcast_results(websocket: WebSocket,
         await connection_manager.send_personal_message(game_result.model_dump_json(), websocket)
 
 
-@router.websocket("/ws/{client_name}")
-async def websocket_endpoint(websocket: WebSocket, client_name: str,
-                             game_manager: GameManager = Depends(get_game_manager),
-                             game_state_machine: GameStateMachine = Depends(get_state_machine),
-                             event_handler: EventHandler = Depends(get_event_handler)):
+async def play(websocket, client_name, composition, game_manager, game_state_machine, event_handler,
+               encoding='json', delta=False):
     connection_manager = ConnectionManager()
     await connection_manager.connect(websocket)
+    wire = create_wire(websocket, encoding)
+    # ?delta=true sends table deltas to JSON clients, binary frames always carry the full table.
+    tracker = DeltaTracker() if delta and encoding == 'json' else None
     client_id = str(uuid.uuid4())
 
     # Create a new player and add to the game
     player = Player(logger=logger, name=client_name, id=client_id, websocket=websocket, balance=1000)
-    game_manager.player_manager.add_player(player)
-
-    while True:
-        # logger.debug(f"Game state {game_state_machine.get_state()}")
-        # logger.debug(f'Client {player.name} player.state has {player.state} state')
-
-        if game_state_machine.get_state() == 'betting':
-            await handle_betting_state(player, game_manager, connection_manager, event_handler, websocket,
-                                       game_state_machine)
-
-        elif game_state_machine.get_state() == 'player_turn':
-            await handle_player_turn_state(player, game_manager, connection_manager, websocket, game_state_machine,
-                                           client_id)
-
-        elif game_state_machine.get_state() == 'publish_result':
-            await handle_publish_result_state(player, game_manager, connection_manager, websocket,
-                                              game_state_machine, event_handler)
-
-        await event_handler.ready_to_start.wait()
 
+    try:
+        game_manager.add_player(player)
+        while True:
+            # logger.debug(f"Game state {game_state_machine.get_state()}")
+            # logger.debug(f'Client {player.name} player.state has {player.state} state')
+
+            if game_state_machine.get_state() == 'betting':
+                await handle_betting_state(player, game_manager, connection_manager, event_handler, wire,
+                                           game_state_machine, composition)
+
+            elif game_state_machine.get_state() == 'player_turn':
+                await handle_player_turn_state(player, game_manager, connection_manager, wire, game_state_machine,
+                                               client_id, composition, tracker)
+
+            elif game_state_machine.get_state() == 'publish_result':
+                await handle_publish_result_state(player, game_manager, connection_manager, wire,
+                                                  game_state_machine, event_handler, composition, tracker)
+
+            await event_handler.ready_to_start.wait()
+    except WebSocketDisconnect:
+        logger.info(f"Client {player.name} disconnected")
+    finally:
+        # A seat whose client is gone must not keep the rest of its table waiting.
+        game_manager.remove_player(player.id)
+        await connection_manager.disconnect(websocket)
+
+
+def get_table_fields(game_manager, tracker, hidden_card=False):
+    """The table fields of a message, and the table JSON to splice into it or None when it carries a delta."""
+    table_state, table_json = game_manager.get_table_snapshot(hidden_card=hidden_card)
+    # Without a delta tracker every message carries the full table.
+    if tracker is None:
+        return {'table': table_state}, table_json
+    table_fields = tracker.encode(table_state, table_json, key=game_manager.get_table_key(hidden_card),
+                                  cache=game_manager.table_deltas)
+    return table_fields, None if 'delta' in table_fields else table_json
+
+
+def get_shoe_composition(game_manager, composition, hidden_card=False):
+    # Clients opt in to the remaining shoe composition with the ?composition=true query parameter.
+    if not composition:
+        return None
+    return ShoeComposition(**game_manager.get_shoe_composition(hidden_card=hidden_card))
+
+
+async def handle_betting_state(player, game_manager, connection_manager, event_handler, wire, game_state_machine,
+                               composition=False):
+    if player.id in game_manager.standing_bets and player.state != PlayerState.WAIT_FOR_BET:
+        # The server has placed this round's bet, the client is not asked.
+        await read_bet_messages(player, game_manager, connection_manager, wire)
+        await event_handler.bet_finished.wait()
+        return
 
-async def handle_betting_state(player, game_manager, connection_manager, event_handler, websocket, game_state_machine):
     available_bets = game_manager.get_available_bets()
 
     logger.info(f'Client {player.name} player.state has {player.state} state')
@@ -82,23 +193,72 @@ async def handle_betting_state(player, game_manager, connection_manager, event_h
                                          available_actions=available_bets,
                                          score=player.score,
                                          need_shuffle=game_manager.deck.need_shuffle(),
-                                         seat=game_manager.player_manager.get_seat_number(player.id))
-    await connection_manager.send_personal_message(request_action.model_dump_json(), websocket)
-    data = await websocket.receive_text()
+                                         seat=game_manager.player_manager.get_seat_number(player.id),
+                                         shoe=get_shoe_composition(game_manager, composition))
+    await wire.send_request(request_action)
+    data = await wire.receive()
     logger.info(f"Processing player action {data}")
     if game_state_machine.get_state() == 'betting':
         try:
-            json_data = PlayerAction.model_validate_json(data)
+            json_data = wire.parse_action(data)
+            if json_data.autopilot is not None:
+                set_autopilot(player, game_manager, json_data.autopilot)
+            if json_data.standing_bet is not None:
+                set_standing_bet(player, game_manager, json_data.standing_bet, wire)
             game_manager.place_bet(player.id, json_data.action)
-        except ValidationError as e:
-            await connection_manager.send_personal_message(f"Invalid data: {e}", websocket)
+        except ValueError as e:
+            await connection_manager.send_personal_message(f"Invalid data: {e}", wire.websocket)
             logger.info(f"Current state is {game_state_machine.get_state()}")
         pass
 
     await event_handler.bet_finished.wait()
 
 
-async def handle_player_turn_state(player, game_manager, connection_manager, websocket, game_state_machine, client_id):
+def set_autopilot(player, game_manager, autopilot):
+    # Raises ValueError for rows that are not valid strategy rows, before anything is changed.
+    strategy = StrategyTable.from_dict(autopilot.model_dump()) if autopilot.enabled else None
+    game_manager.set_autopilot(player.id, strategy)
+    logger.info(f"Autopilot {'on' if strategy is not None else 'off'} for {player.name}")
+
+
+def set_standing_bet(player, game_manager, standing_bet, wire):
+    rule = BetRule(standing_bet.amount, standing_bet.ramp) if standing_bet.enabled else None
+    game_manager.set_standing_bet(player.id, rule)
+    if rule is not None:
+        # From now on the client sends bets for the next round whenever it likes, they wait in the inbox.
+        wire.start_inbox()
+    logger.info(f"Standing bet {'on' if rule is not None else 'off'} for {player.name}")
+
+
+async def read_bet_messages(player, game_manager, connection_manager, wire):
+    for data in wire.pending():
+        try:
+            json_data = wire.parse_action(data)
+        except ValueError as e:
+            await connection_manager.send_personal_message(f"Invalid data: {e}", wire.websocket)
+            continue
+        await apply_bet_message(player, game_manager, connection_manager, wire, json_data)
+
+
+def is_bet_message(json_data):
+    # Turn actions are letters, bets are amounts.
+    return json_data.standing_bet is not None or json_data.action.isdigit()
+
+
+async def apply_bet_message(player, game_manager, connection_manager, wire, json_data):
+    # A message a client with a standing bet sent unasked: it bets its action instead of the standing bet in
+    # the next round, and may change or stop the standing bet with standing_bet.
+    try:
+        if json_data.standing_bet is not None:
+            set_standing_bet(player, game_manager, json_data.standing_bet, wire)
+        if player.id in game_manager.standing_bets:
+            game_manager.override_bet(player.id, json_data.action)
+    except ValueError as e:
+        await connection_manager.send_personal_message(f"Invalid data: {e}", wire.websocket)
+
+
+async def handle_player_turn_state(player, game_manager, connection_manager, wire, game_state_machine, client_id,
+                                   composition=False, tracker=None):
     origin_player = player
     await game_manager.player_manager.player_events[player.id].wait()
 
@@ -116,51 +276,63 @@ async def handle_player_turn_state(player, game_manager, connection_manager, web
     logger.info(f'Handling turn for {client_id} ({player.name})')
 
     # Prepare and send the initial request action to the player
-    table_state = game_manager.get_table_state_array(hidden_card=True)
     actions = player.available_actions if player.state == PlayerState.MY_TURN else []
 
+    table_fields, table_json = get_table_fields(game_manager, tracker, hidden_card=True)
     request_action = RequestPlayerAction(player_name=player.name, state=game_state_machine.get_state(),
-                                         table=table_state,
+                                         **table_fields,
                                          available_actions=actions, balance=player.balance,
                                          score=player.score,
                                          need_shuffle=game_manager.deck.need_shuffle(),
-                                         seat=game_manager.player_manager.get_seat_number(player.id))
+                                         seat=game_manager.player_manager.get_seat_number(player.id),
+                                         shoe=get_shoe_composition(game_manager, composition, hidden_card=True))
     logger.debug(f'Requesting action: {request_action}')
 
-    await connection_manager.send_personal_message(request_action.model_dump_json(), websocket)
+    await wire.send_request(request_action, table_json)
 
-    # Await player action
-    data = await websocket.receive_text()
-    logger.debug(f'Received action from {client_id}: {data}')
+    # Await player action. A client with a standing bet may send the next round's bet first, the bet is set
+    # aside and the action still awaited.
+    while True:
+        data = await wire.receive()
+        logger.debug(f'Received action from {client_id}: {data}')
 
-    try:
-        json_data = PlayerAction.model_validate_json(data)
-        if json_data.player_name == player.name or json_data.player_name == player.name.replace(" (Split)", ""):
-            game_manager.handle_action(json_data.action, player)
-            player = origin_player
-        else:
-            logger.error(f'Action from mismatched client name: {json_data.player_name} vs {player.name}')
-    except ValidationError as e:
-        logger.error(f'Invalid data from {client_id}: {e}')
-        await connection_manager.send_personal_message(f"Invalid data: {e}", player.websocket)
+        try:
+            json_data = wire.parse_action(data)
+            if wire.inbox is not None and is_bet_message(json_data):
+                await apply_bet_message(origin_player, game_manager, connection_manager, wire, json_data)
+                continue
+            if tracker is not None:
+                tracker.acknowledge(json_data.ack)
+            if json_data.player_name == player.name or json_data.player_name == player.name.replace(" (Split)", ""):
+                game_manager.handle_action(json_data.action, player)
+                player = origin_player
+            else:
+                logger.error(f'Action from mismatched client name: {json_data.player_name} vs {player.name}')
+        except ValueError as e:
+            logger.error(f'Invalid data from {client_id}: {e}')
+            await connection_manager.send_personal_message(f"Invalid data: {e}", player.websocket)
+        return
 
 
-async def handle_publish_result_state(player, game_manager, connection_manager, websocket, game_state_machine,
-                                      event_handler):
-    if player.state == PlayerState.RESULT_NOTIFIED:
+async def handle_publish_result_state(player, game_manager, connection_manager, wire, game_state_machine,
+                                      event_handler, composition=False, tracker=None):
+    # A player who joined during the round has no result, it bets from the next round on.
+    if player.state == PlayerState.RESULT_NOTIFIED or game_manager.player_manager.waits_for_next_round(player.id):
         await event_handler.wait_for_new_round.wait()
         return
 
     logger.info(f'Publishing result for {player.name}')
 
-    table_state = game_manager.get_table_state_array(hidden_card=False)
+    table_fields, table_json = get_table_fields(game_manager, tracker)
     request_action = RequestPlayerAction(player_name=player.name, state=game_state_machine.get_state(),
-                                         table=table_state,
+                                         **table_fields,
                                          balance=player.balance, available_actions=[],
                                          score=player.score,
                                          need_shuffle=game_manager.deck.need_shuffle(),
-                                         seat=game_manager.player_manager.get_seat_number(player.id))
-    await connection_manager.send_personal_message(request_action.model_dump_json(), websocket)
+                                         seat=game_manager.player_manager.get_seat_number(player.id),
+                                         shoe=get_shoe_composition(game_manager, composition))
+    await wire.send_request(request_action, table_json)
 
-    player.publish_result()
-    game_manager.player_manager.check_all_results_are_published()
+    # The last result published starts the next round, with the standing bets placed right away.
+    await read_bet_messages(player, game_manager, connection_manager, wire)
+    game_manager.player_manager.publish_result(player)
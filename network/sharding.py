@@ -0,0 +1,254 @@
+"""Tables sharded across worker processes behind one front dispatcher.
+
+Each worker is an ordinary server process (main:app) with its own TableRegistry. The dispatcher picks the
+worker that owns a table with a ShardRouter, so a table's clients always reach the process that holds its
+state, in one of two ways:
+
+- GET /shards/{table_id} returns the worker of the table and its websocket url, and the clients connect to
+  the worker themselves. The game traffic does not pass through the dispatcher. The worker closes the table
+  when its last player leaves, the dispatcher releases it at a later lookup, see release_closed_tables().
+- The websocket routes of main:app, relayed frame by frame to the worker, for clients that cannot look the
+  table up. A relayed table is released when its last relayed connection closes.
+
+The relay is a single process handling every frame of every table in both directions, so it caps the
+throughput of all workers together. benchmarks/bench_sharding.py measures both ways: on a single core about
+550 rounds/s relayed against 790 direct with one worker and 920 direct with two, where the relayed rate does
+not move with the number of workers.
+
+Run with: python -m network.sharding --workers 4
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import time
+import urllib.request
+
+import uvicorn
+import websockets
+from fastapi import FastAPI, WebSocket, status
+
+import utils.log_setup
+
+logger = utils.log_setup.setup_logger(name=__name__, log_level=logging.WARN)
+
+DEFAULT_TABLE_ID = 'default'
+# Seconds a looked up table is kept assigned before it may be released, its clients may still be connecting.
+LOOKUP_GRACE = 30
+
+
+class ShardRouter:
+    """Sticky table -> worker assignment. A new table goes to the worker that owns the fewest tables."""
+
+    def __init__(self, num_workers):
+        if num_workers < 1:
+            raise ValueError("At least one worker is needed")
+        self.num_workers = num_workers
+        self.worker_by_table = {}  # Maps table ids to worker indexes
+        self.tables_per_worker = [0] * num_workers
+
+    def assign(self, table_id) -> int:
+        worker = self.worker_by_table.get(table_id)
+        if worker is None:
+            # Ties go to the lowest index, so the assignment only depends on the order tables arrive in.
+            worker = min(range(self.num_workers), key=self.tables_per_worker.__getitem__)
+            self.worker_by_table[table_id] = worker
+            self.tables_per_worker[worker] += 1
+        return worker
+
+    def lookup(self, table_id):
+        return self.worker_by_table.get(table_id)
+
+    def release(self, table_id) -> bool:
+        worker = self.worker_by_table.pop(table_id, None)
+        if worker is None:
+            return False
+        self.tables_per_worker[worker] -= 1
+        return True
+
+    def load(self):
+        return list(self.tables_per_worker)
+
+
+def create_dispatcher_app(shard_router, worker_urls):
+    """FastAPI app looking up the worker of a table, and exposing the same websocket routes as main:app
+    relayed to the owning worker."""
+    app = FastAPI()
+    connections = {}  # Maps table ids to the number of connections relayed to their worker
+    looked_up = {}  # Maps the table ids handed out by GET /shards/{table_id} to the time of their last lookup
+
+    async def relay_table(websocket, table_id, path, assign=True):
+        worker = shard_router.assign(table_id) if assign else shard_router.lookup(table_id)
+        if worker is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        connections[table_id] = connections.get(table_id, 0) + 1
+        try:
+            await relay(websocket, f"{worker_urls[worker]}{path}")
+        finally:
+            connections[table_id] -= 1
+            # A table nobody is connected to is closed on its worker, so it no longer counts towards its load.
+            if not connections[table_id]:
+                del connections[table_id]
+                # Looked up tables may still have players connected to the worker directly.
+                if table_id != DEFAULT_TABLE_ID and table_id not in looked_up:
+                    shard_router.release(table_id)
+
+    @app.get("/shards")
+    async def shards():
+        return {'tables_per_worker': shard_router.load(), 'tables': dict(shard_router.worker_by_table)}
+
+    @app.get("/shards/{table_id}")
+    async def find_table(table_id: str):
+        # Clients connect to {url}/ws/{table_id}/{client_name} on the worker themselves.
+        await release_closed_tables(shard_router, worker_urls, looked_up, relayed=connections)
+        worker = shard_router.assign(table_id)
+        looked_up[table_id] = time.monotonic()
+        return {'table_id': table_id, 'worker': worker, 'url': worker_urls[worker]}
+
+    @app.websocket("/ws/result/publish_results")
+    async def broadcast_results(websocket: WebSocket):
+        await relay_table(websocket, DEFAULT_TABLE_ID, "/ws/result/publish_results")
+
+    @app.websocket("/ws/{client_name}")
+    async def default_table(websocket: WebSocket, client_name: str):
+        await relay_table(websocket, DEFAULT_TABLE_ID, with_query(f"/ws/{client_name}", websocket))
+
+    @app.websocket("/ws/{table_id}/result/publish_results")
+    async def table_broadcast_results(websocket: WebSocket, table_id: str):
+        await relay_table(websocket, table_id, f"/ws/{table_id}/result/publish_results", assign=False)
+
+    @app.websocket("/ws/{table_id}/{client_name}")
+    async def table(websocket: WebSocket, table_id: str, client_name: str):
+        await relay_table(websocket, table_id, with_query(f"/ws/{table_id}/{client_name}", websocket))
+
+    return app
+
+
+async def release_closed_tables(shard_router, worker_urls, looked_up, relayed=()):
+    """Release the looked up tables that their worker has closed, so they no longer count towards its load.
+
+    looked_up maps table ids to the time of their last lookup or check, the tables released are removed from
+    it. Tables looked up or found open in the last LOOKUP_GRACE seconds are not checked again, so the workers
+    are asked at most once per LOOKUP_GRACE for each table.
+    """
+    deadline = time.monotonic() - LOOKUP_GRACE
+    stale = [table_id for table_id, last_lookup in looked_up.items()
+             if last_lookup < deadline and table_id not in relayed]
+    if not stale:
+        return
+    open_tables = await asyncio.gather(*(worker_tables(url) for url in worker_urls))
+    now = time.monotonic()
+    for table_id in stale:
+        worker = shard_router.lookup(table_id)
+        # Tables of a worker that does not answer are kept, it may only be busy.
+        if worker is not None and (open_tables[worker] is None or table_id in open_tables[worker]):
+            looked_up[table_id] = now
+            continue
+        del looked_up[table_id]
+        if table_id != DEFAULT_TABLE_ID:
+            shard_router.release(table_id)
+
+
+def with_query(url, websocket):
+    query = websocket.url.query
+    return f"{url}?{query}" if query else url
+
+
+def fetch_json(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return json.load(response)
+
+
+async def worker_tables(url):
+    """Ids of the tables open on the worker serving websockets at url, None if it does not answer."""
+    # ws:// and wss:// urls map to http:// and https://.
+    try:
+        return set(await asyncio.to_thread(fetch_json, f"http{url[2:]}/tables"))
+    except (OSError, ValueError) as e:
+        logger.error(f"Cannot list the tables of the worker at {url}: {e}")
+        return None
+
+
+async def client_to_worker(websocket, upstream):
+    while True:
+        message = await websocket.receive()
+        if message['type'] == 'websocket.disconnect':
+            return
+        if message.get('text') is not None:
+            await upstream.send(message['text'])
+        elif message.get('bytes') is not None:
+            await upstream.send(message['bytes'])
+
+
+async def worker_to_client(upstream, websocket):
+    async for message in upstream:
+        if isinstance(message, bytes):
+            await websocket.send_bytes(message)
+        else:
+            await websocket.send_text(message)
+
+
+async def relay(websocket: WebSocket, url):
+    try:
+        upstream = await websockets.connect(url, max_size=None)
+    except (OSError, websockets.InvalidHandshake) as e:
+        logger.error(f"Cannot reach worker at {url}: {e}")
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    await websocket.accept()
+
+    # Whichever side hangs up first ends the relay.
+    tasks = [asyncio.create_task(client_to_worker(websocket, upstream)),
+             asyncio.create_task(worker_to_client(upstream, websocket))]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await upstream.close()
+        try:
+            await websocket.close()
+        except RuntimeError:
+            pass  # The client already closed the connection.
+
+
+def run_worker(host, port, log_level):
+    uvicorn.run("main:app", host=host, port=port, log_level=log_level)
+
+
+def serve(num_workers, host='127.0.0.1', port=56666, worker_port=56700, log_level='warning'):
+    """Start num_workers worker processes on consecutive ports from worker_port and the dispatcher on port."""
+    context = multiprocessing.get_context('spawn')
+    workers = []
+    worker_urls = []
+    for index in range(num_workers):
+        process = context.Process(target=run_worker, args=('127.0.0.1', worker_port + index, log_level), daemon=True)
+        process.start()
+        workers.append(process)
+        worker_urls.append(f"ws://127.0.0.1:{worker_port + index}")
+
+    try:
+        uvicorn.run(create_dispatcher_app(ShardRouter(num_workers), worker_urls), host=host, port=port,
+                    log_level=log_level)
+    finally:
+        for process in workers:
+            process.terminate()
+        for process in workers:
+            process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve tables from several worker processes.")
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count())
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=56666)
+    parser.add_argument('--worker-port', type=int, default=56700)
+    args = parser.parse_args()
+    serve(args.workers, host=args.host, port=args.port, worker_port=args.worker_port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+"""Tables with seated bots, for the tests that play rounds on a real Table."""
+from unittest.mock import Mock
+
+from game.player import Player
+from game.table import Table
+
+
+def seated_table(num_seats=3, seed=5, balance=1000, table_id='test', **options):
+    """A Table and the bots seated at it, named and identified bot0, bot1 and so on."""
+    table = Table(table_id, logger=Mock(), num_seats=num_seats, seed=seed, **options)
+    players = [Player(name=f'bot{seat}', id=f'bot{seat}', balance=balance) for seat in range(num_seats)]
+    for player in players:
+        table.game_manager.add_player(player)
+    return table, players
+
+
+def play_turns(table, action='s'):
+    """Play every hand still to act with action, an action code or a function of the hand returning one."""
+    while (hand := table.event_handler.current_player) is not None:
+        table.game_manager.handle_action(action(hand) if callable(action) else action, hand)
+
+
+def finish_round(table, players, action='s'):
+    """play_turns(), then publish the result of every player, which opens the next round."""
+    play_turns(table, action)
+    for player in players:
+        table.player_manager.publish_result(player)
@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+
+from game.batch import RunningStats, cross_check, deal_windows, play_windows, simulate
+from game.strategy import StrategyTable
+
+
+def play(strategy, *window):
+    net, overflow = play_windows(strategy, np.array([window], dtype=np.int16))
+    assert not overflow[0]
+    return net[0]
+
+
+class TestPlayWindows(unittest.TestCase):
+    def setUp(self):
+        self.strategy = StrategyTable.basic_strategy()
+
+    def test_blackjack_pushes_against_a_three_card_21(self):
+        # Player A K, dealer 7 4 draws a ten.
+        self.assertEqual(play(self.strategy, 101, 107, 113, 104, 110), 0)
+
+    def test_three_card_21_pushes_against_a_dealer_blackjack(self):
+        # Player 5 6 hits 11 against an ace and draws a ten, dealer A K.
+        self.assertEqual(play(self.strategy, 105, 101, 106, 113, 110), 0)
+
+    def test_blackjack_pays_three_to_two(self):
+        self.assertEqual(play(self.strategy, 101, 107, 113, 110), 1.5)
+
+    def test_split_hands_get_the_bonus_of_the_seat_hand(self):
+        # A A against a 6: the seat's hand draws a king, the split hand a nine, the dealer 16 draws a 2.
+        self.assertEqual(play(self.strategy, 101, 106, 101, 110, 113, 109, 102), 3.0)
+
+    def test_insurance_against_a_dealer_blackjack(self):
+        insuring = StrategyTable.basic_strategy(take_insurance=True)
+        self.assertEqual(play(insuring, 110, 101, 109, 113), 0)
+        self.assertEqual(play(self.strategy, 110, 101, 109, 113), -1)
+
+    def test_double_down(self):
+        # 6 5 against a 6 doubles and draws a 9, dealer 16 draws a ten.
+        self.assertEqual(play(self.strategy, 106, 106, 105, 110, 109, 110), 2)
+
+    def test_overflow_is_reported(self):
+        always_hit = StrategyTable.from_dict({})
+        net, overflow = play_windows(always_hit, np.array([[102, 110, 102, 107, 102]], dtype=np.int16))
+        self.assertTrue(overflow[0])
+
+
+class TestSimulate(unittest.TestCase):
+    def test_matches_the_scalar_engine(self):
+        self.assertEqual(cross_check(StrategyTable.basic_strategy(), rounds=300, seed=1), [])
+        self.assertEqual(cross_check(StrategyTable.basic_strategy(take_insurance=True), rounds=300, seed=2), [])
+
+    def test_matches_the_scalar_engine_for_an_unusual_strategy(self):
+        rng = np.random.default_rng(3)
+        data = {'hard': {str(total): ''.join(rng.choice(list('HSDd'), 10)) for total in range(4, 22)},
+                'soft': {str(total): ''.join(rng.choice(list('HSDd'), 10)) for total in range(12, 22)},
+                'pairs': {str(value): ''.join(rng.choice(list('P-'), 10)) for value in range(1, 11)}}
+        self.assertEqual(cross_check(StrategyTable.from_dict(data), rounds=300, seed=3), [])
+
+    def test_simulate_is_reproducible(self):
+        first = simulate(StrategyTable.basic_strategy(), 20000, seed=4, batch_size=7000)
+        second = simulate(StrategyTable.basic_strategy(), 20000, seed=4, batch_size=7000)
+        self.assertEqual(first, second)
+        self.assertEqual(first['rounds'], 20000)
+        self.assertLess(first['ci'][0], first['ev'])
+        self.assertLess(first['ev'], first['ci'][1])
+
+    def test_deal_windows(self):
+        windows = deal_windows(25, np.random.default_rng(0), num_decks=8)
+        self.assertEqual(windows.shape, (25, 48))
+        # The first 8 windows come from one shoe, so no card appears more often than in 8 decks.
+        self.assertLessEqual(np.unique(windows[:8], return_counts=True)[1].max(), 8)
+
+
+class TestRunningStats(unittest.TestCase):
+    def test_merge_matches_numpy(self):
+        values = np.random.default_rng(0).normal(size=1001)
+        stats = RunningStats()
+        for chunk in np.array_split(values, 7):
+            stats.update(chunk)
+
+        self.assertEqual(stats.count, 1001)
+        self.assertAlmostEqual(stats.mean, values.mean())
+        self.assertAlmostEqual(stats.variance(), values.var(ddof=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
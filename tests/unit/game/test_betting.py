@@ -0,0 +1,35 @@
+import unittest
+
+from game.betting import BetRule
+
+
+class TestBetRule(unittest.TestCase):
+    def test_flat_bet(self):
+        rule = BetRule(10)
+        self.assertEqual(rule.bet(-3.0), 10)
+        self.assertEqual(rule.bet(4.5), 10)
+
+    def test_ramp(self):
+        rule = BetRule(5, {'2': 20, 1: 10, 4.5: 50})
+        self.assertEqual(rule.ramp, [(1.0, 10), (2.0, 20), (4.5, 50)])
+        self.assertEqual(rule.bet(-1.0), 5)
+        self.assertEqual(rule.bet(1.0), 10)
+        self.assertEqual(rule.bet(3.9), 20)
+        self.assertEqual(rule.bet(7.0), 50)
+
+    def test_amounts_are_at_least_one(self):
+        with self.assertRaises(ValueError):
+            BetRule(0)
+        with self.assertRaises(ValueError):
+            BetRule(10, {2: 0})
+        with self.assertRaises(ValueError):
+            BetRule('ten')
+
+    def test_dict_round_trip(self):
+        rule = BetRule(5, {1: 10, 3: 40})
+        self.assertEqual(BetRule.from_dict(rule.to_dict()).ramp, rule.ramp)
+        self.assertEqual(BetRule.from_dict({'amount': 7}).bet(10.0), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@ import sys
 import os
 import random
 
-from game.deck import Deck
+from game.deck import Deck, ContinuousShuffleDeck, spawn_seeds
 
 
 class TestDeck(unittest.TestCase):
@@ -39,12 +39,134 @@ class TestDeck(unittest.TestCase):
         self.deck.deal_card()
         self.assertEqual(len(self.deck.cards), initial_len - 1)
 
+    def test_deal_card_reads_from_the_end_of_the_shoe(self):
+        self.deck.cards = [110, 102, 101, 103]
+        self.assertEqual(self.deck.deal_card(), 103)
+        self.assertEqual(self.deck.deal_card(), 101)
+        self.assertEqual(self.deck.cards, [110, 102])
+        self.assertEqual(self.deck.cards_left(), 2)
+
+    def test_deal_card_returns_python_int(self):
+        self.deck.shuffle()
+        self.assertIs(type(self.deck.deal_card()), int)
+
+    def test_shuffle_restores_full_shoe(self):
+        self.deck.shuffle()
+        for _ in range(100):
+            self.deck.deal_card()
+        self.deck.shuffle()
+        self.assertEqual(self.deck.cards_left(), 52 * 6)
+        self.assertEqual(sorted(self.deck.cards), sorted(self.deck._create_deck()))
+
+    def test_need_shuffle_after_plastic_card(self):
+        self.deck.shuffle()
+        self.deck.plastic_card_pos = 100
+        for _ in range(100):
+            self.deck.deal_card()
+        self.assertFalse(self.deck.need_shuffle())
+        self.deck.deal_card()
+        self.assertTrue(self.deck.need_shuffle())
+        self.deck.shuffle_if_needed()
+        self.assertEqual(self.deck.cards_left(), 52 * 6)
+
     def test_random_plastic_card_index(self):
         index = self.deck.random_plastic_card_index()
         half_length = self.deck.maximum_deck_size // 2
         full_length = self.deck.maximum_deck_size * 52
         self.assertTrue(half_length - half_length // 4 <= index <= half_length + half_length // 4)
 
+    def test_rank_counts_track_dealt_cards(self):
+        self.deck.shuffle()
+        self.assertEqual(self.deck.rank_counts, [24] * 13)
+        dealt = [self.deck.deal_card() for _ in range(40)]
+        for value in range(1, 14):
+            self.assertEqual(self.deck.rank_counts[value - 1], 24 - sum(1 for card in dealt if card % 100 == value))
+        self.assertEqual(sum(self.deck.rank_counts), self.deck.cards_left())
+
+    def test_running_count_uses_hi_lo(self):
+        self.deck.cards = [110, 108, 101, 103, 202]
+        self.assertEqual(self.deck.running_count, 0)
+        self.deck.deal_card()  # 2
+        self.deck.deal_card()  # 3
+        self.assertEqual(self.deck.running_count, 2)
+        self.deck.deal_card()  # Ace
+        self.deck.deal_card()  # 8
+        self.deck.deal_card()  # 10
+        self.assertEqual(self.deck.running_count, 0)
+        self.assertEqual(self.deck.rank_counts, [0] * 13)
+
+    def test_shuffle_resets_composition(self):
+        self.deck.shuffle()
+        for _ in range(30):
+            self.deck.deal_card()
+        self.deck.shuffle()
+        self.assertEqual(self.deck.rank_counts, [24] * 13)
+        self.assertEqual(self.deck.running_count, 0)
+        self.assertEqual(self.deck.true_count(), 0)
+
+
+class TestDeckSeeding(unittest.TestCase):
+    def deal_shoes(self, deck, shoes=3):
+        dealt = []
+        for _ in range(shoes):
+            deck.shuffle()
+            dealt.append((deck.plastic_card_pos, deck.cards))
+        return dealt
+
+    def test_same_seed_reproduces_shoes(self):
+        self.assertEqual(self.deal_shoes(Deck(8, seed=1234)), self.deal_shoes(Deck(8, seed=1234)))
+
+    def test_different_seeds_give_different_shoes(self):
+        self.assertNotEqual(self.deal_shoes(Deck(8, seed=1)), self.deal_shoes(Deck(8, seed=2)))
+
+    def test_shoe_pool_does_not_change_seeded_shoes(self):
+        pooled_deck = Deck(8, shoe_pool_depth=2, seed=99)
+        try:
+            self.assertEqual(self.deal_shoes(pooled_deck, shoes=5), self.deal_shoes(Deck(8, seed=99), shoes=5))
+        finally:
+            pooled_deck.close()
+
+    def test_spawned_seeds_are_independent_and_reproducible(self):
+        first, second = spawn_seeds(42, 2)
+        self.assertNotEqual(self.deal_shoes(Deck(8, seed=first)), self.deal_shoes(Deck(8, seed=second)))
+        self.assertEqual(self.deal_shoes(Deck(8, seed=first)), self.deal_shoes(Deck(8, seed=spawn_seeds(42, 2)[0])))
+
+
+class TestContinuousShuffleDeck(unittest.TestCase):
+    def setUp(self):
+        self.deck = ContinuousShuffleDeck(6, seed=5, return_threshold=20)
+        self.deck.shuffle()
+
+    def test_never_needs_a_shuffle(self):
+        for _ in range(52 * 6 - 1):
+            self.deck.deal_card()
+        self.assertFalse(self.deck.need_shuffle())
+
+    def test_deals_every_card_once_between_returns(self):
+        dealt = [self.deck.deal_card() for _ in range(52 * 6)]
+        self.assertEqual(sorted(dealt), sorted(self.deck._create_deck()))
+
+    def test_dealt_cards_return_at_threshold(self):
+        for _ in range(19):
+            self.deck.deal_card()
+        self.deck.shuffle_if_needed()
+        self.assertEqual(self.deck.cards_out(), 19)
+        self.deck.deal_card()
+        self.deck.shuffle_if_needed()
+        self.assertEqual(self.deck.cards_out(), 0)
+        self.assertEqual(self.deck.rank_counts, [24] * 13)
+        self.assertEqual(sorted(self.deck.cards), sorted(self.deck._create_deck()))
+
+    def test_composition_stays_exact(self):
+        dealt = [self.deck.deal_card() for _ in range(60)]
+        for value in range(1, 14):
+            self.assertEqual(self.deck.rank_counts[value - 1], 24 - sum(1 for card in dealt if card % 100 == value))
+
+    def test_same_seed_reproduces_draws(self):
+        other = ContinuousShuffleDeck(6, seed=5)
+        other.shuffle()
+        self.assertEqual([self.deck.deal_card() for _ in range(50)], [other.deal_card() for _ in range(50)])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+
+import numpy as np
+
+from game.env import ACTION_MASK, ACTIONS, OBSERVATION_SIZE, BlackjackEnv, BlackjackVectorEnv
+from game.observation import SEAT_FIELDS
+
+
+def first_allowed(action_mask, preferred='s'):
+    return preferred if action_mask[ACTIONS.index(preferred)] else ACTIONS[int(np.flatnonzero(action_mask)[0])]
+
+
+class TestBlackjackEnv(unittest.TestCase):
+    def test_reset_returns_the_first_decision(self):
+        env = BlackjackEnv(seed=1)
+        observation, info = env.reset()
+
+        self.assertEqual(observation.shape, (OBSERVATION_SIZE,))
+        self.assertEqual(observation.dtype, np.float32)
+        self.assertTrue(info['action_mask'][ACTIONS.index('s')])
+        offsets = env.observation.offsets
+        self.assertEqual(observation[offsets['seats']][0], env.player.score)
+        self.assertEqual(observation[offsets['dealer']][0], min(env.game_manager.dealer.cards[0] % 100, 10))
+        np.testing.assert_array_equal(observation, env.observation.view)
+        self.assertFalse(np.shares_memory(observation, env.observation.view))
+
+    def test_standing_ends_the_round_with_its_reward(self):
+        env = BlackjackEnv(bet=10, seed=2)
+        rewards = []
+        for _ in range(50):
+            env.reset()
+            observation, reward, terminated, truncated, info = env.step('s')
+            self.assertTrue(terminated)
+            self.assertFalse(truncated)
+            self.assertFalse(info['action_mask'].any())
+            rewards.append(reward)
+
+        self.assertEqual(sum(rewards) * 10, env.player.balance)
+        self.assertTrue(set(rewards) <= {-1.0, 0.0, 1.0, 1.5})
+        self.assertEqual(env.table.game_state_machine.get_state(), 'betting')
+
+    def test_actions_can_be_indexes(self):
+        env = BlackjackEnv(seed=3)
+        env.reset()
+        env.step(ACTIONS.index('s'))
+        self.assertEqual(env.game_manager.round_counter, 1)
+
+    def test_invalid_actions_raise(self):
+        env = BlackjackEnv(seed=4)
+        _, info = env.reset()
+        for action in ACTIONS:
+            if not info['action_mask'][ACTIONS.index(action)]:
+                with self.assertRaises(ValueError):
+                    env.step(action)
+                break
+        env.step('s')
+        with self.assertRaises(RuntimeError):
+            env.step('s')
+
+    def test_reset_mid_round_and_reseeding(self):
+        env = BlackjackEnv(seed=5)
+        first, _ = env.reset(seed=9)
+        env.reset()
+        self.assertEqual(env.game_manager.round_counter, 1)
+
+        again, _ = env.reset(seed=9)
+        np.testing.assert_array_equal(first, again)
+
+    def test_split_hands_are_played_in_turn(self):
+        env = BlackjackEnv(seed=6)
+        split_hands_seen = 0
+        for _ in range(400):
+            observation, info = env.reset()
+            terminated = False
+            while not terminated:
+                split_hands_seen += observation[SEAT_FIELDS.index('hands')] > 1
+                action = first_allowed(info['action_mask'], 'p' if info['action_mask'][3] else 's')
+                observation, reward, terminated, _, info = env.step(action)
+        self.assertGreater(split_hands_seen, 0)
+
+
+class TestBlackjackVectorEnv(unittest.TestCase):
+    def test_steps_all_tables_and_resets_finished_rounds(self):
+        envs = BlackjackVectorEnv(4, seed=1)
+        observations, info = envs.reset()
+        self.assertEqual(observations.shape, (4, OBSERVATION_SIZE))
+        self.assertEqual(info['action_mask'].shape, (4, len(ACTIONS)))
+
+        observations, rewards, terminated, truncated, info = envs.step(['s'] * 4)
+
+        self.assertTrue(terminated.all())
+        self.assertEqual(rewards.shape, (4,))
+        self.assertFalse(truncated.any())
+        # The returned observations already belong to the next round.
+        self.assertTrue(info['action_mask'][:, ACTIONS.index('s')].all())
+        self.assertFalse(info['final_observation'][:, ACTION_MASK].any())
+        for env in envs.envs:
+            self.assertEqual(env.game_manager.round_counter, 1)
+
+    def test_tables_are_seeded_independently_and_reproducibly(self):
+        first, _ = BlackjackVectorEnv(3, seed=7).reset()
+        second, _ = BlackjackVectorEnv(3, seed=7).reset()
+        np.testing.assert_array_equal(first, second)
+
+
+if __name__ == '__main__':
+    unittest.main()
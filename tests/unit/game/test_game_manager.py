@@ -1,8 +1,14 @@
+import inspect
 import unittest
 from unittest.mock import MagicMock, patch, call
+from game.betting import BetRule
 from game.game_manager import GameManager
+from game.player_manager import PlayerManager
+from game.player import Player
 from game.state import PlayerState
+from game.strategy import StrategyTable
 import game.utils
+from tests.table_helpers import finish_round, play_turns, seated_table
 
 
 class TestGameManagerDealCards(unittest.TestCase):
@@ -101,10 +107,16 @@ class TestGameManagerPlaceBet(unittest.TestCase):
         self.mock_player.bet = bet_amount  # Pretend the player has already placed a bet
         self.game_manager.player_manager.players = [self.mock_player]
         self.mock_player.skip_round.return_value = False
+        self.game_manager.player_manager.all_players_skipping.return_value = False
 
         self.assertTrue(self.game_manager.place_bet(player_id, bet_amount))
         self.event_bus.publish.assert_called_with('all_betting_done')
 
+    def test_no_event_until_last_bet(self):
+        self.game_manager.player_manager.bet_placed.return_value = False
+        self.assertTrue(self.game_manager.place_bet("player1", 100))
+        self.event_bus.publish.assert_not_called()
+
     def test_all_players_skipping_the_round(self):
         self.game_manager.all_player_skipping_the_round = MagicMock(return_value=True)
         player_id = "player1"
@@ -225,27 +237,65 @@ class TestGameManagerHandleAction(unittest.TestCase):
         self.player.take_insurance.assert_called_once()
 
 
+class TestGameManagerShoeComposition(unittest.TestCase):
+    def setUp(self):
+        self.game_manager = GameManager(num_decks=6, player_manager=MagicMock(), event_bus=MagicMock(),
+                                        logger=MagicMock())
+        self.game_manager.deck.cards = [110, 105]
+        self.game_manager.dealer.hit(self.game_manager.deck)
+        self.game_manager.dealer.hit(self.game_manager.deck)
+
+    def test_revealed_composition_matches_deck(self):
+        composition = self.game_manager.get_shoe_composition()
+        self.assertEqual(composition['cards_left'], 0)
+        self.assertEqual(composition['remaining'], [0] * 13)
+        self.assertEqual(composition['running_count'], 0)
+
+    def test_hidden_composition_does_not_count_hole_card(self):
+        composition = self.game_manager.get_shoe_composition(hidden_card=True)
+        self.assertEqual(composition['cards_left'], 1)
+        self.assertEqual(composition['remaining'][9], 1)
+        self.assertEqual(composition['running_count'], 1)
+
+
 class TestGameManagerAllPlayerSkipping(unittest.TestCase):
-    @patch('game.player_manager.PlayerManager')
-    @patch('game.player.Player')
-    def setUp(self, MockPlayer, MockPlayerManager):
-        self.player_manager = MockPlayerManager()
-        self.game_manager = GameManager(num_decks=1, player_manager=self.player_manager, event_bus=None, logger=None)
+    def setUp(self):
+        self.event_bus = MagicMock()
+        self.player_manager = PlayerManager(logger=MagicMock(), num_seats=3, event_bus=self.event_bus)
+        self.game_manager = GameManager(num_decks=1, player_manager=self.player_manager, event_bus=self.event_bus,
+                                        logger=MagicMock())
+        self.players = [Player(name=f'player{seat}', id=seat, balance=1000) for seat in range(3)]
+        for player in self.players:
+            self.game_manager.add_player(player)
+        self.event_bus.reset_mock()
 
     def test_all_players_skipping(self):
-        # Mock players to simulate all skipping the round
-        self.player_manager.players = [MagicMock(skip_round=MagicMock(return_value=True)) for _ in range(3)]
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 0)
 
         result = self.game_manager.all_player_skipping_the_round()
         self.assertTrue(result, "Expected True when all players are skipping the round")
+        self.event_bus.publish.assert_called_once_with('all_players_skipped')
 
     def test_not_all_players_skipping(self):
-        # Mock players where one is not skipping the round
-        self.player_manager.players = [MagicMock(skip_round=MagicMock(return_value=True)) for _ in range(2)]
-        self.player_manager.players.append(MagicMock(skip_round=MagicMock(return_value=False)))
+        self.game_manager.place_bet(0, 0)
+        self.game_manager.place_bet(1, 0)
+        self.game_manager.place_bet(2, 10)
 
         result = self.game_manager.all_player_skipping_the_round()
         self.assertFalse(result, "Expected False when at least one player is not skipping the round")
+        self.event_bus.publish.assert_called_once_with('all_betting_done')
+
+    def test_betting_done_fires_once_per_round(self):
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        self.game_manager.place_bet(0, 10)  # A late extra bet does not complete the round again
+        self.event_bus.publish.assert_called_once_with('all_betting_done')
+
+        self.player_manager.reset_players()
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        self.assertEqual(self.event_bus.publish.call_count, 2)
 
 
 class TestGameManagerDealerTurn(unittest.TestCase):
@@ -550,7 +600,8 @@ class TestGameManagerRestFunctions(unittest.TestCase):
         split_player = MagicMock()
         split_player.origin_player_id = 1
 
-        self.game_manager.player_manager.players = [original_player]
+        self.game_manager.player_manager = PlayerManager(logger=self.logger, num_seats=2, event_bus=self.event_bus)
+        self.game_manager.player_manager.add_player(original_player)
 
         # Execute
         found_player = self.game_manager.find_original_player(split_player)
@@ -609,6 +660,276 @@ class TestGameManagerRestFunctions(unittest.TestCase):
         # Verify get_seat_number was called correctly for the player
         self.game_manager.player_manager.get_seat_number.assert_called_with("player1")
 
+    def test_get_table_snapshot_is_cached_per_version(self):
+        self.game_manager.dealer.cards = [110, 207]
+        self.game_manager.player_manager.players = [self.player]
+        self.game_manager.player_manager.get_seat_number = MagicMock(return_value=0)
+        self.player.cards = [108, 209]
+        self.player.id = "player1"
+
+        table_state, table_json = self.game_manager.get_table_snapshot(hidden_card=True)
+        self.assertEqual(table_state, [900, 110, 888, 901, 108, 209])
+        self.assertEqual(table_json, '[900,110,888,901,108,209]')
+        self.assertEqual(self.game_manager.get_table_snapshot(hidden_card=False)[1], '[900,110,207,901,108,209]')
+
+        # Every reader of the same version shares one encoding.
+        self.game_manager.player_manager.get_seat_number.reset_mock()
+        self.assertIs(self.game_manager.get_table_snapshot(hidden_card=True)[0], table_state)
+        self.game_manager.player_manager.get_seat_number.assert_not_called()
+
+        self.player.cards = [108, 209, 303]
+        self.game_manager.handle_action('h', self.player)
+        self.assertEqual(self.game_manager.get_table_snapshot(hidden_card=True)[1], '[900,110,888,901,108,209,303]')
+
+    def test_table_version_bumps_on_changes(self):
+        version = self.game_manager.table_version
+        self.game_manager.player_manager.players = []
+        self.game_manager.add_player(self.player)
+        self.game_manager.deal_initial_cards()
+        self.game_manager.dealer.score = 17
+        self.game_manager.dealer_turn()
+        self.game_manager.determine_winners()
+        self.game_manager.cleanup_after_round()
+        self.assertEqual(self.game_manager.table_version, version + 5)
+
+
+class TestGameManagerRemovePlayer(unittest.TestCase):
+    def setUp(self):
+        self.table, self.players = seated_table(num_seats=2)
+        self.game_manager = self.table.game_manager
+
+    def tearDown(self):
+        self.table.close()
+
+    def test_current_hand_stands_and_the_turn_moves_on(self):
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        self.assertEqual(self.table.event_handler.current_player.id, 'bot0')
+        version = self.game_manager.table_version
+
+        self.assertTrue(self.game_manager.remove_player('bot0'))
+        self.assertFalse(self.game_manager.remove_player('bot0'))
+        self.assertGreater(self.game_manager.table_version, version)
+        self.assertEqual(self.table.event_handler.current_player.id, 'bot1')
+        self.assertEqual(self.game_manager.get_table_state_array()[-3], 902)
+
+    def test_last_result_missing(self):
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        play_turns(self.table)
+        self.table.player_manager.publish_result(self.players[1])
+
+        self.game_manager.remove_player('bot0')
+        # The round ended without bot0's result and the next one is open for bets.
+        self.assertEqual(self.table.game_state_machine.get_state(), 'betting')
+        self.assertEqual(self.players[1].state, PlayerState.WAIT_FOR_BET)
+
+    def test_seat_freed_during_betting_is_taken_again(self):
+        self.game_manager.remove_player('bot0')
+        carol = Player(name='carol', id='carol', balance=1000)
+        self.assertTrue(self.game_manager.add_player(carol))
+        # The round being bet is not started again, carol bets in it.
+        self.assertEqual(self.table.game_state_machine.get_state(), 'betting')
+        self.game_manager.place_bet('bot1', 10)
+        self.assertEqual(self.table.game_state_machine.get_state(), 'betting')
+        self.game_manager.place_bet('carol', 10)
+        self.assertEqual(self.table.game_state_machine.get_state(), 'player_turn')
+
+    def test_seat_freed_during_the_round_is_taken_for_the_next_one(self):
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        self.game_manager.remove_player('bot0')
+        carol = Player(name='carol', id='carol', balance=1000)
+        self.assertTrue(self.game_manager.add_player(carol))
+        self.assertEqual(self.table.game_state_machine.get_state(), 'player_turn')
+        self.assertEqual(carol.state, PlayerState.WAIT_FOR_BET)
+
+        # The round ends with bot1's result alone, carol has none to wait for.
+        finish_round(self.table, [carol, self.players[1]])
+        self.assertEqual(self.table.game_state_machine.get_state(), 'betting')
+        self.assertEqual(self.table.player_manager.pending_bets, 2)
+        self.game_manager.place_bet('bot1', 10)
+        self.game_manager.place_bet('carol', 10)
+        self.assertEqual(self.table.game_state_machine.get_state(), 'player_turn')
+        self.assertEqual(len(carol.cards), 2)
+
+    def test_leaving_the_next_round_seat_keeps_the_round_going(self):
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        self.game_manager.remove_player('bot0')
+        self.game_manager.add_player(Player(name='carol', id='carol', balance=1000))
+        self.game_manager.remove_player('carol')
+        self.assertEqual(self.table.game_state_machine.get_state(), 'player_turn')
+        finish_round(self.table, [self.players[1]])
+        self.assertEqual(self.table.game_state_machine.get_state(), 'betting')
+
+    def test_empty_table_waits_for_players_again(self):
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        for player in self.players:
+            self.game_manager.remove_player(player.id)
+        self.assertEqual(self.table.game_state_machine.get_state(), 'waiting_for_players')
+        self.assertEqual(self.game_manager.dealer.cards, [])
+
+        newcomers = [Player(name=f'new{seat}', id=f'new{seat}', balance=1000) for seat in range(2)]
+        self.game_manager.add_player(newcomers[0])
+        self.assertEqual(self.table.game_state_machine.get_state(), 'waiting_for_players')
+        self.game_manager.add_player(newcomers[1])
+        self.assertEqual(self.table.game_state_machine.get_state(), 'betting')
+        for player in newcomers:
+            self.game_manager.place_bet(player.id, 10)
+        finish_round(self.table, newcomers)
+        self.assertEqual(self.table.game_state_machine.get_state(), 'betting')
+
+
+class TestGameManagerAutopilot(unittest.TestCase):
+    def setUp(self):
+        self.strategy = StrategyTable.basic_strategy()
+        self.table, self.players = seated_table()
+        self.game_manager = self.table.game_manager
+
+    def tearDown(self):
+        self.table.close()
+
+    def test_autopilot_plays_every_hand(self):
+        for player in self.players:
+            self.game_manager.set_autopilot(player.id, self.strategy)
+        reference, reference_players = seated_table(table_id='reference')
+
+        def basic_strategy(hand):
+            return self.strategy.action(hand, reference.game_manager.dealer.cards[0], hand.available_actions)
+
+        for _ in range(50):
+            for player, reference_player in zip(self.players, reference_players):
+                self.game_manager.place_bet(player.id, 10)
+                reference.game_manager.place_bet(reference_player.id, 10)
+            # The last bet played the whole round, so no hand waits for its client.
+            self.assertIsNone(self.table.event_handler.current_player)
+            self.assertEqual(self.table.game_state_machine.get_state(), 'publish_result')
+
+            finish_round(self.table, self.players)
+            finish_round(reference, reference_players, basic_strategy)
+
+        self.assertEqual([player.balance for player in self.players],
+                         [player.balance for player in reference_players])
+        reference.close()
+
+    def test_autopilot_for_some_seats(self):
+        self.game_manager.set_autopilot('bot1', self.strategy)
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        acted = set()
+
+        def stand(hand):
+            acted.add(hand.id)
+            return 's'
+
+        play_turns(self.table, stand)
+        self.assertNotIn('bot1', acted)
+        self.assertEqual(self.table.game_state_machine.get_state(), 'publish_result')
+
+    def test_autopilot_stack_depth_on_a_sync_bus(self):
+        table, players = seated_table(num_seats=7, bus_mode='sync')
+        depths = []
+
+        class RecordingStrategy:
+            def action(inner, hand, up_card, available_actions):
+                depths.append(len(inspect.stack(0)))
+                return self.strategy.action(hand, up_card, available_actions)
+
+        for player in players:
+            table.game_manager.set_autopilot(player.id, RecordingStrategy())
+        for player in players:
+            table.game_manager.place_bet(player.id, 10)
+        table.close()
+
+        # Every action is decided at the same depth instead of one level further down than the last.
+        self.assertGreaterEqual(len(depths), 7)
+        self.assertEqual(len(set(depths)), 1)
+
+    def test_autopilot_off(self):
+        self.game_manager.set_autopilot('bot0', self.strategy)
+        self.game_manager.set_autopilot('bot0', None)
+        self.game_manager.set_autopilot('bot2', None)
+        self.assertEqual(self.game_manager.autopilots, {})
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        self.assertEqual(self.table.event_handler.current_player.id, 'bot0')
+
+
+class TestGameManagerStandingBets(unittest.TestCase):
+    def setUp(self):
+        self.table, self.players = seated_table()
+        self.game_manager = self.table.game_manager
+
+    def tearDown(self):
+        self.table.close()
+
+    def test_bets_placed_when_the_next_round_opens(self):
+        self.game_manager.set_standing_bet('bot1', BetRule(25))
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        finish_round(self.table, self.players)
+
+        self.assertEqual(self.table.game_state_machine.get_state(), 'betting')
+        self.assertEqual(self.players[1].state, PlayerState.AWAITING_MY_TURN)
+        self.assertEqual(self.players[1].initial_bet, 25)
+        self.assertEqual(self.players[0].state, PlayerState.WAIT_FOR_BET)
+
+    def test_override_applies_to_one_round(self):
+        self.game_manager.set_standing_bet('bot0', BetRule(10))
+        self.game_manager.override_bet('bot0', 40)
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        finish_round(self.table, self.players)
+        self.assertEqual(self.players[0].initial_bet, 40)
+
+        for player in self.players[1:]:
+            self.game_manager.place_bet(player.id, 10)
+        finish_round(self.table, self.players)
+        self.assertEqual(self.players[0].initial_bet, 10)
+
+    def test_override_amounts(self):
+        self.game_manager.set_standing_bet('bot0', BetRule(10))
+        with self.assertRaises(ValueError):
+            self.game_manager.override_bet('bot0', -5)
+        self.assertEqual(self.game_manager.bet_overrides, {})
+        self.game_manager.override_bet('bot0', '0')
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        finish_round(self.table, self.players)
+        self.assertEqual(self.players[0].state, PlayerState.SKIPPED_ROUND)
+
+    def test_ramp_follows_the_true_count(self):
+        self.game_manager.set_standing_bet('bot0', BetRule(10, {0.5: 50}))
+        with patch.object(self.game_manager.deck, 'true_count', return_value=2.0):
+            for player in self.players:
+                self.game_manager.place_bet(player.id, 10)
+            finish_round(self.table, self.players)
+        self.assertEqual(self.players[0].initial_bet, 50)
+
+    def test_standing_bets_and_autopilot_play_without_clients(self):
+        strategy = StrategyTable.basic_strategy()
+        for player in self.players:
+            self.game_manager.set_standing_bet(player.id, BetRule(10))
+            self.game_manager.set_autopilot(player.id, strategy)
+            self.game_manager.place_bet(player.id, 10)
+        for _ in range(20):
+            # The round was bet and played on the server, only the results are left to the clients.
+            self.assertEqual(self.table.game_state_machine.get_state(), 'publish_result')
+            finish_round(self.table, self.players)
+        self.assertNotEqual([player.balance for player in self.players], [1000] * 3)
+
+    def test_standing_bet_off(self):
+        self.game_manager.set_standing_bet('bot0', BetRule(10))
+        self.game_manager.override_bet('bot0', 20)
+        self.game_manager.set_standing_bet('bot0', None)
+        self.assertEqual((self.game_manager.standing_bets, self.game_manager.bet_overrides), ({}, {}))
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        finish_round(self.table, self.players)
+        self.assertEqual(self.players[0].state, PlayerState.WAIT_FOR_BET)
+
 
 if __name__ == '__main__':
     unittest.main()
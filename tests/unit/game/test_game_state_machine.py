@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import MagicMock
 from game.game_state_machine import GameStateMachine
+from utils.event_bus import EventBus
+from utils.fsm import MachineError
 
 
 @pytest.fixture
@@ -64,3 +66,34 @@ def test_cleanup_done_transition_resets_to_betting(setup_game_state_machine):
 
     state_machine.cleanup_done()
     assert state_machine.state == 'betting'
+
+
+def test_invalid_transition_raises_machine_error(setup_game_state_machine):
+    state_machine, _, _ = setup_game_state_machine
+
+    with pytest.raises(MachineError):
+        state_machine.dealer_turn_done()
+    assert state_machine.state == 'waiting_for_players'
+
+
+def test_full_round_through_the_event_bus():
+    event_bus = EventBus()
+    state_machine = GameStateMachine(event_bus, MagicMock())
+
+    visited = []
+    for event in ['ready_to_bet', 'all_betting_done', 'cards_dealing_done', 'player_action_done',
+                  'all_players_acted', 'dealer_turn_done', 'determine_winners_done', 'publish_results_done',
+                  'cleanup_done', 'all_players_skipped']:
+        event_bus.publish(event)
+        visited.append(state_machine.get_state())
+
+    assert visited == ['betting', 'dealing_initial_cards', 'player_turn', 'player_turn', 'dealer_turn',
+                       'determine_winners', 'publish_result', 'round_end', 'betting', 'round_end']
+
+
+def test_all_players_left_from_any_state(setup_game_state_machine):
+    state_machine, _, _ = setup_game_state_machine
+    for state in GameStateMachine.states:
+        state_machine.state = state
+        state_machine.all_players_left()
+        assert state_machine.state == 'waiting_for_players'
@@ -0,0 +1,64 @@
+import unittest
+
+from game.headless import HeadlessRunner
+
+
+def hit_below_17(hand, dealer_up_card, available_actions):
+    return 'h' if hand.score < 17 and 'h' in available_actions else 's'
+
+
+class TestHeadlessRunner(unittest.TestCase):
+    def test_plays_rounds_through_the_game_flow(self):
+        runner = HeadlessRunner(policy=hit_below_17, num_seats=2, seed=7)
+
+        stats = runner.play(200)
+
+        self.assertEqual(stats['rounds'], 200)
+        self.assertEqual(runner.game_manager.round_counter, 200)
+        self.assertEqual(runner.table.game_state_machine.get_state(), 'betting')
+        # Money only moves between the seats and the dealer.
+        self.assertEqual(sum(stats['net']) + runner.game_manager.dealer.balance, 0)
+        self.assertEqual([player.balance for player in runner.players], [1000 + net for net in stats['net']])
+
+    def test_same_seed_same_results(self):
+        first = HeadlessRunner(policy=hit_below_17, seed=3).play(100)
+        second = HeadlessRunner(policy=hit_below_17, seed=3).play(100)
+        self.assertEqual(first['net'], second['net'])
+
+    def test_queued_and_sync_dispatch_agree(self):
+        sync = HeadlessRunner(policy=hit_below_17, num_seats=3, seed=5, bus_mode='sync').play(100)
+        queued = HeadlessRunner(policy=hit_below_17, num_seats=3, seed=5, bus_mode='queued').play(100)
+        self.assertEqual(sync['net'], queued['net'])
+
+    def test_policy_sees_split_hands(self):
+        seen = set()
+
+        def always_split(hand, dealer_up_card, available_actions):
+            seen.add(hand.name)
+            if 'p' in available_actions:
+                return 'p'
+            return hit_below_17(hand, dealer_up_card, available_actions)
+
+        runner = HeadlessRunner(policy=always_split, seed=11)
+        runner.play(300)
+
+        self.assertIn('bot0 (Split)', seen)
+        self.assertEqual(len(runner.player_manager.players), 1)
+
+    def test_invalid_action_raises(self):
+        runner = HeadlessRunner(policy=lambda hand, dealer_up_card, available_actions: 'x', seed=1)
+        with self.assertRaises(ValueError):
+            runner.play_round()
+
+    def test_bet_policy_can_skip_rounds(self):
+        bets = iter([0, 10, 0])
+        runner = HeadlessRunner(policy=hit_below_17, seed=1, bet_policy=lambda player, game_manager: next(bets))
+
+        self.assertEqual(runner.play_round(), [0])
+        runner.play_round()
+        self.assertEqual(runner.play_round(), [0])
+        self.assertEqual(runner.table.game_state_machine.get_state(), 'betting')
+
+
+if __name__ == '__main__':
+    unittest.main()
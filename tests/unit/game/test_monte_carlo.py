@@ -0,0 +1,40 @@
+import unittest
+
+from game.monte_carlo import run_monte_carlo
+from game.strategy import StrategyTable
+
+
+class TestRunMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        self.strategy = StrategyTable.basic_strategy()
+
+    def test_same_seed_same_result_for_any_worker_count(self):
+        single = run_monte_carlo(self.strategy, 30000, workers=1, seed=5, chunk_rounds=4000)
+        pooled = run_monte_carlo(self.strategy, 30000, workers=2, seed=5, chunk_rounds=4000)
+
+        for key in ('rounds', 'ev', 'variance', 'ci', 'chunks'):
+            self.assertEqual(single[key], pooled[key], key)
+        self.assertEqual(single['rounds'] + single['overflow'], 30000)
+        self.assertEqual(single['chunks'], 8)
+        self.assertEqual(sum(worker['rounds'] for worker in pooled['workers'].values()), 30000)
+
+    def test_different_seeds_differ(self):
+        first = run_monte_carlo(self.strategy, 5000, workers=1, seed=1, chunk_rounds=1000)
+        second = run_monte_carlo(self.strategy, 5000, workers=1, seed=2, chunk_rounds=1000)
+        self.assertNotEqual(first['ev'], second['ev'])
+
+    def test_stops_once_the_confidence_interval_is_narrow_enough(self):
+        result = run_monte_carlo(self.strategy, 1000000, workers=1, seed=3, chunk_rounds=5000, target_ci_width=0.05)
+
+        self.assertTrue(result['stopped_early'])
+        self.assertLess(result['rounds'], 1000000)
+        low, high = result['ci']
+        self.assertLessEqual(high - low, 0.05)
+        # The stopping point is the same prefix of chunks with a pool.
+        pooled = run_monte_carlo(self.strategy, 1000000, workers=2, seed=3, chunk_rounds=5000, target_ci_width=0.05)
+        self.assertEqual(pooled['chunks'], result['chunks'])
+        self.assertEqual(pooled['ev'], result['ev'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+
+from game.observation import ACTIONS, SEAT_FIELDS, TableObservation
+from game.table import Table
+from tests.table_helpers import finish_round, seated_table
+
+
+class TestTableObservation(unittest.TestCase):
+    def setUp(self):
+        self.table, self.players = seated_table(num_seats=2, seed=3, balance=100, observation=True)
+        self.game_manager = self.table.game_manager
+        self.observation = self.game_manager.observation
+
+    def tearDown(self):
+        self.table.close()
+
+    def test_layout_and_read_only_view(self):
+        observation = TableObservation(num_seats=3)
+        self.assertEqual(observation.size, 3 * len(SEAT_FIELDS) + 3 + 13 + 2 + 1 + len(ACTIONS))
+        self.assertFalse(observation.view.flags.writeable)
+        self.assertTrue(np.shares_memory(observation.view, observation.seats))
+        with self.assertRaises(ValueError):
+            observation.view[0] = 1
+
+    def test_buffer_follows_the_deal(self):
+        view = self.observation.view
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+
+        for seat, player in enumerate(self.players):
+            self.assertEqual(self.observation.seats[seat, 0], player.score)
+            self.assertEqual(self.observation.seats[seat, 3], 2)
+        dealer = self.game_manager.dealer
+        self.assertEqual(self.observation.dealer[0], min(dealer.cards[0] % 100, 10))
+        self.assertEqual(self.observation.dealer[2], 0)
+        hidden = self.game_manager.get_shoe_composition(hidden_card=True)
+        self.assertEqual(self.observation.rank_counts.tolist(), hidden['remaining'])
+        self.assertEqual(self.observation.shoe.tolist(), [hidden['cards_left'], hidden['running_count']])
+
+        current = self.table.event_handler.current_player
+        self.assertEqual(self.observation.turn[0], self.game_manager.player_manager.get_seat_number(current.id))
+        self.assertEqual([action for action, flag in zip(ACTIONS, self.observation.action_mask) if flag],
+                         current.available_actions)
+        # The view read before the deal sees the update without being fetched again.
+        self.assertTrue(np.shares_memory(view, self.observation.rank_counts))
+        self.assertEqual(view[self.observation.offsets['turn']][0], self.observation.turn[0])
+
+    def test_buffer_follows_actions_and_the_dealer(self):
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        event_handler = self.table.event_handler
+        while (hand := event_handler.current_player) is not None:
+            action = 'h' if hand.score < 12 and 'h' in hand.available_actions else 's'
+            seat = self.game_manager.player_manager.get_seat_number(hand.id)
+            self.game_manager.handle_action(action, hand)
+            if hand.owner.split_hands == [] and hand.state != hand.state.MY_TURN:
+                self.assertEqual(self.observation.seats[seat, 0], hand.score)
+
+        dealer = self.game_manager.dealer
+        self.assertEqual(self.observation.dealer.tolist(), [min(dealer.cards[0] % 100, 10), dealer.score, 1])
+        self.assertEqual(self.observation.turn[0], -1)
+        self.assertFalse(self.observation.action_mask.any())
+        self.assertEqual(self.observation.rank_counts.tolist(), self.game_manager.deck.rank_counts)
+
+    def test_buffer_is_cleared_between_rounds(self):
+        for player in self.players:
+            self.game_manager.place_bet(player.id, 10)
+        finish_round(self.table, self.players)
+
+        self.assertFalse(self.observation.seats.any())
+        self.assertFalse(self.observation.dealer.any())
+        self.assertEqual(self.observation.rank_counts.tolist(), self.game_manager.deck.rank_counts)
+
+    def test_disabled_by_default(self):
+        table = Table('t2', logger=Mock(), seed=1)
+        self.assertIsNone(table.game_manager.observation)
+        self.assertIs(table.game_manager.enable_observation(), table.game_manager.enable_observation())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,7 @@ import unittest
 from unittest.mock import MagicMock, Mock
 
 # Import the Player class from game package
-from game.player import Player
+from game.player import Player, SplitHand
 from game.state import PlayerState
 
 
@@ -83,6 +83,35 @@ class TestPlayer(unittest.TestCase):
         self.player.calculate_score()
         self.assertEqual(self.player.score, 22)
 
+    def test_score_updates_as_cards_are_added(self):
+        self.player.add_card(101)
+        self.assertEqual(self.player.score, 11)
+        self.assertTrue(self.player.is_soft())
+        self.player.add_card(106)
+        self.assertEqual(self.player.score, 17)
+        self.assertTrue(self.player.is_soft())
+        self.player.add_card(110)
+        self.assertEqual(self.player.score, 17)
+        self.assertFalse(self.player.is_soft())
+        self.player.add_card(101)
+        self.assertEqual(self.player.score, 18)
+        self.assertEqual(self.player.hard_total, 18)
+        self.assertEqual(self.player.ace_count, 2)
+
+    def test_remove_last_card_updates_score(self):
+        self.player.cards = [101, 101]
+        self.assertEqual(self.player.score, 12)
+        self.assertEqual(self.player.remove_last_card(), 101)
+        self.assertEqual(self.player.score, 11)
+        self.assertEqual(self.player.cards, [101])
+
+    def test_has_blackjack(self):
+        self.player.add_card(101)
+        self.player.add_card(113)
+        self.assertTrue(self.player.has_blackjack())
+        self.player.add_card(110)
+        self.assertFalse(self.player.has_blackjack())
+
     def test_display_hand(self):
         self.player.cards = [201]
         self.assertEqual(self.player.display_hand(), f"{self.player.name}'s hand: ♥A")
@@ -127,6 +156,31 @@ class TestPlayer(unittest.TestCase):
         self.assertEqual(self.player.bet, 20)
         self.assertEqual(split_player.bet, 20)
 
+    def test_split_hand_is_lightweight(self):
+        self.mock_deck.deal_card.side_effect = [103, 104]
+        self.player.name = 'Alice'
+        self.player.id = 'alice'
+        self.player.cards = [102, 102]
+        self.player.initial_bet = 20
+        split_hand = self.player.split(self.mock_deck)
+
+        self.assertIsInstance(split_hand, SplitHand)
+        self.assertFalse(hasattr(split_hand, '__dict__'))
+        self.assertIs(split_hand.owner, self.player)
+        self.assertEqual(split_hand.name, 'Alice (Split)')
+        self.assertEqual(split_hand.id, 'alice')
+        self.assertEqual(split_hand.origin_player_id, 'alice')
+        self.assertEqual(split_hand.state, PlayerState.AWAITING_MY_TURN)
+
+    def test_split_of_split_hand_belongs_to_seat(self):
+        self.mock_deck.deal_card.side_effect = [103, 104, 103, 105]
+        self.player.cards = [103, 103]
+        self.player.initial_bet = 20
+        split_hand = self.player.split(self.mock_deck)
+        second_split_hand = split_hand.split(self.mock_deck)
+        self.assertIs(second_split_hand.owner, self.player)
+        self.assertEqual(split_hand.balance, -20)
+
     def test_stand(self):
         self.player.stand()
         self.assertEqual(self.player.state, PlayerState.HAS_ACTED)
@@ -19,6 +19,45 @@ class TestPlayerManager(unittest.TestCase):
         self.assertFalse(self.manager.player_exists(player.id))
         self.assertEqual(removed, True)
 
+    def test_remove_player_frees_seat_and_indexes(self):
+        player1 = Mock()
+        player1.id = "1"
+        player2 = Mock()
+        player2.id = "2"
+        self.manager.add_player(player1)
+        self.manager.add_player(player2)
+        self.manager.remove_player(player1.id)
+        self.assertIsNone(self.manager.get_player_via_id(player1.id))
+        self.assertIsNone(self.manager.get_player_via_seat(0))
+        self.assertIsNone(self.manager.get_seat_number(player1.id))
+        self.assertEqual(self.manager.available_seats, [0])
+
+        player3 = Mock()
+        player3.id = "3"
+        self.manager.add_player(player3)
+        self.assertIs(self.manager.get_player_via_seat(0), player3)
+        self.assertEqual(self.manager.get_seat_number(player3.id), 0)
+        self.assertIs(self.manager.get_player_via_seat(1), player2)
+
+    def test_indexes_ignore_split_hands(self):
+        original_player = Mock()
+        original_player.id = "original1"
+        original_player.origin_player_id = None
+        original_player.balance = 100
+        original_player.split_hands = []
+        original_player.owner = original_player
+        self.manager.add_player(original_player)
+        split_hand = Mock(id="original1", origin_player_id="original1", owner=original_player, balance=-20)
+        self.manager.insert_split_player(original_player, split_hand)
+
+        self.assertIs(self.manager.get_player_via_id("original1"), original_player)
+        self.assertEqual(self.manager.get_available_seats(), 1)
+        self.manager.remove_split_player()
+        self.assertEqual(self.manager.players, [original_player])
+        self.assertEqual(original_player.balance, 80)
+        self.assertEqual(original_player.split_hands, [])
+        self.assertIs(self.manager.get_player_via_seat(0), original_player)
+
     def test_set_player_event(self):
         player = Mock()
         player.id = "0"
@@ -117,6 +156,50 @@ class TestPlayerManager(unittest.TestCase):
         current_turn_player = self.manager.get_current_turn_player()
         self.assertEqual(current_turn_player, None)
 
+    def test_turn_queue_advances_in_seat_order(self):
+        player1 = Mock(id="player1", state=PlayerState.AWAITING_MY_TURN)
+        player1.name = "Player1"
+        player2 = Mock(id="player2", state=PlayerState.AWAITING_MY_TURN)
+        player2.name = "Player2"
+        self.manager.add_player(player1)
+        self.manager.add_player(player2)
+        self.manager.build_turn_queue()
+
+        self.assertIs(self.manager.get_current_turn_player(), player1)
+        self.assertIs(self.manager.get_current_turn_player(), player1)  # Still acting
+        player1.state = PlayerState.HAS_ACTED
+        self.assertIs(self.manager.get_current_turn_player(), player2)
+        self.assertEqual(self.manager.get_turn_order(), ["Player2"])
+        player2.state = PlayerState.HAS_ACTED
+        self.assertIsNone(self.manager.get_current_turn_player())
+        self.assertEqual(self.manager.get_turn_order(), [])
+
+    def test_split_hand_acts_right_after_its_origin(self):
+        player1 = Mock(id="player1", state=PlayerState.AWAITING_MY_TURN, split_hands=[])
+        player1.name = "Player1"
+        player1.owner = player1
+        player2 = Mock(id="player2", state=PlayerState.AWAITING_MY_TURN)
+        player2.name = "Player2"
+        self.manager.add_player(player1)
+        self.manager.add_player(player2)
+        self.manager.build_turn_queue()
+        self.assertIs(self.manager.get_current_turn_player(), player1)
+
+        split_hand = Mock(id="player1", state=PlayerState.AWAITING_MY_TURN, owner=player1)
+        split_hand.name = "Player1 (Split)"
+        self.manager.insert_split_player(player1, split_hand)
+        self.assertEqual(self.manager.get_turn_order(), ["Player1", "Player1 (Split)", "Player2"])
+
+        player1.state = PlayerState.HAS_ACTED
+        self.assertIs(self.manager.get_current_turn_player(), split_hand)
+
+    def test_reset_players_clears_turn_queue(self):
+        player = Mock(id="player1", state=PlayerState.AWAITING_MY_TURN)
+        self.manager.add_player(player)
+        self.manager.build_turn_queue()
+        self.manager.reset_players()
+        self.assertIsNone(self.manager.turn_queue)
+
     def test_get_seat_number(self):
         # Setup: Add a player and expect a seat number
         player = Mock()
@@ -132,18 +215,24 @@ class TestPlayerManager(unittest.TestCase):
         self.assertIsNone(self.manager.get_seat_number("nonexistent"))
 
     def test_check_all_results_are_published(self):
-        # Setup: Add players and set their states
+        # Setup: Add players and publish their results
         player1 = Mock()
-        player1.state = PlayerState.RESULT_NOTIFIED
+        player1.id = "player1"
         self.manager.add_player(player1)
 
         player2 = Mock()
-        player2.state = PlayerState.RESULT_NOTIFIED
+        player2.id = "player2"
         self.manager.add_player(player2)
+        self.event_bus.reset_mock()
 
-        # Test: Verify that the final event is published when all players are notified
+        self.manager.publish_result(player1)
+        player1.publish_result.assert_called_once()
         self.manager.check_all_results_are_published()
-        self.event_bus.publish.assert_called_with('publish_results_done')
+        self.event_bus.publish.assert_not_called()
+
+        # Test: Verify that the final event is published when all players are notified
+        self.manager.publish_result(player2)
+        self.event_bus.publish.assert_called_once_with('publish_results_done')
 
     def test_set_all_player_events(self):
         # Setup: Add a player
@@ -237,6 +326,20 @@ class TestPlayerManager(unittest.TestCase):
         self.assertNotIn(split_player, self.manager.players, "Split player should be removed from the list.")
         self.assertEqual(len(self.manager.players), 1, "There should only be one player left in the list.")
 
+    def test_get_waiting_split_player_checks_only_own_hands(self):
+        original_player = Mock()
+        original_player.id = "original1"
+        original_player.split_hands = []
+        original_player.owner = original_player
+        self.manager.add_player(original_player)
+        waiting_hand = Mock(state=PlayerState.AWAITING_MY_TURN, owner=original_player)
+        acting_hand = Mock(state=PlayerState.MY_TURN, owner=original_player)
+        self.manager.insert_split_player(original_player, waiting_hand)
+        self.assertIsNone(self.manager.get_waiting_split_player(original_player))
+        self.manager.insert_split_player(original_player, acting_hand)
+        self.assertIs(self.manager.get_waiting_split_player(original_player), acting_hand)
+        self.assertEqual(self.manager.count_split_players(original_player), 2)
+
     def tearDown(self):
         pass
 
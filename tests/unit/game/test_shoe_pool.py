@@ -0,0 +1,73 @@
+import time
+import unittest
+
+import numpy as np
+
+from game.deck import Deck
+from game.shoe_pool import ShoePool
+
+
+def wait_until_full(pool, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while pool.ready() < pool.depth and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+class TestShoePool(unittest.TestCase):
+    def setUp(self):
+        self.fresh_shoe = np.arange(1, 313, dtype=np.int16)
+        self.pool = ShoePool(self.fresh_shoe, depth=3, rng=np.random.default_rng(7))
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_take_returns_shuffled_shoe(self):
+        shoe = self.pool.take()
+        self.assertEqual(sorted(shoe.tolist()), self.fresh_shoe.tolist())
+        self.assertFalse(np.array_equal(shoe, self.fresh_shoe))
+
+    def test_worker_fills_pool_to_depth(self):
+        wait_until_full(self.pool)
+        self.assertEqual(self.pool.ready(), 3)
+        self.pool.take()
+        self.assertEqual(self.pool.stats()['hits'], 1)
+        self.assertEqual(self.pool.stats()['misses'], 0)
+
+    def test_miss_when_pool_is_drained(self):
+        wait_until_full(self.pool)
+        # Stop the worker first, a take() frees a slot it could refill before the next take.
+        self.pool.close()
+        for _ in range(4):
+            self.pool.take()
+        self.assertEqual(self.pool.hits, 3)
+        self.assertEqual(self.pool.misses, 1)
+
+    def test_shoe_order_does_not_depend_on_hits_or_misses(self):
+        shoes = [self.pool.take() for _ in range(5)]
+        rng = np.random.default_rng(7)
+        for shoe in shoes:
+            expected = self.fresh_shoe.copy()
+            rng.shuffle(expected)
+            self.assertTrue(np.array_equal(shoe, expected))
+
+
+class TestDeckWithShoePool(unittest.TestCase):
+    def setUp(self):
+        self.deck = Deck(6, shoe_pool_depth=2)
+
+    def tearDown(self):
+        self.deck.close()
+
+    def test_shuffle_swaps_in_pooled_shoe(self):
+        self.deck.shuffle()
+        for _ in range(200):
+            self.deck.deal_card()
+        wait_until_full(self.deck.shoe_pool)
+        self.deck.shuffle()
+        self.assertEqual(self.deck.cards_left(), 52 * 6)
+        self.assertEqual(sorted(self.deck.cards), sorted(self.deck._create_deck()))
+        self.assertGreaterEqual(self.deck.shoe_pool.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from game.player import Player
+from game.strategy import StrategyTable, HIT, STAND, DOUBLE, DOUBLE_OR_STAND
+
+
+def hand_with(*cards):
+    hand = Player(name='bot')
+    for card in cards:
+        hand.add_card(card)
+    return hand
+
+
+class TestStrategyTable(unittest.TestCase):
+    def setUp(self):
+        self.strategy = StrategyTable.basic_strategy()
+
+    def test_basic_strategy_tables(self):
+        self.assertEqual(self.strategy.hard[16, 10], HIT)
+        self.assertEqual(self.strategy.hard[16, 6], STAND)
+        self.assertEqual(self.strategy.hard[11, 1], HIT)
+        self.assertEqual(self.strategy.hard[11, 10], DOUBLE)
+        self.assertEqual(self.strategy.soft[18, 3], DOUBLE_OR_STAND)
+        self.assertTrue(self.strategy.pairs[8, 10])
+        self.assertFalse(self.strategy.pairs[10, 6])
+
+    def test_dict_round_trip(self):
+        data = self.strategy.to_dict()
+        self.assertEqual(data['hard']['12'], 'HHSSSHHHHH')
+        self.assertEqual(StrategyTable.from_dict(data).to_dict(), data)
+
+    def test_invalid_rows_are_rejected(self):
+        with self.assertRaises(ValueError):
+            StrategyTable.from_dict({'hard': {'16': 'SSSSS'}})
+        with self.assertRaises(ValueError):
+            StrategyTable.from_dict({'hard': {'16': 'SSSSSHHHHX'}})
+        with self.assertRaises(ValueError):
+            StrategyTable.from_dict({'soft': {'9': 'SSSSSSSSSS'}})
+
+    def test_action_for_a_hand(self):
+        self.assertEqual(self.strategy.action(hand_with(110, 106), 207, ['h', 's', 'd']), 'h')
+        self.assertEqual(self.strategy.action(hand_with(110, 106), 205, ['h', 's', 'd']), 's')
+        self.assertEqual(self.strategy.action(hand_with(105, 106), 205, ['h', 's', 'd']), 'd')
+        # Double is only allowed on two cards, 'D' falls back to a hit and 'd' to a stand.
+        self.assertEqual(self.strategy.action(hand_with(102, 104, 105), 205, ['h', 's']), 'h')
+        self.assertEqual(self.strategy.action(hand_with(101, 103, 104), 203, ['h', 's']), 's')
+        self.assertEqual(self.strategy.action(hand_with(108, 208), 210, ['h', 's', 'd', 'p']), 'p')
+
+    def test_split_limit_and_insurance(self):
+        hand = hand_with(108, 208)
+        hand.split_hands.append(hand_with(308))
+        self.assertEqual(self.strategy.action(hand, 210, ['h', 's', 'd', 'p']), 'h')
+
+        insuring = StrategyTable.basic_strategy(take_insurance=True)
+        self.assertEqual(insuring.action(hand_with(110, 109), 201, ['h', 's', 'd', 'i']), 'i')
+        self.assertEqual(insuring.action(hand_with(110, 109), 201, ['h', 's', 'd']), 's')
+
+
+if __name__ == '__main__':
+    unittest.main()
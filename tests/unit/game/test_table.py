@@ -0,0 +1,79 @@
+import unittest
+from unittest.mock import Mock
+
+from game.player import Player
+from game.table import Table, TableRegistry
+
+
+class TestTable(unittest.TestCase):
+    def test_table_wires_its_own_components(self):
+        table = Table('t1', logger=Mock(), num_seats=2, seed=1)
+
+        self.assertIs(table.player_manager.event_bus, table.event_bus)
+        self.assertIs(table.game_manager.player_manager, table.player_manager)
+        self.assertIs(table.event_handler.game_manager, table.game_manager)
+        self.assertEqual(table.player_manager.num_seats, 2)
+        self.assertEqual(table.event_bus.mode, 'queued')
+
+    def test_table_runs_a_round_through_its_own_bus(self):
+        table = Table('t1', logger=Mock(), num_seats=1, seed=1)
+        player = Player(name='bot', id='p1', balance=100)
+        table.game_manager.add_player(player)
+        self.assertEqual(table.game_state_machine.get_state(), 'betting')
+
+        table.game_manager.place_bet('p1', 10)
+        self.assertIn(table.game_state_machine.get_state(), ('player_turn', 'dealer_turn', 'publish_result'))
+
+
+class TestTableRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = TableRegistry(logger=Mock(), num_decks=6)
+
+    def test_tables_are_independent(self):
+        first = self.registry.create_table('first')
+        second = self.registry.create_table('second', num_seats=2)
+
+        first.game_manager.add_player(Player(name='bot', id='p1', balance=100))
+
+        self.assertEqual(first.game_state_machine.get_state(), 'betting')
+        self.assertEqual(second.game_state_machine.get_state(), 'waiting_for_players')
+        self.assertIsNot(first.event_bus, second.event_bus)
+        self.assertEqual(second.player_manager.num_seats, 2)
+        self.assertEqual(first.game_manager.deck.num_decks, 6)
+
+    def test_create_table_generates_ids_and_rejects_duplicates(self):
+        table = self.registry.create_table()
+        self.assertIn(table.table_id, self.registry)
+        with self.assertRaises(ValueError):
+            self.registry.create_table(table.table_id)
+
+    def test_get_or_create_table(self):
+        table = self.registry.get_or_create_table('bots', num_seats=3)
+        self.assertIs(self.registry.get_or_create_table('bots', num_seats=1), table)
+        self.assertEqual(table.player_manager.num_seats, 3)
+        self.assertIsNone(self.registry.get_table('unknown'))
+
+    def test_max_tables(self):
+        registry = TableRegistry(logger=Mock(), max_tables=2)
+        registry.create_table('a')
+        registry.create_table('b')
+        with self.assertRaises(ValueError):
+            registry.create_table('c')
+
+        self.assertTrue(registry.remove_table('a'))
+        registry.create_table('c')
+        self.assertEqual(sorted(registry.table_ids()), ['b', 'c'])
+
+    def test_remove_table_closes_its_shoe_pool(self):
+        table = self.registry.create_table('pooled', shoe_pool_depth=1)
+        shoe_pool = table.game_manager.deck.shoe_pool
+        shoe_pool.close = Mock(wraps=shoe_pool.close)
+
+        self.assertTrue(self.registry.remove_table('pooled'))
+        self.assertFalse(self.registry.remove_table('pooled'))
+        table.game_manager.deck.shoe_pool.close.assert_called_once()
+        self.assertEqual(len(self.registry), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import AsyncMock
+
+from network.codec import (BinaryWire, CodecError, JsonWire, create_wire, decode_action, decode_card, decode_request,
+                           dump_request, encode_action, encode_card, encode_request)
+from network.models import RequestPlayerAction, ShoeComposition
+
+
+def make_request(**fields):
+    values = dict(player_name='alice (Split)', seat=2, state='player_turn', table=[900, 110, 888, 901, 413, 201, 903, 313],
+                  balance=987.5, score=15, available_actions=['h', 's', 'd', 'p'], need_shuffle=True)
+    values.update(fields)
+    return RequestPlayerAction(**values)
+
+
+class TestCards(unittest.TestCase):
+    def test_card_bytes(self):
+        self.assertEqual(encode_card(110), 0x1A)
+        self.assertEqual(encode_card(413), 0x4D)
+        self.assertEqual(encode_card(888), 0xFF)
+        self.assertEqual(encode_card(900), 0xFE)
+        self.assertEqual(encode_card(901), 0x80)
+        self.assertEqual(encode_card(907), 0x86)
+
+    def test_round_trip(self):
+        codes = [suit * 100 + value for suit in range(1, 5) for value in range(1, 14)] + [888, 900, 901, 907]
+        self.assertEqual([decode_card(encode_card(code)) for code in codes], codes)
+
+
+class TestFrames(unittest.TestCase):
+    def assert_same_as_json(self, request):
+        frame = encode_request(request)
+        self.assertIsInstance(frame, bytes)
+        self.assertEqual(decode_request(frame), json.loads(request.model_dump_json(exclude_none=True)))
+
+    def test_player_turn_request(self):
+        self.assert_same_as_json(make_request())
+
+    def test_betting_request(self):
+        self.assert_same_as_json(make_request(state='betting', table=[], available_actions=['1', '25', '500']))
+
+    def test_request_with_shoe(self):
+        shoe = ShoeComposition(remaining=list(range(13)), running_count=-12, cards_left=300)
+        self.assert_same_as_json(make_request(shoe=shoe))
+
+    def test_binary_frame_is_smaller(self):
+        request = make_request()
+        self.assertLess(len(encode_request(request)), len(request.model_dump_json(exclude_none=True)) / 3)
+
+    def test_action_round_trip(self):
+        action = decode_action(encode_action('alice', 'h'))
+        self.assertEqual((action.player_name, action.action), ('alice', 'h'))
+        self.assertEqual(decode_action(encode_action('alice', 25)).action, '25')
+        self.assertEqual(len(encode_action('alice', 'h')), 3 + len('alice') + 1)
+
+    def test_long_names(self):
+        name = 'a' * 300
+        self.assert_same_as_json(make_request(player_name=name))
+        self.assertEqual(decode_action(encode_action(name, 'h')).player_name, name)
+
+    def test_malformed_frames(self):
+        for frame in (b'', b'\x02\x00', b'\x02\x05\x00ab', b'\x01\x00\x00', b'\x02\x01\x00a\xff'):
+            with self.assertRaises(CodecError):
+                decode_action(frame)
+        with self.assertRaises(CodecError):
+            decode_request(encode_request(make_request())[:10])
+        with self.assertRaises(CodecError):
+            decode_request(encode_action('alice', 'h'))
+        # Both encodings report invalid data as a ValueError.
+        with self.assertRaises(ValueError):
+            JsonWire(None).parse_action('{"action": "h"}')
+
+
+class TestWires(unittest.TestCase):
+    def setUp(self):
+        self.websocket = AsyncMock()
+
+    def test_json_wire_splices_the_table(self):
+        request = make_request()
+        self.assertEqual(json.loads(dump_request(request, json.dumps(request.table))),
+                         json.loads(request.model_dump_json(exclude_none=True)))
+
+        wire = create_wire(self.websocket)
+        self.assertIsInstance(wire, JsonWire)
+        asyncio.run(wire.send_request(request, '[900]'))
+        message = json.loads(self.websocket.send_text.call_args.args[0])
+        self.assertEqual(message['table'], [900])
+
+    def test_binary_wire(self):
+        wire = create_wire(self.websocket, 'binary')
+        self.assertIsInstance(wire, BinaryWire)
+        request = make_request()
+        asyncio.run(wire.send_request(request, '[900]'))
+        self.assertEqual(decode_request(self.websocket.send_bytes.call_args.args[0])['table'], request.table)
+
+        self.websocket.receive_bytes.return_value = encode_action('alice', 's')
+        self.assertEqual(wire.parse_action(asyncio.run(wire.receive())).action, 's')
+
+    def test_inbox(self):
+        wire = create_wire(self.websocket)
+
+        async def read():
+            frames = asyncio.Queue()
+            self.websocket.receive_text.side_effect = self.receive_from(frames)
+            wire.start_inbox()
+            self.assertEqual(wire.pending(), [])
+            frames.put_nowait('{"a": 1}')
+            frames.put_nowait('{"b": 2}')
+            await asyncio.sleep(0)
+            self.assertEqual(wire.pending(), ['{"a": 1}', '{"b": 2}'])
+            frames.put_nowait('{"c": 3}')
+            self.assertEqual(await wire.receive(), '{"c": 3}')
+            # A disconnect is raised to the next reader.
+            frames.put_nowait(ConnectionError('closed'))
+            await asyncio.sleep(0)
+            with self.assertRaises(ConnectionError):
+                wire.pending()
+
+        asyncio.run(read())
+
+    @staticmethod
+    def receive_from(frames):
+        async def receive():
+            frame = await frames.get()
+            if isinstance(frame, Exception):
+                raise frame
+            return frame
+        return receive
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+
+from network.delta import DeltaTracker, apply_delta, diff_tables, split_hands
+from tests.table_helpers import seated_table
+
+TABLE = [900, 110, 888, 901, 108, 209, 902, 301, 412]
+
+
+class TestDiff(unittest.TestCase):
+    def test_split_hands(self):
+        self.assertEqual(split_hands(TABLE), [[900, 110, 888], [901, 108, 209], [902, 301, 412]])
+        self.assertEqual(split_hands([]), [])
+
+    def test_appended_card(self):
+        new = [900, 110, 888, 901, 108, 209, 305, 902, 301, 412]
+        self.assertEqual(diff_tables(TABLE, new), [[1, 3, [305]]])
+        self.assertEqual(apply_delta(TABLE, diff_tables(TABLE, new)), new)
+
+    def test_revealed_hole_card(self):
+        new = [900, 110, 207, 303, 901, 108, 209, 902, 301, 412]
+        self.assertEqual(diff_tables(TABLE, new), [[0, 2, [207, 303]]])
+        self.assertEqual(apply_delta(TABLE, diff_tables(TABLE, new)), new)
+
+    def test_changed_hands_need_a_full_table(self):
+        self.assertIsNone(diff_tables(TABLE, TABLE + [903, 102, 103]))
+        self.assertIsNone(diff_tables(TABLE, [900, 110, 888, 901, 108, 209, 903, 301, 412]))
+        self.assertEqual(diff_tables(TABLE, list(TABLE)), [])
+
+    def test_max_size(self):
+        new = [900, 111, 888, 901, 109, 209, 902, 302, 412]
+        self.assertEqual(len(diff_tables(TABLE, new)), 3)
+        self.assertIsNone(diff_tables(TABLE, new, max_size=len(new)))
+
+
+class TestDeltaTracker(unittest.TestCase):
+    def setUp(self):
+        self.tracker = DeltaTracker(history=3)
+
+    def test_full_table_until_acknowledged(self):
+        self.assertEqual(self.tracker.encode(TABLE), {'table': TABLE, 'seq': 1})
+        self.assertEqual(self.tracker.encode(TABLE), {'table': TABLE, 'seq': 2})
+        self.tracker.acknowledge(2)
+        new = TABLE + [413]
+        self.assertEqual(self.tracker.encode(new), {'table': [], 'seq': 3, 'base': 2, 'delta': [[2, 3, [413]]]})
+
+    def test_unknown_ack_resynchronizes(self):
+        self.tracker.encode(TABLE)
+        self.tracker.acknowledge(1)
+        self.tracker.acknowledge(42)
+        self.assertEqual(self.tracker.encode(TABLE + [413])['table'], TABLE + [413])
+        # Forgotten tables are unknown too.
+        for _ in range(4):
+            self.tracker.encode(TABLE)
+        self.tracker.acknowledge(2)
+        self.assertNotIn('delta', self.tracker.encode(TABLE))
+
+    def test_no_ack_keeps_the_base(self):
+        self.tracker.encode(TABLE)
+        self.tracker.acknowledge(1)
+        self.tracker.acknowledge(None)
+        self.assertEqual(self.tracker.encode(TABLE)['base'], 1)
+
+    def test_delta_only_when_its_message_is_shorter(self):
+        short = [900, 110, 888, 901, 108]
+        self.tracker.encode(short)
+        self.tracker.acknowledge(1)
+        # [[1,2,[209]]] and the base and delta keys are longer than the whole table.
+        self.assertEqual(self.tracker.encode(short + [209]), {'table': short + [209], 'seq': 2})
+
+    def test_trackers_share_deltas_through_the_cache(self):
+        cache = {}
+        other = DeltaTracker()
+        for tracker in (self.tracker, other):
+            tracker.encode(TABLE, key=(1, True), cache=cache)
+            tracker.acknowledge(1)
+        new = TABLE + [413]
+        first = self.tracker.encode(new, key=(2, True), cache=cache)
+        second = other.encode(new, key=(2, True), cache=cache)
+        self.assertEqual(list(cache), [((1, True), (2, True))])
+        self.assertIs(second['delta'], first['delta'])
+
+    def test_client_follows_a_played_table(self):
+        table, players = seated_table(seed=11, bus_mode='sync')
+        game_manager = table.game_manager
+        trackers = {player.id: DeltaTracker() for player in players}
+        client_tables = {player.id: {} for player in players}
+        deltas = 0
+
+        def receive(player_id, hidden_card):
+            nonlocal deltas
+            table_state, _ = game_manager.get_table_snapshot(hidden_card=hidden_card)
+            fields = trackers[player_id].encode(table_state, key=game_manager.get_table_key(hidden_card),
+                                                cache=game_manager.table_deltas)
+            tables = client_tables[player_id]
+            if 'base' in fields:
+                deltas += 1
+                tables[fields['seq']] = apply_delta(tables[fields['base']], fields['delta'])
+            else:
+                tables[fields['seq']] = fields['table']
+            self.assertEqual(tables[fields['seq']], table_state)
+            return fields['seq']
+
+        for _ in range(30):
+            for player in players:
+                game_manager.place_bet(player.id, 10)
+            while (hand := table.event_handler.current_player) is not None:
+                trackers[hand.id].acknowledge(receive(hand.id, hidden_card=True))
+                game_manager.handle_action('h' if hand.score < 16 and 'h' in hand.available_actions else 's', hand)
+            for player in players:
+                receive(player.id, hidden_card=False)
+                table.player_manager.publish_result(player)
+        table.close()
+        self.assertGreater(deltas, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
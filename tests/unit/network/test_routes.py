@@ -0,0 +1,181 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from fastapi import WebSocketDisconnect
+
+from config import DEFAULT_TABLE_ID
+from game.table import TableRegistry
+from network.routes import table_websocket_endpoint
+
+
+class FakeWebSocket:
+    """The server side of a player websocket, fed the client's messages through a queue."""
+
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.sent = []
+        self.new_message = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        self.sent.append(message)
+        self.new_message.set()
+
+    async def receive_text(self):
+        message = await self.incoming.get()
+        if isinstance(message, Exception):
+            raise message
+        return message
+
+    async def next_request(self):
+        """The next message the server sends, as a dict."""
+        while not self.sent:
+            self.new_message.clear()
+            await self.new_message.wait()
+        return json.loads(self.sent.pop(0))
+
+
+class TestTableWebsocket(unittest.TestCase):
+    def setUp(self):
+        self.registry = TableRegistry(logger=MagicMock())
+
+    def tearDown(self):
+        self.registry.close()
+
+    def connect(self, websocket, table_id, client_name, seats=1):
+        return asyncio.create_task(table_websocket_endpoint(websocket, table_id, client_name, composition=False,
+                                                            seats=seats, encoding='json', delta=False,
+                                                            table_registry=self.registry))
+
+    def test_last_player_leaving_closes_the_table(self):
+        async def run():
+            websocket = FakeWebSocket()
+            endpoint = self.connect(websocket, 'bots', 'alice')
+            request = await websocket.next_request()
+            self.assertEqual(request['state'], 'betting')
+            self.assertIn('bots', self.registry)
+
+            websocket.incoming.put_nowait(WebSocketDisconnect(code=1000))
+            await asyncio.wait_for(endpoint, 1)
+
+        asyncio.run(run())
+        self.assertNotIn('bots', self.registry)
+
+    def test_player_leaving_releases_the_other_seats(self):
+        async def run():
+            alice, bob = FakeWebSocket(), FakeWebSocket()
+            alice_endpoint = self.connect(alice, 'pair', 'alice', seats=2)
+            bob_endpoint = self.connect(bob, 'pair', 'bob', seats=2)
+            await alice.next_request()
+            await bob.next_request()
+            table = self.registry.get_table('pair')
+
+            alice.incoming.put_nowait(json.dumps({'player_name': 'alice', 'action': '10'}))
+            bob.incoming.put_nowait(WebSocketDisconnect(code=1000))
+            await asyncio.wait_for(bob_endpoint, 1)
+            # Alice's bet was the last one the round waited for, so the cards are dealt without bob.
+            request = await asyncio.wait_for(alice.next_request(), 1)
+            self.assertIn(request['state'], ('player_turn', 'publish_result'))
+            self.assertEqual([player.name for player in table.player_manager.players], ['alice'])
+
+            alice.incoming.put_nowait(WebSocketDisconnect(code=1000))
+            await asyncio.wait_for(alice_endpoint, 1)
+
+        asyncio.run(run())
+        self.assertEqual(len(self.registry), 0)
+
+    async def stand_until_result(self, websocket, client_name):
+        request = await asyncio.wait_for(websocket.next_request(), 1)
+        while request['state'] == 'player_turn':
+            if request['available_actions']:
+                websocket.incoming.put_nowait(json.dumps({'player_name': client_name, 'action': 's'}))
+            request = await asyncio.wait_for(websocket.next_request(), 1)
+        self.assertEqual(request['state'], 'publish_result')
+
+    def test_default_table_is_played_again_after_everyone_left(self):
+        async def run():
+            alice = FakeWebSocket()
+            alice_endpoint = self.connect(alice, DEFAULT_TABLE_ID, 'alice')
+            await alice.next_request()
+            alice.incoming.put_nowait(json.dumps({'player_name': 'alice', 'action': '10'}))
+            await asyncio.wait_for(alice.next_request(), 1)
+            # Alice leaves in the middle of the round, the table stays open for the next players.
+            alice.incoming.put_nowait(WebSocketDisconnect(code=1000))
+            await asyncio.wait_for(alice_endpoint, 1)
+            table = self.registry.get_table(DEFAULT_TABLE_ID)
+            self.assertEqual(table.game_state_machine.get_state(), 'waiting_for_players')
+
+            bob = FakeWebSocket()
+            bob_endpoint = self.connect(bob, DEFAULT_TABLE_ID, 'bob')
+            request = await asyncio.wait_for(bob.next_request(), 1)
+            self.assertEqual(request['state'], 'betting')
+            bob.incoming.put_nowait(json.dumps({'player_name': 'bob', 'action': '10'}))
+            await self.stand_until_result(bob, 'bob')
+
+            bob.incoming.put_nowait(WebSocketDisconnect(code=1000))
+            await asyncio.wait_for(bob_endpoint, 1)
+
+        asyncio.run(run())
+
+    def test_player_joining_during_the_round_bets_in_the_next_one(self):
+        async def run():
+            alice, bob, carol = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+            bob_endpoint = self.connect(bob, 'pair', 'bob', seats=2)
+            alice_endpoint = self.connect(alice, 'pair', 'alice', seats=2)
+            await alice.next_request()
+            await bob.next_request()
+            bob.incoming.put_nowait(json.dumps({'player_name': 'bob', 'action': '10'}))
+            alice.incoming.put_nowait(json.dumps({'player_name': 'alice', 'action': '10'}))
+            # Bob sits in the first seat and leaves when his turn comes.
+            self.assertEqual((await asyncio.wait_for(bob.next_request(), 1))['state'], 'player_turn')
+            bob.incoming.put_nowait(WebSocketDisconnect(code=1000))
+            await asyncio.wait_for(bob_endpoint, 1)
+
+            # Carol takes bob's seat while alice is still playing, she is only asked to bet once the round is over.
+            carol_endpoint = self.connect(carol, 'pair', 'carol', seats=2)
+            await self.stand_until_result(alice, 'alice')
+            request = await asyncio.wait_for(carol.next_request(), 1)
+            self.assertEqual(request['state'], 'betting')
+            self.assertEqual((await asyncio.wait_for(alice.next_request(), 1))['state'], 'betting')
+
+            for websocket, endpoint in ((alice, alice_endpoint), (carol, carol_endpoint)):
+                websocket.incoming.put_nowait(WebSocketDisconnect(code=1000))
+                await asyncio.wait_for(endpoint, 1)
+
+        asyncio.run(run())
+        self.assertEqual(len(self.registry), 0)
+
+    def test_bet_sent_during_a_turn_is_kept_for_the_next_round(self):
+        async def run():
+            websocket = FakeWebSocket()
+            endpoint = self.connect(websocket, 'standing', 'alice')
+            await websocket.next_request()
+            websocket.incoming.put_nowait(json.dumps({'player_name': 'alice', 'action': '10',
+                                                      'standing_bet': {'amount': 10}}))
+            request = await asyncio.wait_for(websocket.next_request(), 1)
+            self.assertEqual(request['state'], 'player_turn')
+            player = self.registry.get_table('standing').player_manager.players[0]
+
+            # The client bets for the next round before it answers the turn.
+            websocket.incoming.put_nowait(json.dumps({'player_name': 'alice', 'action': '25'}))
+            websocket.incoming.put_nowait(json.dumps({'player_name': 'alice', 'action': 's'}))
+            request = await asyncio.wait_for(websocket.next_request(), 1)
+            self.assertEqual(request['state'], 'publish_result')
+
+            # The standing bet opened the next round with the override, without asking the client.
+            request = await asyncio.wait_for(websocket.next_request(), 1)
+            self.assertEqual(request['state'], 'player_turn')
+            self.assertEqual(player.initial_bet, 25)
+
+            websocket.incoming.put_nowait(WebSocketDisconnect(code=1000))
+            await asyncio.wait_for(endpoint, 1)
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+
+from network.sharding import ShardRouter, create_dispatcher_app
+
+
+class TestShardRouter(unittest.TestCase):
+    def test_new_tables_go_to_the_least_loaded_worker(self):
+        router = ShardRouter(num_workers=3)
+
+        workers = [router.assign(f"table{index}") for index in range(7)]
+
+        self.assertEqual(workers, [0, 1, 2, 0, 1, 2, 0])
+        self.assertEqual(router.load(), [3, 2, 2])
+
+    def test_assignment_is_sticky(self):
+        router = ShardRouter(num_workers=2)
+        first = router.assign('bots')
+        router.assign('other')
+
+        self.assertEqual(router.assign('bots'), first)
+        self.assertEqual(router.lookup('bots'), first)
+        self.assertEqual(router.load(), [1, 1])
+
+    def test_release_frees_the_worker(self):
+        router = ShardRouter(num_workers=2)
+        router.assign('a')
+        router.assign('b')
+        router.assign('c')
+
+        self.assertTrue(router.release('b'))
+        self.assertFalse(router.release('b'))
+        self.assertIsNone(router.lookup('b'))
+        self.assertEqual(router.assign('d'), 1)
+
+    def test_needs_a_worker(self):
+        with self.assertRaises(ValueError):
+            ShardRouter(num_workers=0)
+
+
+class TestDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.router = ShardRouter(num_workers=2)
+        app = create_dispatcher_app(self.router, ['ws://worker0', 'ws://worker1'])
+        self.endpoints = {route.path: route.endpoint for route in app.routes}
+        self.closed = {}  # Maps relayed urls to the events that end their connections
+
+    async def fake_relay(self, websocket, url):
+        self.closed[url] = asyncio.Event()
+        await self.closed[url].wait()
+
+    def client(self, table_id, client_name):
+        websocket = MagicMock()
+        websocket.url.query = ''
+        return self.endpoints['/ws/{table_id}/{client_name}'](websocket, table_id, client_name)
+
+    def test_table_released_with_its_last_connection(self):
+        async def run():
+            alice = asyncio.create_task(self.client('bots', 'alice'))
+            bob = asyncio.create_task(self.client('bots', 'bob'))
+            await asyncio.sleep(0)
+            self.assertEqual(set(self.closed), {'ws://worker0/ws/bots/alice', 'ws://worker0/ws/bots/bob'})
+
+            self.closed['ws://worker0/ws/bots/alice'].set()
+            await alice
+            self.assertEqual(self.router.lookup('bots'), 0)
+            self.closed['ws://worker0/ws/bots/bob'].set()
+            await bob
+            self.assertIsNone(self.router.lookup('bots'))
+            self.assertEqual(self.router.load(), [0, 0])
+
+        with patch('network.sharding.relay', self.fake_relay):
+            asyncio.run(run())
+
+    def test_lookup_hands_out_the_worker(self):
+        find_table = self.endpoints['/shards/{table_id}']
+
+        async def run():
+            return [await find_table(table_id) for table_id in ('bots', 'other', 'bots')]
+
+        bots, other, again = asyncio.run(run())
+        self.assertEqual(bots, {'table_id': 'bots', 'worker': 0, 'url': 'ws://worker0'})
+        self.assertEqual(other['url'], 'ws://worker1')
+        self.assertEqual(again, bots)
+
+    def test_looked_up_tables_released_once_their_worker_closed_them(self):
+        find_table = self.endpoints['/shards/{table_id}']
+        open_tables = {'ws://worker0': {'bots'}, 'ws://worker1': {'other'}}
+
+        async def worker_tables(url):
+            return open_tables[url]
+
+        async def run():
+            await find_table('bots')
+            await find_table('other')
+            # A relayed client of a looked up table leaving does not release it.
+            client = asyncio.create_task(self.client('bots', 'alice'))
+            await asyncio.sleep(0)
+            self.closed['ws://worker0/ws/bots/alice'].set()
+            await client
+            self.assertEqual(self.router.lookup('bots'), 0)
+
+            open_tables['ws://worker0'].clear()
+            await find_table('new')
+            self.assertIsNone(self.router.lookup('bots'))
+            self.assertEqual(self.router.lookup('other'), 1)
+            self.assertEqual(self.router.load(), [1, 1])
+
+        with patch('network.sharding.relay', self.fake_relay), \
+                patch('network.sharding.worker_tables', worker_tables), \
+                patch('network.sharding.LOOKUP_GRACE', -1):
+            asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
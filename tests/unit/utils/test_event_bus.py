@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 
 import pytest
@@ -44,5 +45,123 @@ async def test_event_bus_with_async_handlers():
 
     async_handler.assert_called_once_with('async', key='test')
 
+
+def _record_chain(event_bus):
+    calls = []
+
+    def on_start():
+        calls.append('start-1')
+        event_bus.publish('first')
+        event_bus.publish('second')
+        calls.append('start-1 done')
+
+    event_bus.subscribe('start', on_start)
+    event_bus.subscribe('start', lambda: calls.append('start-2'))
+    event_bus.subscribe('first', lambda: calls.append('first'))
+    event_bus.subscribe('first', lambda: event_bus.publish('nested'))
+    event_bus.subscribe('second', lambda: calls.append('second'))
+    event_bus.subscribe('nested', lambda: calls.append('nested'))
+    event_bus.publish('start')
+    return calls
+
+
+def test_queued_event_bus_keeps_the_order_of_inline_dispatch():
+    sync_calls = _record_chain(EventBus())
+    queued_calls = _record_chain(EventBus(mode='queued'))
+
+    # Handlers still run in the same order, only the publishing handler returns before its events are handled.
+    assert [call for call in queued_calls if call != 'start-1 done'] == \
+           [call for call in sync_calls if call != 'start-1 done']
+    assert queued_calls == ['start-1', 'start-1 done', 'first', 'nested', 'second', 'start-2']
+
+
+def test_queued_event_bus_does_not_grow_the_stack():
+    event_bus = EventBus(mode='queued')
+    counter = Mock()
+
+    def countdown(remaining):
+        counter()
+        if remaining:
+            event_bus.publish('tick', remaining - 1)
+
+    event_bus.subscribe('tick', countdown)
+    event_bus.publish('tick', 5000)  # Far deeper than the recursion limit.
+
+    assert counter.call_count == 5001
+
+
+def test_queued_event_bus_drops_the_chain_when_a_handler_raises():
+    event_bus = EventBus(mode='queued')
+    later_handler = Mock()
+
+    def failing_handler():
+        event_bus.publish('later')
+        raise RuntimeError('boom')
+
+    event_bus.subscribe('start', failing_handler)
+    event_bus.subscribe('later', later_handler)
+
+    with pytest.raises(RuntimeError):
+        event_bus.publish('start')
+    later_handler.assert_not_called()
+
+    event_bus.publish('later')
+    later_handler.assert_called_once_with()
+
+
+def test_async_event_bus_awaits_coroutine_handlers():
+    event_bus = EventBus(mode='async')
+    calls = []
+
+    async def async_handler(value):
+        await asyncio.sleep(0)
+        calls.append(('async', value))
+        event_bus.publish('after', value)
+
+    event_bus.subscribe('start', async_handler)
+    event_bus.subscribe('start', lambda value: calls.append(('sync', value)))
+    event_bus.subscribe('after', lambda value: calls.append(('after', value)))
+
+    asyncio.run(event_bus.publish_async('start', 1))
+
+    assert calls == [('async', 1), ('after', 1), ('sync', 1)]
+
+
+def test_async_event_bus_queues_events_published_by_other_tasks():
+    event_bus = EventBus(mode='async')
+    calls = []
+    awaiting = asyncio.Event()
+
+    async def slow_handler():
+        awaiting.set()
+        await asyncio.sleep(0.01)
+        calls.append('slow')
+
+    event_bus.subscribe('start', slow_handler)
+    event_bus.subscribe('start', lambda: calls.append('second'))
+    event_bus.subscribe('other', lambda: calls.append('other'))
+    event_bus.subscribe('last', lambda: calls.append('last'))
+
+    async def publish_meanwhile():
+        await awaiting.wait()
+        event_bus.publish('other')
+        await event_bus.publish_async('last')
+        # publish_async() returns once its own event was handled.
+        calls.append('returned')
+
+    async def run():
+        await asyncio.gather(event_bus.publish_async('start'), publish_meanwhile())
+
+    asyncio.run(run())
+
+    # 'other' waits for every handler of 'start', whatever the timing of the slow one.
+    assert calls == ['slow', 'second', 'other', 'last', 'returned']
+
+
+def test_event_bus_rejects_unknown_modes():
+    with pytest.raises(ValueError):
+        EventBus(mode='threaded')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,106 @@
+import json
+import unittest
+
+from utils.event_bus import EventBus
+from utils.event_metrics import EventMetrics, LatencyStats
+
+
+class TestLatencyStats(unittest.TestCase):
+    def test_record_fills_power_of_two_buckets(self):
+        stats = LatencyStats()
+        stats.record(500)  # 0.5us
+        stats.record(3_000)  # 3us
+        stats.record(3_500)
+        stats.record(1_000_000)  # 1ms
+
+        self.assertEqual(stats.count, 4)
+        self.assertEqual(stats.max_ns, 1_000_000)
+        self.assertEqual(stats.as_dict()['histogram_us'], {'1': 1, '4': 2, '1024': 1})
+        self.assertEqual(stats.quantile_us(0.5), 4)
+        self.assertEqual(stats.quantile_us(0.99), 1024)
+
+    def test_empty_stats(self):
+        stats = LatencyStats()
+        self.assertEqual(stats.mean_ns(), 0.0)
+        self.assertEqual(stats.quantile_us(0.5), 0)
+
+
+class TestEventBusMetrics(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def deal_initial_cards(self):
+        self.calls.append('deal')
+
+    def test_disabled_by_default(self):
+        event_bus = EventBus()
+        event_bus.subscribe('all_betting_done', self.deal_initial_cards)
+        event_bus.publish('all_betting_done')
+
+        self.assertIsNone(event_bus.metrics)
+        self.assertEqual(self.calls, ['deal'])
+
+    def test_records_events_and_handlers(self):
+        for mode in ('sync', 'queued'):
+            with self.subTest(mode=mode):
+                event_bus = EventBus(mode=mode)
+                metrics = event_bus.enable_metrics()
+                event_bus.subscribe('all_betting_done', self.deal_initial_cards)
+                event_bus.subscribe('all_betting_done', lambda: event_bus.publish('cards_dealing_done'))
+                event_bus.publish('all_betting_done')
+                event_bus.publish('all_betting_done')
+
+                snapshot = metrics.snapshot()
+                self.assertEqual(snapshot['all_betting_done']['published'], 2)
+                self.assertEqual(snapshot['all_betting_done']['count'], 4)
+                handler = 'TestEventBusMetrics.deal_initial_cards'
+                self.assertEqual(snapshot['all_betting_done']['handlers'][handler]['count'], 2)
+                # Published without subscribers still counts as throughput.
+                self.assertEqual(snapshot['cards_dealing_done']['published'], 2)
+                self.assertEqual(snapshot['cards_dealing_done']['count'], 0)
+
+    def test_records_handlers_that_raise(self):
+        event_bus = EventBus()
+        metrics = event_bus.enable_metrics()
+
+        def failing_handler():
+            raise RuntimeError('boom')
+
+        event_bus.subscribe('start', failing_handler)
+        with self.assertRaises(RuntimeError):
+            event_bus.publish('start')
+        self.assertEqual(metrics.events['start'].count, 1)
+
+    def test_slowest_handlers_and_json_dump(self):
+        metrics = EventMetrics()
+        metrics.record_publish('determine_winners_done')
+        metrics.record_handler('determine_winners_done', self.deal_initial_cards, 5_000)
+        metrics.record_publish('player_acted')
+        metrics.record_handler('player_acted', len, 1_000)
+
+        slowest = metrics.slowest_handlers(1)
+        self.assertEqual(slowest[0][:2], ('determine_winners_done', 'TestEventBusMetrics.deal_initial_cards'))
+        self.assertEqual(json.loads(metrics.to_json())['player_acted']['handlers']['len']['count'], 1)
+
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_handler_timed_without_publish(self):
+        metrics = EventMetrics()
+        metrics.record_handler('player_acted', len, 1_000)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['player_acted']['published'], 0)
+        self.assertEqual(snapshot['player_acted']['count'], 1)
+        self.assertEqual(snapshot['player_acted']['handlers']['len']['count'], 1)
+
+    def test_disable_metrics(self):
+        event_bus = EventBus(mode='queued')
+        metrics = event_bus.enable_metrics()
+        event_bus.disable_metrics()
+        event_bus.subscribe('start', self.deal_initial_cards)
+        event_bus.publish('start')
+        self.assertEqual(metrics.snapshot(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from utils.fsm import MachineError, TransitionTable
+
+
+class Light:
+    def __init__(self):
+        self.state = Light.table.initial
+
+
+Light.table = TransitionTable(states=['off', 'on', 'broken'],
+                              transitions=[('switch_on', 'off', 'on'),
+                                           ('switch_off', 'on', 'off'),
+                                           ('break_bulb', 'on', 'broken'),
+                                           ('break_bulb', 'off', 'broken')],
+                              initial='off')
+Light.table.bind(Light)
+
+
+class TestTransitionTable(unittest.TestCase):
+    def test_triggers_move_between_states(self):
+        light = Light()
+        self.assertEqual(light.state, 'off')
+        self.assertTrue(light.switch_on())
+        self.assertEqual(light.state, 'on')
+        light.break_bulb()
+        self.assertEqual(light.state, 'broken')
+
+    def test_invalid_trigger_raises_and_keeps_the_state(self):
+        light = Light()
+        with self.assertRaises(MachineError):
+            light.switch_off()
+        self.assertEqual(light.state, 'off')
+
+    def test_trigger_by_name_and_may_trigger(self):
+        light = Light()
+        self.assertTrue(light.may_trigger('switch_on'))
+        self.assertFalse(light.may_trigger('switch_off'))
+        light.trigger('switch_on')
+        self.assertEqual(light.state, 'on')
+        with self.assertRaises(MachineError):
+            light.trigger('switch_on')
+
+    def test_triggers_ignore_event_arguments(self):
+        light = Light()
+        light.switch_on('payload', key='value')
+        self.assertEqual(light.state, 'on')
+
+    def test_instances_do_not_share_state(self):
+        first, second = Light(), Light()
+        first.switch_on()
+        self.assertEqual(second.state, 'off')
+
+    def test_rejects_invalid_tables(self):
+        with self.assertRaises(ValueError):
+            TransitionTable(states=['a'], transitions=[], initial='b')
+        with self.assertRaises(ValueError):
+            TransitionTable(states=['a'], transitions=[('go', 'a', 'b')], initial='a')
+        with self.assertRaises(ValueError):
+            TransitionTable(states=['a', 'b'], transitions=[('go', 'a', 'b'), ('go', 'a', 'a')], initial='a')
+
+
+if __name__ == '__main__':
+    unittest.main()
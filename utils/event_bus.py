@@ -1,10 +1,37 @@
 # event_bus.py
 import asyncio
+import inspect
+import time
+from collections import deque
+
+from utils.event_metrics import EventMetrics
 
 
 class EventBus:
-    def __init__(self):
+    def __init__(self, mode='sync'):
+        # 'sync' calls the handlers inline, inside publish().
+        # 'queued' defers the events a handler publishes until that handler has returned and dispatches them
+        # from an iterative loop, so the call stack no longer grows with every step of a round.
+        # 'async' does the same from a task on the running event loop and awaits handlers that are coroutines.
+        if mode not in ('sync', 'queued', 'async'):
+            raise ValueError(f"Unknown dispatch mode {mode}")
         self.subscribers = {}
+        self.mode = mode
+        self._pending = []  # Handler iterators still being dispatched, the innermost event last.
+        self._deferred = []  # Events published by the handler that is currently running.
+        self._draining = False
+        self._drain_task = None  # The task running _drain_async()
+        self._external = deque()  # Events other tasks published while an async handler was awaited
+        self._external_done = None  # Future of the publish_async() call whose event is being dispatched
+        self.metrics = None  # EventMetrics while instrumentation is enabled, see enable_metrics().
+
+    def enable_metrics(self, metrics=None):
+        """Start recording call counts and handler latencies, returns the EventMetrics they are recorded in."""
+        self.metrics = metrics if metrics is not None else EventMetrics()
+        return self.metrics
+
+    def disable_metrics(self):
+        self.metrics = None
 
     def subscribe(self, event_type, handler):
         if event_type not in self.subscribers:
@@ -12,6 +39,144 @@ class EventBus:
         self.subscribers[event_type].append(handler)
 
     def publish(self, event_type, *args, **kwargs):
-        if event_type in self.subscribers:
-            for handler in self.subscribers[event_type]:
-                handler(*args, **kwargs)
+        if self.metrics is not None:
+            self.metrics.record_publish(event_type)
+        if self.mode == 'sync':
+            if event_type in self.subscribers:
+                for handler in self.subscribers[event_type]:
+                    if self.metrics is None:
+                        handler(*args, **kwargs)
+                    else:
+                        self._call_timed(event_type, handler, args, kwargs)
+            return
+
+        if self._queue_external(event_type, args, kwargs):
+            return
+        self._deferred.append((event_type, args, kwargs))
+        if self._draining:
+            return
+        if self.mode == 'queued':
+            self._drain()
+        else:
+            self._draining = True
+            asyncio.get_running_loop().create_task(self._drain_async())
+
+    async def publish_async(self, event_type, *args, **kwargs):
+        """Publish from a coroutine and wait until the event and everything it triggers is handled."""
+        if self.mode != 'async':
+            self.publish(event_type, *args, **kwargs)
+            return
+        if self.metrics is not None:
+            self.metrics.record_publish(event_type)
+        if self._draining and self._drain_task is not asyncio.current_task():
+            done = asyncio.get_running_loop().create_future()
+            self._external.append((event_type, args, kwargs, done))
+            await done
+            return
+        self._deferred.append((event_type, args, kwargs))
+        if not self._draining:
+            self._draining = True
+            await self._drain_async()
+
+    def _queue_external(self, event_type, args, kwargs):
+        # In 'async' mode, an event published by another task while a handler is awaited is not one the
+        # handler published, so it waits until the event in progress and everything it triggered is handled.
+        if self.mode != 'async' or not self._draining:
+            return False
+        try:
+            current_task = asyncio.current_task()
+        except RuntimeError:
+            current_task = None
+        if current_task is self._drain_task:
+            return False
+        self._external.append((event_type, args, kwargs, None))
+        return True
+
+    def _call_timed(self, event_type, handler, args, kwargs):
+        metrics = self.metrics
+        start = time.perf_counter_ns()
+        try:
+            handler(*args, **kwargs)
+        finally:
+            metrics.record_handler(event_type, handler, time.perf_counter_ns() - start)
+
+    def _schedule_deferred(self):
+        # Events published by a handler are dispatched before the remaining handlers of the event that
+        # triggered it, in the order they were published. That is the order inline dispatch calls them in.
+        deferred, self._deferred = self._deferred, []
+        for event_type, args, kwargs in reversed(deferred):
+            if event_type in self.subscribers:
+                self._pending.append((event_type, iter(self.subscribers[event_type]), args, kwargs))
+
+    def _next_handler(self):
+        while self._pending:
+            event_type, handlers, args, kwargs = self._pending[-1]
+            handler = next(handlers, None)
+            if handler is not None:
+                return event_type, handler, args, kwargs
+            self._pending.pop()
+        return None
+
+    def _drain(self):
+        self._draining = True
+        try:
+            self._schedule_deferred()
+            while (call := self._next_handler()) is not None:
+                event_type, handler, args, kwargs = call
+                if self.metrics is None:
+                    handler(*args, **kwargs)
+                else:
+                    self._call_timed(event_type, handler, args, kwargs)
+                if self._deferred:
+                    self._schedule_deferred()
+        except BaseException:
+            # Drop the rest of the chain, like an exception unwinding inline dispatch would.
+            self._pending.clear()
+            self._deferred.clear()
+            raise
+        finally:
+            self._draining = False
+
+    def _next_async_handler(self):
+        call = self._next_handler()
+        while call is None:
+            if self._external_done is not None:
+                self._external_done.set_result(None)
+                self._external_done = None
+            if not self._external:
+                return None
+            event_type, args, kwargs, self._external_done = self._external.popleft()
+            self._deferred.append((event_type, args, kwargs))
+            self._schedule_deferred()
+            call = self._next_handler()
+        return call
+
+    async def _drain_async(self):
+        self._draining = True
+        self._drain_task = asyncio.current_task()
+        try:
+            self._schedule_deferred()
+            while (call := self._next_async_handler()) is not None:
+                event_type, handler, args, kwargs = call
+                metrics = self.metrics
+                start = time.perf_counter_ns() if metrics is not None else 0
+                result = handler(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    await result
+                if metrics is not None:
+                    metrics.record_handler(event_type, handler, time.perf_counter_ns() - start)
+                if self._deferred:
+                    self._schedule_deferred()
+        except BaseException:
+            self._pending.clear()
+            self._deferred.clear()
+            # Waiting publishers are released, their events are dropped with the rest of the chain.
+            for done in [self._external_done] + [done for *_, done in self._external]:
+                if done is not None and not done.done():
+                    done.cancel()
+            self._external.clear()
+            self._external_done = None
+            raise
+        finally:
+            self._draining = False
+            self._drain_task = None
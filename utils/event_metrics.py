@@ -0,0 +1,111 @@
+# event_metrics.py
+import json
+
+# Latency buckets are powers of two in microseconds: bucket 0 holds calls under 1us, bucket k calls under 2**k us.
+NUM_BUCKETS = 32
+
+
+class LatencyStats:
+    __slots__ = ('count', 'total_ns', 'max_ns', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * NUM_BUCKETS
+
+    def record(self, elapsed_ns):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.buckets[min((elapsed_ns // 1000).bit_length(), NUM_BUCKETS - 1)] += 1
+
+    def mean_ns(self):
+        return self.total_ns / self.count if self.count else 0.0
+
+    def quantile_us(self, q):
+        """Upper bound, in microseconds, of the bucket that holds the q-th quantile."""
+        if not self.count:
+            return 0
+        target = q * self.count
+        seen = 0
+        for bucket, calls in enumerate(self.buckets):
+            seen += calls
+            if seen >= target:
+                return 1 << bucket
+        return 1 << (NUM_BUCKETS - 1)
+
+    def as_dict(self):
+        # The histogram only lists the buckets that were hit, keyed by their upper bound in microseconds.
+        return {
+            'count': self.count,
+            'total_ms': self.total_ns / 1e6,
+            'mean_us': self.mean_ns() / 1e3,
+            'max_us': self.max_ns / 1e3,
+            'p50_us': self.quantile_us(0.5),
+            'p99_us': self.quantile_us(0.99),
+            'histogram_us': {str(1 << bucket): calls for bucket, calls in enumerate(self.buckets) if calls},
+        }
+
+
+class EventMetrics:
+    """Call counts and handler latencies collected by an EventBus, per event type and per handler.
+
+    Handler times are inclusive: with inline ('sync') dispatch they contain the events the handler
+    published itself, with 'queued' and 'async' dispatch those are timed on their own.
+    """
+
+    def __init__(self):
+        self.published = {}  # Maps event types to the number of times they were published
+        self.events = {}  # Maps event types to the LatencyStats of all their handler calls
+        self.handlers = {}  # Maps (event type, handler name) to LatencyStats
+
+    def record_publish(self, event_type):
+        self.published[event_type] = self.published.get(event_type, 0) + 1
+
+    def record_handler(self, event_type, handler, elapsed_ns):
+        key = (event_type, handler_name(handler))
+        stats = self.handlers.get(key)
+        if stats is None:
+            stats = self.handlers[key] = LatencyStats()
+        stats.record(elapsed_ns)
+
+        stats = self.events.get(event_type)
+        if stats is None:
+            stats = self.events[event_type] = LatencyStats()
+        stats.record(elapsed_ns)
+
+    def slowest_handlers(self, count=5):
+        """The (event type, handler name, stats) entries that took the most time in total."""
+        ranked = sorted(self.handlers.items(), key=lambda item: item[1].total_ns, reverse=True)
+        return [(event_type, name, stats) for (event_type, name), stats in ranked[:count]]
+
+    def snapshot(self):
+        snapshot = {}
+        for event_type, published in self.published.items():
+            stats = self.events.get(event_type, LatencyStats())
+            snapshot[event_type] = {'published': published, **stats.as_dict(), 'handlers': {}}
+        for (event_type, name), stats in self.handlers.items():
+            # An event can be timed without being counted as published, after a reset() or when metrics were
+            # enabled during its dispatch.
+            event = snapshot.setdefault(event_type, {'published': 0, **self.events[event_type].as_dict(), 'handlers': {}})
+            event['handlers'][name] = stats.as_dict()
+        return snapshot
+
+    def to_json(self, indent=None):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def dump(self, path):
+        with open(path, 'w') as file:
+            file.write(self.to_json(indent=2))
+
+    def reset(self):
+        self.published.clear()
+        self.events.clear()
+        self.handlers.clear()
+
+
+def handler_name(handler):
+    # Bound methods report their class, e.g. 'EventHandler.determine_winners'.
+    return getattr(handler, '__qualname__', None) or repr(handler)
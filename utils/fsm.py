@@ -0,0 +1,66 @@
+# fsm.py
+
+
+class MachineError(Exception):
+    """Raised when a trigger is fired from a state that has no transition for it."""
+
+
+class TransitionTable:
+    """A finite state machine compiled once into (state, trigger) -> state lookups.
+
+    The table is shared by every machine of a class, see bind(). An instance only carries its `state`
+    attribute, so creating one costs nothing and firing a trigger is a single dict lookup.
+    """
+
+    def __init__(self, states, transitions, initial):
+        self.states = tuple(states)
+        if initial not in self.states:
+            raise ValueError(f"Unknown initial state {initial}")
+        self.initial = initial
+        self.table = {}
+        for trigger, source, dest in transitions:
+            if source not in self.states or dest not in self.states:
+                raise ValueError(f"Transition {trigger} uses an unknown state: {source} -> {dest}")
+            if (source, trigger) in self.table:
+                raise ValueError(f"Transition {trigger} is defined twice for state {source}")
+            self.table[(source, trigger)] = dest
+        self.triggers = tuple(dict.fromkeys(trigger for trigger, _, _ in transitions))
+
+    def next_state(self, state, trigger):
+        try:
+            return self.table[(state, trigger)]
+        except KeyError:
+            raise MachineError(f"Can't trigger event {trigger} from state {state}!") from None
+
+    def bind(self, cls):
+        """Add one method per trigger to cls, plus trigger(name) and may_trigger(name)."""
+        for trigger in self.triggers:
+            if not hasattr(cls, trigger):
+                setattr(cls, trigger, self._compile_trigger(trigger, cls.__qualname__))
+        table = self
+
+        def fire(model, trigger, *args, **kwargs):
+            model.state = table.next_state(model.state, trigger)
+            return True
+
+        def may_trigger(model, trigger):
+            return (model.state, trigger) in table.table
+
+        cls.trigger = fire
+        cls.may_trigger = may_trigger
+        return cls
+
+    def _compile_trigger(self, trigger, owner):
+        destinations = {source: dest for (source, name), dest in self.table.items() if name == trigger}
+
+        def fire(model, *args, **kwargs):
+            # Arguments are accepted and ignored, handlers are called with whatever the event was published with.
+            try:
+                model.state = destinations[model.state]
+            except KeyError:
+                raise MachineError(f"Can't trigger event {trigger} from state {model.state}!") from None
+            return True
+
+        fire.__name__ = trigger
+        fire.__qualname__ = f"{owner}.{trigger}"
+        return fire